@@ -1,6 +1,14 @@
 
 
 from abc import ABC, abstractmethod
+from typing import Callable
+
+from accounts.money import Money, to_cents
+from accounts.result import TransactionResult
+
+# listener(account, operation, amount, result); operation is 'deposit', 'withdraw', 'interest' or 'repayment'
+TransactionListener = Callable[["AccountManager", str, Money, TransactionResult], None]
+
 
 class AccountManager(ABC):
 
@@ -8,18 +16,52 @@ class AccountManager(ABC):
 Abstract base class to define the interface and common behavior
 for managing different types of bank accounts.
 
+Balance-changing operations never print: they return a TransactionResult
+and, only when listeners are registered, notify them so front ends can
+render or log the operation.
+
+Balances are exact integers of cents (balance_cents). Amounts may be given
+as Money, int units, float, str or Decimal and are rounded to the cent.
 """
+    # Weak-referenceable, so caches (storage.cache) can track evicted accounts still in use
+    __slots__ = ("__weakref__",)
+
+    _listeners: tuple = ()
+
+    @staticmethod
+    def add_listener(listener: TransactionListener) -> None:
+        """Registers a callable notified after every deposit, withdrawal, interest or repayment."""
+        AccountManager._listeners += (listener,)
+
+    @staticmethod
+    def remove_listener(listener: TransactionListener) -> None:
+        # Equality, not identity: every access to a bound method (journal.record) builds a new object
+        AccountManager._listeners = tuple(l for l in AccountManager._listeners if l != listener)
+
+    def _notify(self, operation: str, amount: Money, result: TransactionResult) -> None:
+        for listener in AccountManager._listeners:
+            listener(self, operation, amount, result)
+
+    @property
+    def balance(self) -> Money:
+        """Current balance as Money; the exact value lives in balance_cents."""
+        return Money.from_cents(self.balance_cents)
+
+    @balance.setter
+    def balance(self, value: Money | float) -> None:
+        self.balance_cents = to_cents(value)
+
     @abstractmethod
     def account_type(self, account_type: str):
         pass
     @abstractmethod
-    def deposit(self, amount: float):
+    def deposit(self, amount: Money | float) -> TransactionResult:
         pass
     @abstractmethod
-    def withdraw(self, amount: float):
+    def withdraw(self, amount: Money | float) -> TransactionResult:
         pass
-    @abstractmethod 
-    def get_balance(self) -> float:
+    @abstractmethod
+    def get_balance(self) -> Money:
         pass
     @abstractmethod
     def get_account_details(self) -> dict:
@@ -1,4 +1,6 @@
 from accounts.account_manager import AccountManager
+from accounts.money import Money, to_cents
+from accounts.result import Reason, Status, TransactionResult
 
 
 class CheckingAccount(AccountManager):
@@ -9,31 +11,43 @@ Implements specific behavior for managing deposits, withdrawals,
 balance inquiries, and account details relevant to checking accounts.
 """
 
-    def __init__(self, account_holder: str, account_number: str, balance: float = 0.0):
+    __slots__ = ("account_holder", "account_number", "balance_cents")
+    account_type_name = "Checking"
+
+    def __init__(self, account_holder: str, account_number: str, balance: Money | float = 0):
         self.account_holder = account_holder
         self.account_number = account_number
-        self.balance = balance
-        self.account_type_name = "Checking"
+        self.balance_cents = to_cents(balance)
 
     def account_type(self, account_type: str):
         return self.account_type_name
 
-    def deposit(self, amount: float):
-        if amount > 0:
-            self.balance += amount
-            print(f"Deposited {amount}. New balance is {self.balance}.")
+    def deposit(self, amount: Money | float) -> TransactionResult:
+        cents = to_cents(amount)
+        if cents > 0:
+            self.balance_cents += cents
+            result = TransactionResult(Status.ACCEPTED, Money.from_cents(self.balance_cents))
         else:
-            print("Deposit amount must be positive.")
-
-    def withdraw(self, amount: float):
-        if 0 < amount <= self.balance:
-            self.balance -= amount
-            print(f"Withdrew {amount}. New balance is {self.balance}.")
+            result = TransactionResult(Status.REJECTED, Money.from_cents(self.balance_cents), Reason.INVALID_AMOUNT)
+        if self._listeners:
+            self._notify("deposit", Money.from_cents(cents), result)
+        return result
+
+    def withdraw(self, amount: Money | float) -> TransactionResult:
+        cents = to_cents(amount)
+        if 0 < cents <= self.balance_cents:
+            self.balance_cents -= cents
+            result = TransactionResult(Status.ACCEPTED, Money.from_cents(self.balance_cents))
+        elif cents <= 0:
+            result = TransactionResult(Status.REJECTED, Money.from_cents(self.balance_cents), Reason.INVALID_AMOUNT)
         else:
-            print("Insufficient funds or invalid withdrawal amount.")
+            result = TransactionResult(Status.REJECTED, Money.from_cents(self.balance_cents), Reason.INSUFFICIENT_FUNDS)
+        if self._listeners:
+            self._notify("withdraw", Money.from_cents(cents), result)
+        return result
 
-    def get_balance(self) -> float:
-        return self.balance
+    def get_balance(self) -> Money:
+        return Money.from_cents(self.balance_cents)
 
     def get_account_details(self) -> dict:
         return {
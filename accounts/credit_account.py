@@ -1,5 +1,14 @@
 
 from accounts.account_manager import AccountManager
+from accounts.money import Money, round_half_up, to_cents
+from accounts.result import Reason, Status, TransactionResult
+
+
+def interest_cents(balance_cents: int, interest_rate: float, months: int) -> int:
+    """Simple interest in cents: balance * rate / 12 / 100 * months, rate rounded to basis points."""
+    rate_bp = round(interest_rate * 100)
+    return round_half_up(balance_cents * rate_bp * months, 12 * 100 * 100)
+
 
 class CreditAccount(AccountManager):
 
@@ -9,82 +18,119 @@ class CreditAccount(AccountManager):
     interest calculation and application, repayment, and credit limit checks.
     It encapsulates the behavior specific to credit accounts, including interest rates and credit limits.
     """
-    def __init__(self, account_holder: str, account_number: str, credit_limit: float, interest_rate: float, balance: float = 0.0):
+    __slots__ = ("account_holder", "account_number", "balance_cents", "credit_limit_cents", "interest_rate")
+    account_type_name = "Credit"
+
+    def __init__(self, account_holder: str, account_number: str, credit_limit: Money | float, interest_rate: float, balance: Money | float = 0):
         self.account_holder = account_holder
         self.account_number = account_number
-        self.balance = balance
-        self.credit_limit = credit_limit
+        self.balance_cents = to_cents(balance)
+        self.credit_limit_cents = to_cents(credit_limit)
         self.interest_rate = interest_rate
-        self.account_type_name = "Credit"
+
+    @property
+    def credit_limit(self) -> Money:
+        return Money.from_cents(self.credit_limit_cents)
+
+    @credit_limit.setter
+    def credit_limit(self, value: Money | float) -> None:
+        self.credit_limit_cents = to_cents(value)
 
     def account_type(self, account_type: str):
         return self.account_type_name
 
-    def deposit(self, amount: float):
-        if amount > 0:
-            self.balance += amount
-            print(f"Deposited {amount}. New balance is {self.balance}.")
+    def deposit(self, amount: Money | float) -> TransactionResult:
+        cents = to_cents(amount)
+        if cents > 0:
+            self.balance_cents += cents
+            result = TransactionResult(Status.ACCEPTED, Money.from_cents(self.balance_cents))
         else:
-            print("Deposit amount must be positive.")
-
-    def withdraw(self, amount: float):
-        if 0 < amount <= (self.balance + self.credit_limit):
-            self.balance -= amount
-            print(f"Withdrew {amount}. New balance is {self.balance}.")
+            result = TransactionResult(Status.REJECTED, Money.from_cents(self.balance_cents), Reason.INVALID_AMOUNT)
+        if self._listeners:
+            self._notify("deposit", Money.from_cents(cents), result)
+        return result
+
+    def withdraw(self, amount: Money | float) -> TransactionResult:
+        cents = to_cents(amount)
+        if 0 < cents <= (self.balance_cents + self.credit_limit_cents):
+            self.balance_cents -= cents
+            result = TransactionResult(Status.ACCEPTED, Money.from_cents(self.balance_cents))
+        elif cents <= 0:
+            result = TransactionResult(Status.REJECTED, Money.from_cents(self.balance_cents), Reason.INVALID_AMOUNT)
         else:
-            print("Insufficient funds or invalid withdrawal amount.")
+            result = TransactionResult(Status.REJECTED, Money.from_cents(self.balance_cents), Reason.INSUFFICIENT_FUNDS)
+        if self._listeners:
+            self._notify("withdraw", Money.from_cents(cents), result)
+        return result
 
-    def get_balance(self) -> float:
-        return self.balance
+    def get_balance(self) -> Money:
+        return Money.from_cents(self.balance_cents)
 
-    def calculate_interest(self, months: int) -> float:
+    def calculate_interest(self, months: int) -> Money:
         """Calculate interest on the current balance over a given number of months.
 
+        Simple interest at interest_rate / 12 percent per month. The annual rate
+        is taken in basis points (hundredths of a percent) and the result is
+        rounded once to the nearest cent, halves away from zero.
+
         Args:
             months (int): Number of months to calculate interest for.
 
         Returns:
-            float: Calculated interest amount.
+            Money: Calculated interest amount, zero for non-positive balances.
         """
-        monthly_rate = self.interest_rate / 12 / 100
-        interest = self.balance * monthly_rate * months
-        return interest if self.balance > 0 else 0.0 
-    
-    def apply_interest(self, months: int):
+        if self.balance_cents <= 0:
+            return Money.from_cents(0)
+        return Money.from_cents(interest_cents(self.balance_cents, self.interest_rate, months))
+
+    def apply_interest(self, months: int) -> TransactionResult:
         """Apply calculated interest to the account balance.
 
         Args:
             months (int): Number of months to apply interest for.
+
+        Returns:
+            TransactionResult: Rejected with NON_POSITIVE_BALANCE if no interest accrues.
         """
         interest = self.calculate_interest(months)
-        if interest > 0:
-            self.balance += interest
-            print(f"Applied {interest} interest for {months} months. New balance is {self.balance}.")
+        if interest.cents > 0:
+            self.balance_cents += interest.cents
+            result = TransactionResult(Status.ACCEPTED, Money.from_cents(self.balance_cents))
         else:
-            print("No interest applied as balance is non-positive.")
+            result = TransactionResult(Status.REJECTED, Money.from_cents(self.balance_cents), Reason.NON_POSITIVE_BALANCE)
+        if self._listeners:
+            self._notify("interest", interest, result)
+        return result
 
-    def make_repayment(self, amount: float):
+    def make_repayment(self, amount: Money | float) -> TransactionResult:
         """Make a repayment towards the credit account.
 
         Args:
-            amount (float): Amount to repay.
+            amount (Money | float): Amount to repay.
+
+        Returns:
+            TransactionResult: Rejected with INVALID_AMOUNT if the amount is not positive.
         """
-        if amount > 0:
-            self.balance += amount
-            print(f"Repayment of {amount} made. New balance is {self.balance}.")
+        cents = to_cents(amount)
+        if cents > 0:
+            self.balance_cents += cents
+            result = TransactionResult(Status.ACCEPTED, Money.from_cents(self.balance_cents))
         else:
-            print("Repayment amount must be positive.")
+            result = TransactionResult(Status.REJECTED, Money.from_cents(self.balance_cents), Reason.INVALID_AMOUNT)
+        if self._listeners:
+            self._notify("repayment", Money.from_cents(cents), result)
+        return result
 
  
     def check_credit_limit(self, amount):
         """Check if a withdrawal amount exceeds the credit limit.
 
         Args:
-            amount (float): Amount to check against the credit limit.  
+            amount (Money | float): Amount to check against the credit limit.  
         Returns:
             bool: True if within limit, False otherwise.       
         """
-        return amount <= (self.balance + self.credit_limit) 
+        return to_cents(amount) <= (self.balance_cents + self.credit_limit_cents)
 
     def get_account_details(self) -> dict:
         return {
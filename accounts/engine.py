@@ -0,0 +1,112 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, Sequence
+
+from accounts.account_manager import AccountManager
+from accounts.money import Money
+from accounts.result import TransactionResult
+
+
+class TransactionEngine:
+    """
+    Runs deposits, withdrawals and transfers safely from many threads.
+
+    Each account maps to one of a fixed set of lock stripes (by account
+    number), so the check-then-act inside withdraw can no longer interleave
+    between two terminals sharing an account, while unrelated accounts rarely
+    contend. Transfers take both stripes in ascending stripe order, which
+    rules out lock-order deadlocks between opposite transfers.
+
+    Operations can be called directly from any thread, submitted one by one
+    to the engine's worker pool, or run in bulk with run_batch.
+    """
+    def __init__(self, workers: int = 4, stripes: int = 256):
+        if stripes < 1:
+            raise ValueError("stripes must be at least 1")
+        self.workers = workers
+        self._locks = tuple(threading.Lock() for _ in range(stripes))
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="txn-worker")
+
+    def __enter__(self) -> "TransactionEngine":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+    def _stripe(self, account: AccountManager) -> int:
+        return hash(account.account_number) % len(self._locks)
+
+    def _lock_for(self, account: AccountManager) -> threading.Lock:
+        return self._locks[self._stripe(account)]
+
+    def deposit(self, account: AccountManager, amount: Money | float) -> TransactionResult:
+        with self._lock_for(account):
+            return account.deposit(amount)
+
+    def withdraw(self, account: AccountManager, amount: Money | float) -> TransactionResult:
+        with self._lock_for(account):
+            return account.withdraw(amount)
+
+    def get_balance(self, account: AccountManager) -> Money:
+        with self._lock_for(account):
+            return account.get_balance()
+
+    def transfer(self, source: AccountManager, target: AccountManager, amount: Money | float) -> TransactionResult:
+        """Moves an amount between two accounts atomically.
+
+        Returns:
+            TransactionResult: The result of the debit on the source account;
+                               the target is only credited if it was accepted.
+        """
+        first, second = sorted((self._stripe(source), self._stripe(target)))
+        with self._locks[first]:
+            if second == first:
+                return self._transfer_locked(source, target, amount)
+            with self._locks[second]:
+                return self._transfer_locked(source, target, amount)
+
+    @staticmethod
+    def _transfer_locked(source: AccountManager, target: AccountManager, amount) -> TransactionResult:
+        result = source.withdraw(amount)
+        if result.ok:
+            target.deposit(amount)
+        return result
+
+    def execute(self, operation: Sequence) -> TransactionResult:
+        """Runs one operation tuple: ('deposit' | 'withdraw', account, amount) or ('transfer', source, target, amount)."""
+        name, *args = operation
+        if name == "transfer":
+            return self.transfer(*args)
+        if name == "deposit":
+            return self.deposit(*args)
+        if name == "withdraw":
+            return self.withdraw(*args)
+        raise ValueError(f"Unknown operation: {name}")
+
+    def submit(self, operation: Sequence) -> Future:
+        """Schedules one operation tuple on the worker pool."""
+        return self._executor.submit(self.execute, operation)
+
+    def run_batch(self, operations: Iterable[Sequence]) -> list[TransactionResult]:
+        """
+        Runs a batch of operation tuples across all workers and waits for them.
+
+        The batch is split into one contiguous chunk per worker so the pool
+        overhead is paid per chunk instead of per operation. Results are
+        returned in input order.
+        """
+        operations = list(operations)
+        size = -(-len(operations) // self.workers) or 1
+        chunks = [operations[i:i + size] for i in range(0, len(operations), size)]
+        futures = [self._executor.submit(self._run_chunk, chunk) for chunk in chunks]
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def _run_chunk(self, chunk: list) -> list[TransactionResult]:
+        execute = self.execute
+        return [execute(operation) for operation in chunk]
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
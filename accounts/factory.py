@@ -1,7 +1,7 @@
+from typing import Any, Mapping, Sequence
+
 from accounts.account_manager import AccountManager
-from accounts.savings_account import SavingsAccount
-from accounts.checking_account import CheckingAccount
-from accounts.credit_account import CreditAccount
+from accounts.type_registry import TypeRegistry, construct_many
 
 class AccountFactory:
 
@@ -9,23 +9,50 @@ class AccountFactory:
     A factory class responsible for creating instances of different types of accounts.
 
     This class uses a static method to instantiate and return the appropriate account
-    object based on the provided account type and parameters.
+    object based on the provided account type and parameters. Account classes are
+    looked up in a TypeRegistry, so each account module is only imported the first
+    time an account of that type is created. New account types can be plugged in with
+    register() or through the 'atm.account_types' entry point group.
 
     Methods:
         create_account(account_type: str, **kwargs) -> AccountManager:
             Static method to create and return an account instance of the specified type.
+        create_many(account_type: str, columns, **constants) -> list[AccountManager]:
+            Bulk-creates accounts of one type from columnar input.
+        register(account_type: str, cls) -> None:
+            Adds an account type (a class or a "module:Class" path).
 
     Raises:
         ValueError: If the account_type provided does not match any known account types.
     """
+    types = TypeRegistry("account", {
+        "savings": "accounts.savings_account:SavingsAccount",
+        "checking": "accounts.checking_account:CheckingAccount",
+        "credit": "accounts.credit_account:CreditAccount",
+    }, entry_point_group="atm.account_types")
+
     @staticmethod
     def create_account(account_type: str, **kwargs) -> AccountManager:
-        if account_type == "savings":
-            return SavingsAccount(**kwargs)     
-        elif account_type == "checking":
-            return CheckingAccount(**kwargs)
-        elif account_type == "credit":
-            return CreditAccount(**kwargs)
-        else:
-            raise ValueError(f"Unknown account type: {account_type}")
-        
\ No newline at end of file
+        return AccountFactory.types.get(account_type)(**kwargs)
+
+    @staticmethod
+    def create_many(account_type: str, columns: Mapping[str, Sequence], **constants: Any) -> list[AccountManager]:
+        """
+        Creates one account per row of columnar input.
+
+        Args:
+            account_type (str): Type shared by every account of the batch.
+            columns: Constructor argument name -> sequence of values, all of
+                     the same length, e.g. {'account_holder': [...],
+                     'account_number': [...], 'balance': [...]}.
+            **constants: Arguments shared by every account (e.g. interest_rate=20.0).
+
+        Raises:
+            ValueError: If the type is unknown or the columns do not match its constructor.
+        """
+        return construct_many(AccountFactory.types.get(account_type), columns, constants)
+
+    @staticmethod
+    def register(account_type: str, cls: type | str, replace: bool = False) -> None:
+        """Registers an account class (or a lazy "module:Class" path) under account_type."""
+        AccountFactory.types.register(account_type, cls, replace)
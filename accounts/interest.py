@@ -0,0 +1,80 @@
+from typing import Iterable, NamedTuple
+
+from accounts.account_manager import AccountManager
+from accounts.credit_account import CreditAccount, interest_cents
+from accounts.money import Money
+from accounts.result import Status, TransactionResult
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the batch API falls back to a plain loop
+    np = None
+
+# interest = balance * rate_bp * months / _DENOMINATOR, see credit_account.interest_cents
+_DENOMINATOR = 12 * 100 * 100
+# Largest balance * rate_bp * months product that still fits int64 after doubling for rounding.
+_INT64_SAFE = 2 ** 62
+
+
+class AccrualSummary(NamedTuple):
+    """Outcome of a batch accrual: how many accounts were charged and the total interest."""
+    accounts_charged: int
+    total_interest: Money
+
+
+def vector_interest_cents(balances, rates_bp, months: int):
+    """
+    Vectorized CreditAccount interest rule over NumPy int64 arrays.
+
+    Non-positive balances accrue nothing; positive ones are rounded to the
+    cent with halves away from zero, exactly like CreditAccount.calculate_interest.
+    """
+    numerator = np.where(balances > 0, balances * rates_bp * months, 0)
+    return (2 * numerator + _DENOMINATOR) // (2 * _DENOMINATOR)
+
+
+def fits_int64(balances, rates_bp, months: int) -> bool:
+    """True if vector_interest_cents cannot overflow int64 for these arrays."""
+    if not len(balances):
+        return True
+    return int(balances.max()) * max(int(rates_bp.max()), 1) * max(months, 1) < _INT64_SAFE
+
+
+def accrue_interest(accounts: Iterable[AccountManager], months: int) -> AccrualSummary:
+    """
+    Applies interest_rate / months to a whole credit portfolio in one pass.
+
+    Non-credit accounts are skipped. Balances and rates are gathered into
+    arrays, interest is computed with one vectorized NumPy expression (or a
+    plain loop when NumPy is not installed) and written back to the accounts.
+    Listeners are only notified when some are registered, so a journal
+    still records every charge.
+
+    Args:
+        accounts: Accounts to accrue, e.g. every account of a book.
+        months (int): Number of months of interest to apply.
+    """
+    portfolio = [a for a in accounts if isinstance(a, CreditAccount)]
+    if np is not None:
+        balances = np.fromiter((a.balance_cents for a in portfolio), dtype=np.int64, count=len(portfolio))
+        rates_bp = np.fromiter((round(a.interest_rate * 100) for a in portfolio), dtype=np.int64, count=len(portfolio))
+        if fits_int64(balances, rates_bp, months):
+            accrued = vector_interest_cents(balances, rates_bp, months).tolist()
+        else:
+            accrued = [interest_cents(b, r / 100, months) if b > 0 else 0
+                       for b, r in zip(balances.tolist(), rates_bp.tolist())]
+    else:
+        accrued = [interest_cents(a.balance_cents, a.interest_rate, months) if a.balance_cents > 0 else 0
+                   for a in portfolio]
+
+    notify = bool(AccountManager._listeners)
+    charged = total = 0
+    for account, cents in zip(portfolio, accrued):
+        if cents > 0:
+            account.balance_cents += cents
+            charged += 1
+            total += cents
+            if notify:
+                account._notify("interest", Money.from_cents(cents),
+                                TransactionResult(Status.ACCEPTED, Money.from_cents(account.balance_cents)))
+    return AccrualSummary(charged, Money.from_cents(total))
@@ -0,0 +1,153 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+CENTS_PER_UNIT = 100
+
+_ONE = Decimal(1)
+
+
+def round_half_up(numerator: int, denominator: int) -> int:
+    """Integer division rounded to the nearest integer, halves away from zero.
+
+    Args:
+        numerator (int): Dividend.
+        denominator (int): Positive divisor.
+
+    Returns:
+        int: The rounded quotient.
+    """
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if 2 * remainder >= denominator:
+        quotient += 1
+    return quotient if numerator >= 0 else -quotient
+
+
+def to_cents(value) -> int:
+    """Converts a monetary amount to an integer number of cents.
+
+    Ints are whole currency units (1000 -> 100000 cents). Floats, strings and
+    Decimals are rounded to the cent with ROUND_HALF_UP; floats go through
+    their shortest repr, so 0.1 is exactly 10 cents.
+
+    Raises:
+        ValueError: If the value is not a finite number.
+        TypeError: If the value is not a supported numeric type.
+    """
+    kind = type(value)
+    if kind is Money:
+        return value.cents
+    if kind is int:
+        return value * CENTS_PER_UNIT
+    if kind is float:
+        # Fast path: amounts already on a whole cent (12.5, -3.07) land within float error of an
+        # integer, which is then also the ROUND_HALF_UP result; anything else goes through Decimal.
+        cents = value * CENTS_PER_UNIT
+        if -1e15 < cents < 1e15:
+            nearest = round(cents)
+            if abs(cents - nearest) < 1e-6:
+                return nearest
+        value = Decimal(repr(value))
+    elif kind is str:
+        try:
+            value = Decimal(value.strip().replace(",", "."))
+        except InvalidOperation:
+            raise ValueError(f"Invalid amount: {value!r}") from None
+    elif not isinstance(value, Decimal):
+        raise TypeError(f"Unsupported amount type: {kind.__name__}")
+    if not value.is_finite():
+        raise ValueError(f"Invalid amount: {value}")
+    return int(value.scaleb(2).quantize(_ONE, rounding=ROUND_HALF_UP))
+
+
+class Money:
+    """
+    Immutable fixed-point amount stored as an integer number of cents.
+
+    Account balances are kept as plain ints internally; Money is the value
+    handed across the API boundary (balances, results, parsed user input).
+    Arithmetic and comparisons are exact and accept other Money instances or
+    any value understood by to_cents.
+    """
+    __slots__ = ("cents",)
+
+    def __init__(self, value=0):
+        object.__setattr__(self, "cents", to_cents(value))
+
+    @classmethod
+    def from_cents(cls, cents: int) -> "Money":
+        money = object.__new__(cls)
+        object.__setattr__(money, "cents", cents)
+        return money
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Money is immutable")
+
+    def __reduce__(self):
+        # Pickle through from_cents: the default slots protocol would go through __setattr__.
+        return Money.from_cents, (self.cents,)
+
+    def to_decimal(self) -> Decimal:
+        return Decimal(self.cents).scaleb(-2)
+
+    def __float__(self) -> float:
+        return self.cents / CENTS_PER_UNIT
+
+    def __bool__(self) -> bool:
+        return self.cents != 0
+
+    def __hash__(self) -> int:
+        # Equal numbers hash equally: Money("1") == 1 == Decimal("1.00"), Money("1.50") == 1.5
+        units, cents = divmod(self.cents, CENTS_PER_UNIT)
+        return hash(units) if not cents else hash(self.to_decimal())
+
+    def __str__(self) -> str:
+        sign = "-" if self.cents < 0 else ""
+        units, cents = divmod(abs(self.cents), CENTS_PER_UNIT)
+        return f"{sign}{units}.{cents:02d}"
+
+    def __repr__(self) -> str:
+        return f"Money('{self}')"
+
+    def __format__(self, spec: str) -> str:
+        return format(self.to_decimal(), spec) if spec else str(self)
+
+    def __add__(self, other) -> "Money":
+        return Money.from_cents(self.cents + to_cents(other))
+
+    __radd__ = __add__
+
+    def __sub__(self, other) -> "Money":
+        return Money.from_cents(self.cents - to_cents(other))
+
+    def __rsub__(self, other) -> "Money":
+        return Money.from_cents(to_cents(other) - self.cents)
+
+    def __mul__(self, factor: int) -> "Money":
+        if type(factor) is not int:
+            return NotImplemented
+        return Money.from_cents(self.cents * factor)
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> "Money":
+        return Money.from_cents(-self.cents)
+
+    def __abs__(self) -> "Money":
+        return Money.from_cents(abs(self.cents))
+
+    def __eq__(self, other) -> bool:
+        try:
+            return self.cents == to_cents(other)
+        except (TypeError, ValueError):
+            return NotImplemented
+
+    def __lt__(self, other) -> bool:
+        return self.cents < to_cents(other)
+
+    def __le__(self, other) -> bool:
+        return self.cents <= to_cents(other)
+
+    def __gt__(self, other) -> bool:
+        return self.cents > to_cents(other)
+
+    def __ge__(self, other) -> bool:
+        return self.cents >= to_cents(other)
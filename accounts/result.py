@@ -0,0 +1,38 @@
+from enum import Enum
+from typing import NamedTuple
+
+from accounts.money import Money
+
+
+class Status(str, Enum):
+    """Outcome of an account operation."""
+    ACCEPTED = "accepted"
+    REJECTED = "rejected"
+
+
+class Reason(str, Enum):
+    """Machine-readable reason attached to rejected operations."""
+    INVALID_AMOUNT = "invalid_amount"
+    INSUFFICIENT_FUNDS = "insufficient_funds"
+    NON_POSITIVE_BALANCE = "non_positive_balance"
+    LIMIT_EXCEEDED = "limit_exceeded"
+    CANNOT_DISPENSE = "cannot_dispense"
+    SUSPECTED_FRAUD = "suspected_fraud"
+
+
+class TransactionResult(NamedTuple):
+    """
+    Immutable result returned by every balance-changing AccountManager operation.
+
+    Attributes:
+        status (Status): Whether the operation was applied.
+        balance (Money): Account balance after the operation.
+        reason (Reason | None): Why the operation was rejected, None if accepted.
+    """
+    status: Status
+    balance: Money
+    reason: Reason | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status is Status.ACCEPTED
@@ -0,0 +1,272 @@
+import itertools
+import multiprocessing
+import os
+import zlib
+from typing import Iterable, Mapping, Sequence
+
+from accounts.account_manager import AccountManager
+from accounts.factory import AccountFactory
+from accounts.money import Money, to_cents
+from accounts.result import Reason, Status, TransactionResult
+
+
+def shard_for(account_number: str, shards: int) -> int:
+    """Owning shard of an account. crc32 is stable across processes, unlike hash() on str."""
+    return zlib.crc32(account_number.encode()) % shards
+
+
+def _wire(result: TransactionResult) -> tuple:
+    # Compact, cheap-to-pickle form of a result for the trip back to the parent.
+    return result.status.value, result.balance.cents, result.reason.value if result.reason else None
+
+
+def _unwire(raw: tuple | None) -> TransactionResult | None:
+    if raw is None:
+        return None
+    status, balance, reason = raw
+    return TransactionResult(Status(status), Money.from_cents(balance), Reason(reason) if reason else None)
+
+
+def _apply(accounts: dict[str, AccountManager], holds: dict[int, tuple[str, int]], op: tuple) -> tuple | None:
+    """Runs one shard-local operation; None means an unknown account or unsupported operation (or a settle step)."""
+    name = op[0]
+    if name == "commit":
+        holds.pop(op[1], None)
+        return None
+    if name == "abort":
+        number, cents = holds.pop(op[1])
+        accounts[number].deposit(Money.from_cents(cents))
+        return None
+    if name == "transfer":
+        _, source_number, target_number, cents = op
+        source, target = accounts.get(source_number), accounts.get(target_number)
+        if source is None or target is None:
+            return None
+        amount = Money.from_cents(cents)
+        result = source.withdraw(amount)
+        if result.ok:
+            target.deposit(amount)
+        return _wire(result)
+    if name == "prepare":
+        _, hold_id, number, cents = op
+        account = accounts.get(number)
+        if account is None:
+            return None
+        result = account.withdraw(Money.from_cents(cents))
+        if result.ok:
+            holds[hold_id] = (number, cents)
+        return _wire(result)
+    account = accounts.get(op[1])
+    if account is None:
+        return None
+    if name == "balance":
+        return Status.ACCEPTED.value, account.balance_cents, None
+    method = getattr(account, name, None)
+    return _wire(method(Money.from_cents(op[2]))) if method is not None else None
+
+
+def _shard_worker(conn) -> None:
+    """Worker process loop: owns one shard of accounts and serves batches from the parent."""
+    accounts: dict[str, AccountManager] = {}
+    holds: dict[int, tuple[str, int]] = {}
+    while True:
+        command, payload = conn.recv()
+        if command == "batch":
+            conn.send([_apply(accounts, holds, op) for op in payload])
+        elif command == "open":
+            for account_type, kwargs in payload:
+                account = AccountFactory.create_account(account_type, **kwargs)
+                accounts[account.account_number] = account
+            conn.send(len(accounts))
+        elif command == "count":
+            conn.send(len(accounts))
+        elif command == "total":
+            conn.send(sum(a.balance_cents for a in accounts.values()))
+        elif command == "stop":
+            conn.send(None)
+            conn.close()
+            return
+
+
+class ShardedLedger:
+    """
+    Settles operations across several processes, one shard of accounts each.
+
+    Accounts are partitioned by crc32(account_number) and live only in the
+    worker process that owns them, so settlement is not bound to a single
+    interpreter (and its GIL). The parent routes every operation to its
+    owner; run_batch sends each shard its whole slice of a batch in one
+    message, so the shards work in parallel and IPC is paid per batch.
+
+    Transfers between two accounts of the same shard are settled locally.
+    Cross-shard transfers use a two-phase handoff:
+
+    1. prepare: the source shard withdraws the amount and keeps it on hold,
+    2. credit: the target shard deposits it,
+    3. commit (drop the hold) or, if the target account does not exist,
+       abort (the hold is deposited back on the source).
+
+    Within a batch, operations on one shard run in input order; credits of
+    cross-shard transfers land after the batch's first phase. Unknown
+    accounts (and repayments on non-credit accounts) give a None result in
+    run_batch and a KeyError on direct calls.
+    AccountManager listeners run inside the workers, not in the parent.
+    """
+    def __init__(self, shards: int | None = None):
+        self.shards = shards or os.cpu_count() or 1
+        self._hold_ids = itertools.count(1)
+        self._conns = []
+        self._processes = []
+        for index in range(self.shards):
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_shard_worker, args=(child_conn,),
+                                              name=f"ledger-shard-{index}", daemon=True)
+            process.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._processes.append(process)
+
+    def __enter__(self) -> "ShardedLedger":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+    def __len__(self) -> int:
+        return sum(self._scatter("count", [True] * self.shards))
+
+    def shard_of(self, account_number: str) -> int:
+        return shard_for(account_number, self.shards)
+
+    def _scatter(self, command: str, payloads: Sequence) -> list:
+        """Sends one payload per shard (skipping empty ones) and gathers the replies in shard order."""
+        busy = [index for index, payload in enumerate(payloads) if payload]
+        for index in busy:
+            self._conns[index].send((command, payloads[index]))
+        replies = [None] * self.shards
+        for index in busy:
+            replies[index] = self._conns[index].recv()
+        return replies
+
+    def open_accounts(self, specs: Iterable[Mapping]) -> int:
+        """
+        Creates accounts inside their owning shards through AccountFactory.
+
+        Args:
+            specs: Mappings with an 'account_type' key plus the keyword
+                   arguments expected by AccountFactory.create_account.
+
+        Returns:
+            int: Total number of accounts held by the ledger.
+        """
+        per_shard = [[] for _ in range(self.shards)]
+        for spec in specs:
+            kwargs = dict(spec)
+            account_type = kwargs.pop("account_type")
+            per_shard[self.shard_of(kwargs["account_number"])].append((account_type, kwargs))
+        self._scatter("open", per_shard)
+        return len(self)
+
+    def total_cents(self) -> int:
+        """Sum of every balance across all shards."""
+        return sum(self._scatter("total", [True] * self.shards))
+
+    def run_batch(self, operations: Iterable[Sequence]) -> list[TransactionResult | None]:
+        """
+        Settles a batch of operation tuples and returns the results in input order.
+
+        Operations: ('deposit' | 'withdraw' | 'repayment', account_number, amount)
+        or ('transfer', source_number, target_number, amount). For transfers
+        the result is the debit on the source, as in TransactionEngine.
+        """
+        per_shard: list[list] = [[] for _ in range(self.shards)]
+        positions: list[list[int]] = [[] for _ in range(self.shards)]
+        cross = []
+        count = 0
+        for position, (name, *args) in enumerate(operations):
+            count += 1
+            if name == "transfer":
+                source, target, amount = args
+                cents = to_cents(amount)
+                source_shard, target_shard = self.shard_of(source), self.shard_of(target)
+                if source_shard == target_shard:
+                    op = ("transfer", source, target, cents)
+                else:
+                    hold_id = next(self._hold_ids)
+                    op = ("prepare", hold_id, source, cents)
+                    cross.append((position, hold_id, source_shard, target_shard, target, cents))
+                shard = source_shard
+            elif name in ("deposit", "withdraw", "repayment"):
+                number, amount = args
+                op = ("make_repayment" if name == "repayment" else name, number, to_cents(amount))
+                shard = self.shard_of(number)
+            else:
+                raise ValueError(f"Unknown operation: {name}")
+            per_shard[shard].append(op)
+            positions[shard].append(position)
+
+        results: list[TransactionResult | None] = [None] * count
+        for shard, reply in enumerate(self._scatter("batch", per_shard)):
+            for position, raw in zip(positions[shard], reply or ()):
+                results[position] = _unwire(raw)
+
+        prepared = [t for t in cross if results[t[0]] is not None and results[t[0]].ok]
+        if prepared:
+            self._settle(prepared, results)
+        return results
+
+    def _settle(self, prepared: list[tuple], results: list) -> None:
+        """Second phase of cross-shard transfers: credit the targets, then commit or abort the holds."""
+        credits = [[] for _ in range(self.shards)]
+        for _, _, _, target_shard, target, cents in prepared:
+            credits[target_shard].append(("deposit", target, cents))
+        replies = [iter(reply or ()) for reply in self._scatter("batch", credits)]
+
+        settle = [[] for _ in range(self.shards)]
+        for position, hold_id, source_shard, target_shard, _, _ in prepared:
+            if next(replies[target_shard]) is None:
+                settle[source_shard].append(("abort", hold_id))
+                results[position] = None
+            else:
+                settle[source_shard].append(("commit", hold_id))
+        self._scatter("batch", settle)
+
+    def _single(self, op: tuple, *account_numbers: str) -> TransactionResult:
+        """Runs one operation; KeyError names the account that does not exist (the first one if all do)."""
+        result = self.run_batch([op])[0]
+        if result is None:
+            if len(account_numbers) > 1:
+                missing = [n for n in account_numbers if self._raw_balance(n) is None]
+                raise KeyError(missing[0] if missing else account_numbers[0])
+            raise KeyError(account_numbers[0])
+        return result
+
+    def deposit(self, account_number: str, amount: Money | float) -> TransactionResult:
+        return self._single(("deposit", account_number, amount), account_number)
+
+    def withdraw(self, account_number: str, amount: Money | float) -> TransactionResult:
+        return self._single(("withdraw", account_number, amount), account_number)
+
+    def transfer(self, source_number: str, target_number: str, amount: Money | float) -> TransactionResult:
+        return self._single(("transfer", source_number, target_number, amount), source_number, target_number)
+
+    def _raw_balance(self, account_number: str) -> tuple | None:
+        shard = self.shard_of(account_number)
+        payloads = [None] * self.shards
+        payloads[shard] = [("balance", account_number)]
+        return self._scatter("batch", payloads)[shard][0]
+
+    def get_balance(self, account_number: str) -> Money:
+        raw = self._raw_balance(account_number)
+        if raw is None:
+            raise KeyError(account_number)
+        return Money.from_cents(raw[1])
+
+    def shutdown(self) -> None:
+        for conn, process in zip(self._conns, self._processes):
+            if process.is_alive():
+                conn.send(("stop", None))
+                conn.recv()
+            conn.close()
+            process.join()
+        self._conns, self._processes = [], []
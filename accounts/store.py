@@ -0,0 +1,186 @@
+from array import array
+from typing import Iterator
+
+from accounts.account_manager import AccountManager
+from accounts.money import Money, to_cents
+from accounts.savings_account import SavingsAccount
+from accounts.checking_account import CheckingAccount
+from accounts.credit_account import CreditAccount, interest_cents
+from accounts.interest import AccrualSummary, fits_int64, np, vector_interest_cents
+from accounts.result import Status, TransactionResult
+
+
+def _column(attr: str) -> property:
+    """Property that reads/writes one row of a store column instead of an instance slot."""
+    def fget(self):
+        return getattr(self._store, attr)[self._row]
+
+    def fset(self, value):
+        getattr(self._store, attr)[self._row] = value
+
+    return property(fget, fset)
+
+
+class _StoredAccount:
+    """
+    Mixin that turns a concrete account class into a view over an AccountStore row.
+
+    Placed first in the MRO, its properties shadow the slots of the concrete
+    class, so every inherited method (deposit, withdraw, apply_interest, ...)
+    reads and writes the columnar arrays directly.
+    """
+    __slots__ = ()
+
+    account_holder = _column("_holders")
+    account_number = _column("_numbers")
+    balance_cents = _column("_balances")
+    credit_limit_cents = _column("_credit_limits")
+    interest_rate = _column("_interest_rates")
+
+    def __init__(self, store: "AccountStore", row: int):
+        self._store = store
+        self._row = row
+
+
+class SavingsAccountView(_StoredAccount, SavingsAccount):
+    __slots__ = ("_store", "_row")
+
+
+class CheckingAccountView(_StoredAccount, CheckingAccount):
+    __slots__ = ("_store", "_row")
+
+
+class CreditAccountView(_StoredAccount, CreditAccount):
+    __slots__ = ("_store", "_row")
+
+
+class AccountStore:
+    """
+    Columnar storage for large account books.
+
+    Balances and credit limits (integer cents) and interest rates live in
+    typed arrays (8 bytes per account each) and the account type is a
+    one-byte code, so the per account cost no longer includes an object
+    header, a __dict__ or a copy of the type name. Accounts are handed out as lightweight views that implement
+    the full AccountManager interface on top of the shared columns.
+    """
+    _TYPES = ("savings", "checking", "credit")
+    _VIEWS = (SavingsAccountView, CheckingAccountView, CreditAccountView)
+
+    def __init__(self):
+        self._type_codes = array("b")
+        self._holders: list[str] = []
+        self._numbers: list[str] = []
+        self._balances = array("q")
+        self._credit_limits = array("q")
+        self._interest_rates = array("d")
+        self._rows: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    def __contains__(self, account_number: str) -> bool:
+        return account_number in self._rows
+
+    def __iter__(self) -> Iterator[AccountManager]:
+        return (self.view(row) for row in range(len(self._numbers)))
+
+    def add(self, account_type: str, account_holder: str, account_number: str,
+            balance: Money | float = 0, credit_limit: Money | float = 0, interest_rate: float = 0.0) -> int:
+        """
+        Appends an account row and returns its index.
+
+        Args:
+            account_type (str): 'savings', 'checking' or 'credit', as in AccountFactory.
+
+        Raises:
+            ValueError: If the type is unknown or the account number already exists.
+        """
+        try:
+            code = self._TYPES.index(account_type)
+        except ValueError:
+            raise ValueError(f"Unknown account type: {account_type}") from None
+        if account_number in self._rows:
+            raise ValueError(f"Account already stored: {account_number}")
+        row = len(self._numbers)
+        self._type_codes.append(code)
+        self._holders.append(account_holder)
+        self._numbers.append(account_number)
+        self._balances.append(to_cents(balance))
+        self._credit_limits.append(to_cents(credit_limit))
+        self._interest_rates.append(interest_rate)
+        self._rows[account_number] = row
+        return row
+
+    def add_account(self, account: AccountManager) -> int:
+        """Copies an existing account object into the store and returns its row."""
+        account_type = self._TYPES[self._code_for(account)]
+        return self.add(
+            account_type,
+            account.account_holder,
+            account.account_number,
+            balance=account.balance,
+            credit_limit=getattr(account, "credit_limit", 0),
+            interest_rate=getattr(account, "interest_rate", 0.0),
+        )
+
+    def view(self, row: int) -> AccountManager:
+        """Returns an AccountManager view over the given row."""
+        return self._VIEWS[self._type_codes[row]](self, row)
+
+    def get(self, account_number: str) -> AccountManager | None:
+        """Returns a view for the account number, or None if it is not stored."""
+        row = self._rows.get(account_number)
+        return None if row is None else self.view(row)
+
+    def accrue_interest(self, months: int) -> AccrualSummary:
+        """
+        Month-end interest accrual over every credit row, computed on the columns.
+
+        With NumPy the balance column is updated in place through a zero-copy
+        view, so no account object is created. Without NumPy (or if the
+        products could overflow int64) a plain loop over the rows is used.
+        Views are only created to notify listeners when some are registered.
+        """
+        credit = self._TYPES.index("credit")
+        charged_rows = []
+        total = 0
+        if np is not None:
+            balances = np.frombuffer(self._balances, dtype=np.int64)
+            is_credit = np.frombuffer(self._type_codes, dtype=np.int8) == credit
+            rates_bp = np.rint(np.frombuffer(self._interest_rates, dtype=np.float64) * 100).astype(np.int64)
+            if fits_int64(balances[is_credit], rates_bp[is_credit], months):
+                accrued = np.where(is_credit, vector_interest_cents(balances, rates_bp, months), 0)
+                balances += accrued
+                total = int(accrued.sum())
+                charged = int(np.count_nonzero(accrued))
+                if AccountManager._listeners:
+                    rows = np.flatnonzero(accrued)
+                    charged_rows = list(zip(rows.tolist(), accrued[rows].tolist()))
+                # Release the buffer exports so the arrays can grow again.
+                del balances, is_credit, rates_bp, accrued
+                self._notify_accrual(charged_rows)
+                return AccrualSummary(charged, Money.from_cents(total))
+            del balances, is_credit, rates_bp
+        for row, code in enumerate(self._type_codes):
+            if code == credit and self._balances[row] > 0:
+                cents = interest_cents(self._balances[row], self._interest_rates[row], months)
+                if cents > 0:
+                    self._balances[row] += cents
+                    charged_rows.append((row, cents))
+                    total += cents
+        self._notify_accrual(charged_rows)
+        return AccrualSummary(len(charged_rows), Money.from_cents(total))
+
+    def _notify_accrual(self, charged_rows: list) -> None:
+        if AccountManager._listeners:
+            for row, cents in charged_rows:
+                view = self.view(row)
+                view._notify("interest", Money.from_cents(cents),
+                             TransactionResult(Status.ACCEPTED, Money.from_cents(view.balance_cents)))
+
+    def _code_for(self, account: AccountManager) -> int:
+        for code, cls in enumerate((SavingsAccount, CheckingAccount, CreditAccount)):
+            if isinstance(account, cls):
+                return code
+        raise ValueError(f"Unsupported account class: {type(account).__name__}")
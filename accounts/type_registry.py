@@ -0,0 +1,159 @@
+import functools
+import importlib
+from typing import Any, Iterator, Mapping, Sequence
+
+
+class TypeRegistry:
+    """
+    Maps type names ('savings', 'debit', ...) to classes, importing each
+    class's module only the first time that type is requested.
+
+    Types are declared as "package.module:ClassName" strings (or registered
+    as classes), so importing a factory does not import every account or
+    card implementation, and startup cost does not grow with the number of
+    registered types.
+
+    Plugins can add types without touching the factory, either by calling
+    register() or by declaring an entry point in entry_point_group, e.g. in
+    a plugin's pyproject.toml:
+
+        [project.entry-points."atm.account_types"]
+        premium = "atm_premium.accounts:PremiumAccount"
+
+    Entry points are only scanned when a name is not found among the
+    registered types, so they do not slow down startup either.
+    """
+    def __init__(self, kind: str, types: Mapping[str, str], entry_point_group: str | None = None):
+        self.kind = kind
+        self.entry_point_group = entry_point_group
+        self._paths: dict[str, str] = dict(types)
+        self._classes: dict[str, type] = {}
+        self._entry_points_loaded = entry_point_group is None
+
+    def __contains__(self, name: str) -> bool:
+        if name not in self._paths:
+            self._load_entry_points()
+        return name in self._paths
+
+    def __iter__(self) -> Iterator[str]:
+        self._load_entry_points()
+        return iter(self._paths)
+
+    def register(self, name: str, cls: type | str, replace: bool = False) -> None:
+        """
+        Registers a type under name, as a class or a lazy "module:Class" path.
+
+        Raises:
+            ValueError: If name is already registered and replace is False.
+        """
+        if name in self._paths and not replace:
+            raise ValueError(f"{self.kind.capitalize()} type already registered: {name}")
+        if isinstance(cls, str):
+            self._paths[name] = cls
+            self._classes.pop(name, None)
+        else:
+            self._paths[name] = f"{cls.__module__}:{cls.__qualname__}"
+            self._classes[name] = cls
+
+    def unregister(self, name: str) -> None:
+        self._paths.pop(name, None)
+        self._classes.pop(name, None)
+
+    def get(self, name: str) -> type:
+        """
+        Returns the class registered under name, importing it on first use.
+
+        Raises:
+            ValueError: If no type is registered under that name.
+        """
+        cls = self._classes.get(name)
+        if cls is not None:
+            return cls
+        path = self._paths.get(name)
+        if path is None:
+            self._load_entry_points()
+            path = self._paths.get(name)
+            if path is None:
+                raise ValueError(f"Unknown {self.kind} type: {name}")
+        module_name, _, class_name = path.partition(":")
+        cls = getattr(importlib.import_module(module_name), class_name)
+        self._classes[name] = cls
+        return cls
+
+    def loaded(self) -> tuple[str, ...]:
+        """Names whose class has been imported so far."""
+        return tuple(self._classes)
+
+    def _load_entry_points(self) -> None:
+        if self._entry_points_loaded:
+            return
+        self._entry_points_loaded = True
+        from importlib import metadata  # slow to import; only needed once a name is not built in
+        for entry_point in metadata.entry_points(group=self.entry_point_group):
+            # Built-in and explicitly registered types win over plugins
+            self._paths.setdefault(entry_point.name, entry_point.value)
+
+
+@functools.lru_cache(maxsize=None)
+def _parameters(cls: type) -> tuple[tuple[str, ...], frozenset[str], frozenset[str]]:
+    """(positional parameter names in order, keyword-only names, required names) of cls.__init__."""
+    import inspect  # only bulk creation needs it; keeps factory imports cheap at startup
+    positional, keyword_only, required = [], set(), set()
+    for name, parameter in inspect.signature(cls).parameters.items():
+        if parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD):
+            positional.append(name)
+        elif parameter.kind is parameter.KEYWORD_ONLY:
+            keyword_only.add(name)
+        else:
+            continue
+        if parameter.default is parameter.empty:
+            required.add(name)
+    return tuple(positional), frozenset(keyword_only), frozenset(required)
+
+
+def construct_many(cls: type, columns: Mapping[str, Sequence], constants: Mapping[str, Any]) -> list:
+    """
+    Builds one cls instance per row of columnar input.
+
+    Columns are matched to cls.__init__ parameters once, then every object
+    is created with a positional call driven by map(), so bulk creation
+    pays neither for per-object keyword dicts nor for type dispatch.
+    Constants are bound once with functools.partial. Keyword-only columns
+    (e.g. a card's pin_hash) fall back to one keyword call per row.
+
+    Raises:
+        ValueError: On unknown or missing columns, or columns of different lengths.
+    """
+    positional, keyword_only, required = _parameters(cls)
+    both = set(columns) & set(constants)
+    if both:
+        raise ValueError(f"Given both as column and constant: {sorted(both)}")
+    names = set(columns) | set(constants)
+    unknown = names - set(positional) - keyword_only
+    if unknown:
+        raise ValueError(f"Unknown columns for {cls.__name__}: {sorted(unknown)}")
+    missing = required - names
+    if missing:
+        raise ValueError(f"Missing columns for {cls.__name__}: {sorted(missing)}")
+    lengths = {len(column) for column in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+    if not columns:
+        return []
+
+    # Leading positional parameters given as columns go through map(); the rest by keyword.
+    leading = []
+    for name in positional:
+        if name not in columns:
+            break
+        leading.append(name)
+    keyword_columns = [name for name in columns if name not in leading]
+    factory = functools.partial(cls, **constants) if constants else cls
+    if not keyword_columns:
+        return list(map(factory, *(columns[name] for name in leading)))
+    leading_values = [columns[name] for name in leading]
+    keyword_values = [columns[name] for name in keyword_columns]
+    return [
+        factory(*row[:len(leading)], **dict(zip(keyword_columns, row[len(leading):])))
+        for row in zip(*leading_values, *keyword_values)
+    ]
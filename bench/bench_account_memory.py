@@ -0,0 +1,65 @@
+"""
+Memory benchmark: per-account footprint of the different account layouts.
+
+Compares the legacy object layout (instances with a __dict__), the current
+__slots__ classes and the columnar AccountStore.
+
+Usage:
+    python -m bench.bench_account_memory [num_accounts]
+"""
+import sys
+import tracemalloc
+
+from accounts.savings_account import SavingsAccount
+from accounts.store import AccountStore
+
+
+class _DictSavingsAccount(SavingsAccount):
+    """Same behavior as SavingsAccount but with a per-instance __dict__, like the pre-slots classes."""
+
+    def __init__(self, account_holder: str, account_number: str, balance=0):
+        super().__init__(account_holder, account_number, balance)
+        self.account_type_name = "Savings"
+
+
+def _measure(build, n: int) -> int:
+    # Names and numbers are built up front so only the layout itself is measured.
+    holders = [f"Holder {i}" for i in range(n)]
+    numbers = [f"ACC-{i:09d}" for i in range(n)]
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    book = build(holders, numbers)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del book
+    return after - before
+
+
+def _dict_objects(holders, numbers):
+    return {num: _DictSavingsAccount(h, num, i) for i, (h, num) in enumerate(zip(holders, numbers))}
+
+
+def _slot_objects(holders, numbers):
+    return {num: SavingsAccount(h, num, i) for i, (h, num) in enumerate(zip(holders, numbers))}
+
+
+def _store(holders, numbers):
+    store = AccountStore()
+    for i, (h, num) in enumerate(zip(holders, numbers)):
+        store.add("savings", h, num, i)
+    return store
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 200_000
+    print(f"Accounts: {n}")
+    for label, build in (("__dict__ objects", _dict_objects),
+                         ("__slots__ objects", _slot_objects),
+                         ("AccountStore", _store)):
+        used = _measure(build, n)
+        print(f"{label:<18} {used / 1e6:9.1f} MB  {used / n:7.1f} B/account")
+
+
+if __name__ == "__main__":
+    main()
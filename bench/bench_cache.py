@@ -0,0 +1,106 @@
+"""
+Benchmark: write-back account cache in front of the SQLite repository.
+
+Stores a seeded workload in a fresh SQLite file and replays the same
+Zipf-skewed mix of balance inquiries and withdrawals (get_account, then
+get_balance or withdraw, as the front ends do) through repositories whose
+account cache differs in policy (LRU or ARC) and capacity. A nightly-batch
+style scan over every account is interleaved with the traffic, which is
+what separates ARC from LRU.
+
+For each configuration prints operations/sec, hit rate, p50/p99 latency of
+cache lookups, evictions, and how many flushes and rows the coalesced
+periodic write-back needed. Ends by checking that the database holds the
+balances left in memory.
+
+Usage:
+    python -m bench.bench_cache [--accounts 100000] [--operations 200000] [--capacity 0.01 0.1]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from bench.workload import Workload
+from storage.sqlite_repository import SQLiteRepository
+from telemetry.metrics import MetricsRegistry
+
+
+def _replay(repository: SQLiteRepository, ops: list, scan: list[str], scan_every: int) -> float:
+    get_account = repository.get_account
+    start = time.perf_counter()
+    for i, (number, withdraw) in enumerate(ops):
+        account = get_account(number)
+        if withdraw:
+            account.withdraw(1)
+        else:
+            account.get_balance()
+        if scan_every and i % scan_every == 0:
+            for scanned in scan:
+                get_account(scanned).get_balance()
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write-back account cache benchmark")
+    parser.add_argument("--accounts", type=int, default=100_000)
+    parser.add_argument("--operations", type=int, default=200_000)
+    parser.add_argument("--zipf", type=float, default=1.1)
+    parser.add_argument("--withdraw-ratio", type=float, default=0.2)
+    parser.add_argument("--capacity", type=float, nargs="+", default=[0.01, 0.1],
+                        help="cache sizes as a fraction of the accounts")
+    parser.add_argument("--flush-interval", type=float, default=0.05)
+    parser.add_argument("--scan", type=int, default=2_000, help="accounts read by each interleaved scan (0: none)")
+    args = parser.parse_args(argv)
+
+    workload = Workload(args.accounts, zipf_s=args.zipf)
+    accounts = workload.build_accounts()
+    numbers = [account.account_number for account in accounts]
+    pattern = workload.access_pattern(args.operations, stream=0)
+    ops = [(numbers[index], i % 100 < args.withdraw_ratio * 100) for i, index in enumerate(pattern)]
+    scan = numbers[:args.scan]
+    scan_every = args.operations // 10 if args.scan else 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "atm.db")
+        with SQLiteRepository(path) as repository:
+            repository.save_accounts(accounts)
+        del accounts
+
+        print(f"Accounts: {args.accounts}  operations: {args.operations}  zipf s={args.zipf}  "
+              f"withdrawals {args.withdraw_ratio:.0%}  scan {args.scan} x{10 if args.scan else 0}")
+        print(f"{'policy':<6} {'capacity':>9} {'ops/s':>10} {'hit rate':>9} {'p50 get':>9} {'p99 get':>9} "
+              f"{'evictions':>10} {'flushes':>8} {'rows':>8}")
+        for fraction in args.capacity:
+            capacity = max(1, int(args.accounts * fraction))
+            for policy in ("lru", "arc"):
+                metrics = MetricsRegistry()
+                with SQLiteRepository(path, account_cache_size=capacity, cache_policy=policy,
+                                      write_batch=capacity + 1, flush_interval=args.flush_interval,
+                                      metrics=metrics) as repository:
+                    repository.attach()
+                    try:
+                        elapsed = _replay(repository, ops, scan, scan_every)
+                    finally:
+                        repository.detach()
+                    repository.flush()
+                    cache = repository.account_cache
+                    get = metrics.operation("account_cache_get")
+                    print(f"{policy:<6} {capacity:>9,} {args.operations / elapsed:>10,.0f} {cache.hit_rate:>9.1%} "
+                          f"{get.quantile(0.5) * 1e6:>7.1f}µs {get.quantile(0.99) * 1e6:>7.1f}µs "
+                          f"{cache.evictions:>10,} {cache.flushes:>8,} {cache.written:>8,}")
+
+        # Every configuration applied the same withdrawals on top of the previous one's;
+        # replaying them as many times on fresh in-memory accounts must give the stored balances.
+        expected = {account.account_number: account for account in workload.build_accounts()}
+        for _ in range(len(args.capacity) * 2):
+            for number, withdraw in ops:
+                if withdraw:
+                    expected[number].withdraw(1)
+        with SQLiteRepository(path, balance_cache_size=0) as check:
+            same = all(check.get_balance(n).cents == a.balance_cents for n, a in expected.items())
+        print(f"write-back consistent: {'yes' if same else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
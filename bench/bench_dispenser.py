@@ -0,0 +1,101 @@
+"""
+Benchmark: cash dispenser note planning.
+
+Times solve_notes on a mix of withdrawal amounts (mostly the usual round
+amounts, some arbitrary multiples of 10 up to 1000, a few the terminal
+cannot pay) against several realistic cassette inventories: full four-
+and six-cassette terminals, a terminal running out of small notes and a
+two-denomination one. Then replays a withdrawal stream through a
+CashDispenser, with and without the plan memo, refilling the cassettes
+whenever they run low, and prints the latency of each withdrawal
+(planning, debit and taking the notes out) and the memo hit rate.
+
+Usage:
+    python -m bench.bench_dispenser [--amounts 20000] [--withdrawals 200000]
+"""
+import argparse
+import random
+import time
+
+from accounts.factory import AccountFactory
+from accounts.money import Money
+from dispenser.cassettes import DEFAULT_CASSETTES, CassetteInventory
+from dispenser.dispenser import CashDispenser
+from dispenser.solver import solve_notes
+
+INVENTORIES = {
+    "4 cassettes": DEFAULT_CASSETTES,
+    "6 cassettes": "5x500,10x500,20x1000,50x600,100x300,200x100",
+    "low on 10/20": "10x3,20x2,50x400,100x150",
+    "20/50 only": "20x1000,50x1000",
+}
+COMMON_AMOUNTS = (20, 40, 50, 60, 100, 150, 200, 300, 400, 500)
+
+
+def _amounts(n: int, seed: int = 7) -> list[int]:
+    """Withdrawal amounts in cents: 80% common, 17% any multiple of 10 up to 1000, 3% odd."""
+    rng = random.Random(seed)
+    amounts = []
+    for _ in range(n):
+        roll = rng.random()
+        if roll < 0.80:
+            units = rng.choices(COMMON_AMOUNTS, weights=(10, 8, 9, 7, 10, 4, 6, 3, 2, 2))[0]
+        elif roll < 0.97:
+            units = rng.randint(1, 100) * 10
+        else:
+            units = rng.choice((15, 35, 2500, 999))
+        amounts.append(units * 100)
+    return amounts
+
+
+def _quantiles(samples: list[float]) -> tuple[float, float]:
+    samples.sort()
+    return samples[len(samples) // 2], samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cash dispenser benchmark")
+    parser.add_argument("--amounts", type=int, default=20_000)
+    parser.add_argument("--withdrawals", type=int, default=200_000)
+    parser.add_argument("--max-notes", type=int, default=40)
+    args = parser.parse_args(argv)
+
+    amounts = _amounts(args.amounts)
+    clock = time.perf_counter
+    print(f"solve_notes over {args.amounts} amounts (max {args.max_notes} notes)")
+    print(f"{'inventory':<14} {'p50':>8} {'p99':>8} {'payable':>8}")
+    for name, spec in INVENTORIES.items():
+        stock = CassetteInventory.from_spec(spec).stock()
+        samples, payable = [], 0
+        for cents in amounts:
+            start = clock()
+            notes = solve_notes(cents, stock, args.max_notes)
+            samples.append(clock() - start)
+            payable += notes is not None
+        p50, p99 = _quantiles(samples)
+        print(f"{name:<14} {p50 * 1e6:>6.1f}µs {p99 * 1e6:>6.1f}µs {payable / len(amounts):>8.1%}")
+
+    stream = [Money.from_cents(cents) for cents in _amounts(args.withdrawals, seed=8)]
+    print(f"\nCashDispenser on {DEFAULT_CASSETTES}, {args.withdrawals} withdrawals, refilled when it runs dry")
+    print(f"{'memo':<6} {'withdraw/s':>10} {'p50':>8} {'p99':>8} {'hit rate':>9} {'refills':>8}")
+    for cache_size in (0, 256):
+        dispenser = CashDispenser(CassetteInventory.from_spec(DEFAULT_CASSETTES), args.max_notes, cache_size)
+        account = AccountFactory.create_account("checking", account_holder="Bench", account_number="BENCH",
+                                                balance=10 ** 12)
+        samples, refills = [], 0
+        for amount in stream:
+            start = clock()
+            dispensed = dispenser.withdraw(account, amount)
+            samples.append(clock() - start)
+            if not dispensed.ok and dispenser.inventory.total_cents() < 100_000:
+                dispenser.inventory.refill()
+                refills += 1
+        elapsed = sum(samples)
+        p50, p99 = _quantiles(samples)
+        lookups = dispenser.hits + dispenser.misses
+        print(f"{cache_size or 'off':<6} {len(stream) / elapsed:>10,.0f} {p50 * 1e6:>6.1f}µs {p99 * 1e6:>6.1f}µs "
+              f"{dispenser.hits / lookups:>9.1%} {refills:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Stress benchmark for TransactionEngine.
+
+Runs the same random mix of transfers, deposits and withdrawals with an
+increasing number of worker threads, reports ops/sec for each thread count
+and checks that money is conserved: the final total must equal the initial
+total plus accepted deposits minus accepted withdrawals, and no savings
+account may end below zero.
+
+Usage:
+    python -m bench.bench_engine [num_operations] [num_accounts]
+"""
+import random
+import sys
+import time
+
+from accounts.engine import TransactionEngine
+from accounts.factory import AccountFactory
+from accounts.money import Money
+
+
+def _build_accounts(num_accounts: int):
+    return [
+        AccountFactory.create_account("savings", account_holder=f"Holder {i}",
+                                      account_number=f"SAV-{i:07d}", balance=100)
+        for i in range(num_accounts)
+    ]
+
+
+def _build_operations(accounts, n: int, seed: int = 42):
+    rng = random.Random(seed)
+    amounts = [Money(a) for a in (5, 10, 20, 50, 120)]
+    operations = []
+    for _ in range(n):
+        kind = rng.random()
+        amount = rng.choice(amounts)
+        if kind < 0.6:
+            source, target = rng.sample(accounts, 2)
+            operations.append(("transfer", source, target, amount))
+        elif kind < 0.8:
+            operations.append(("deposit", rng.choice(accounts), amount))
+        else:
+            operations.append(("withdraw", rng.choice(accounts), amount))
+    return operations
+
+
+def _check_conservation(accounts, operations, results, initial_cents: int) -> bool:
+    delta = 0
+    for operation, result in zip(operations, results):
+        if result.ok and operation[0] == "deposit":
+            delta += operation[2].cents
+        elif result.ok and operation[0] == "withdraw":
+            delta -= operation[2].cents
+    final_cents = sum(a.balance_cents for a in accounts)
+    no_overdraft = all(a.balance_cents >= 0 for a in accounts)
+    return final_cents == initial_cents + delta and no_overdraft
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 400_000
+    num_accounts = int(argv[1]) if len(argv) > 1 else 1_000
+
+    print(f"Operations: {n}  Accounts: {num_accounts}")
+    baseline = None
+    for threads in (1, 2, 4, 8):
+        accounts = _build_accounts(num_accounts)
+        operations = _build_operations(accounts, n)
+        initial = sum(a.balance_cents for a in accounts)
+        with TransactionEngine(workers=threads) as engine:
+            start = time.perf_counter()
+            results = engine.run_batch(operations)
+            elapsed = time.perf_counter() - start
+        rate = n / elapsed
+        baseline = baseline or rate
+        conserved = _check_conservation(accounts, operations, results, initial)
+        print(f"threads={threads:<2} {rate:12,.0f} ops/s  speedup {rate / baseline:4.2f}x  "
+              f"conserved={'yes' if conserved else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Benchmark: fraud detector replay on generated traffic.
+
+Generates a day of ATM activity: normal sessions (mostly at each card's
+home terminal, the odd PIN typo or declined withdrawal) mixed with
+labelled attacks:
+
+    cloned     one card withdrawing at several terminals within the hour
+    pin_guess  PIN failures on one card spread over lockouts and terminals
+    probing    repeated declined withdrawals (balance or limit probing)
+    velocity   many withdrawals of one card at its home terminal
+    cash_out   many cards emptied at one terminal in a few minutes
+
+and replays it through a FraudDetector in time order, the way the front
+ends call it: record_pin for every PIN attempt, score before every
+withdrawal and record_withdrawal after it (as declined if it was blocked).
+
+Prints events/sec and per-event latency against the detector's budget,
+the share of attack cards (terminals for cash_out) that were flagged or
+blocked, the false positives among normal cards, and the sketches' memory.
+
+Usage:
+    python -m bench.bench_fraud [--cards 100000] [--terminals 2000] [--sessions 150000]
+"""
+import argparse
+import random
+import time
+from collections import defaultdict
+
+from accounts.money import Money
+from accounts.result import Reason, Status, TransactionResult
+from fraud.detector import Action, FraudDetector
+from ui.demo_data import synthetic_card_number
+
+DAY = 86400.0
+ACCEPTED = TransactionResult(Status.ACCEPTED, Money.from_cents(0))
+DECLINED = TransactionResult(Status.REJECTED, Money.from_cents(0), Reason.INSUFFICIENT_FUNDS)
+# event kinds
+PIN_OK, PIN_FAIL, WITHDRAW, WITHDRAW_DECLINED = range(4)
+
+
+def _traffic(args, rng: random.Random):
+    """Returns time-ordered (time, kind, card, terminal) events and the attack label of each card/terminal."""
+    terminals = [f"T{i:05d}" for i in range(args.terminals)]
+    home = [rng.choice(terminals) for _ in range(args.cards)]
+    events = []
+    labels: dict[str, str] = {}
+
+    def session(t, card, terminal, typos=0, withdrawals=1, declined=False):
+        for _ in range(typos):
+            events.append((t, PIN_FAIL, card, terminal))
+            t += 5
+        events.append((t, PIN_OK, card, terminal))
+        for _ in range(withdrawals):
+            t += 20
+            events.append((t, WITHDRAW_DECLINED if declined else WITHDRAW, card, terminal))
+
+    for _ in range(args.sessions):
+        index = rng.randrange(args.cards)
+        terminal = home[index] if rng.random() < 0.85 else rng.choice(terminals)
+        session(rng.uniform(0, DAY), synthetic_card_number(index), terminal,
+                typos=1 if rng.random() < 0.03 else 0,
+                withdrawals=2 if rng.random() < 0.05 else 1,
+                declined=rng.random() < 0.02)
+
+    attackers = iter(rng.sample(range(args.cards), args.attackers * 4))
+    for _ in range(args.attackers):
+        card = synthetic_card_number(next(attackers))
+        labels[card] = "cloned"
+        t = rng.uniform(0, DAY - 3600)
+        for terminal in rng.sample(terminals, 6):
+            session(t, card, terminal)
+            t += rng.uniform(120, 600)
+
+        card = synthetic_card_number(next(attackers))
+        labels[card] = "pin_guess"
+        t = rng.uniform(0, DAY - 3600)
+        for _ in range(4):
+            terminal = rng.choice(terminals)
+            events.append((t, PIN_FAIL, card, terminal))
+            events.append((t + 10, PIN_FAIL, card, terminal))
+            t += rng.uniform(40, 300)
+        session(t, card, rng.choice(terminals))
+
+        index = next(attackers)
+        card = synthetic_card_number(index)
+        labels[card] = "probing"
+        session(rng.uniform(0, DAY - 3600), card, home[index], withdrawals=10, declined=True)
+        session(rng.uniform(0, DAY - 3600), card, home[index])
+
+        index = next(attackers)
+        card = synthetic_card_number(index)
+        labels[card] = "velocity"
+        t = rng.uniform(0, DAY - 3600)
+        for _ in range(15):
+            session(t, card, home[index])
+            t += rng.uniform(60, 240)
+
+    for _ in range(args.cash_outs):
+        terminal = rng.choice(terminals)
+        labels[terminal] = "cash_out"
+        t = rng.uniform(0, DAY - 600)
+        for index in rng.sample(range(args.cards), 80):
+            session(t, synthetic_card_number(index), terminal)
+            t += rng.uniform(2, 8)
+
+    events.sort()
+    return events, labels
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fraud detector replay benchmark")
+    parser.add_argument("--cards", type=int, default=100_000)
+    parser.add_argument("--terminals", type=int, default=2_000)
+    parser.add_argument("--sessions", type=int, default=150_000, help="normal sessions over the day")
+    parser.add_argument("--attackers", type=int, default=200, help="cards per attack scenario")
+    parser.add_argument("--cash-outs", type=int, default=5, help="terminals hit by a cash-out run")
+    parser.add_argument("--width", type=int, default=2048)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    events, labels = _traffic(args, random.Random(args.seed))
+    now = [0.0]
+    detector = FraudDetector(width=args.width, depth=args.depth, clock=lambda: now[0])
+    record_pin, score, record_withdrawal = detector.record_pin, detector.score, detector.record_withdrawal
+    worst: dict[str, Action] = defaultdict(lambda: Action.ALLOW)
+    severity = {Action.ALLOW: 0, Action.FLAG: 1, Action.BLOCK: 2}
+    latencies = []
+    clock = time.perf_counter
+
+    start = clock()
+    for t, kind, card, terminal in events:
+        now[0] = t
+        began = clock()
+        if kind == PIN_OK or kind == PIN_FAIL:
+            record_pin(card, kind == PIN_OK, terminal)
+        else:
+            verdict = score(card, terminal)
+            blocked = verdict.action is Action.BLOCK
+            record_withdrawal(card, DECLINED if blocked or kind == WITHDRAW_DECLINED else ACCEPTED, terminal)
+            if severity[verdict.action] > severity[worst[card]]:
+                worst[card] = verdict.action
+            if "terminal_withdrawals" in verdict.reasons:
+                worst[terminal] = Action.FLAG  # terminal rules only flag
+        latencies.append(clock() - began)
+    elapsed = clock() - start
+
+    latencies.sort()
+    n = len(latencies)
+    print(f"Events: {n:,} over one simulated day  cards {args.cards:,}  terminals {args.terminals:,}  "
+          f"sketches {args.width}x{args.depth} ({detector.nbytes / 1e6:.1f} MB)")
+    print(f"throughput {n / elapsed:12,.0f} events/s")
+    print(f"latency    p50 {latencies[n // 2] * 1e6:.1f}µs  p99 {latencies[int(n * 0.99)] * 1e6:.1f}µs  "
+          f"p99.9 {latencies[int(n * 0.999)] * 1e6:.1f}µs  max {latencies[-1] * 1e6:.0f}µs  "
+          f"over {detector.budget * 1e6:.0f}µs budget: {detector.over_budget} ({detector.over_budget / n:.3%})")
+
+    print(f"{'scenario':<10} {'keys':>7} {'flagged':>8} {'blocked':>8}")
+    by_label = defaultdict(list)
+    for key, label in labels.items():
+        by_label[label].append(worst[key])
+    normal = [worst[synthetic_card_number(i)] for i in range(args.cards)
+              if synthetic_card_number(i) not in labels]
+    by_label["normal"] = normal
+    for label in ("cloned", "pin_guess", "probing", "velocity", "cash_out", "normal"):
+        actions = by_label[label]
+        if not actions:
+            continue
+        flagged = sum(action is not Action.ALLOW for action in actions)
+        blocked = sum(action is Action.BLOCK for action in actions)
+        print(f"{label:<10} {len(actions):>7,} {flagged / len(actions):>8.1%} {blocked / len(actions):>8.1%}")
+
+
+if __name__ == "__main__":
+    main()
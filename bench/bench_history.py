@@ -0,0 +1,77 @@
+"""
+Benchmark: per-account transaction history.
+
+Records operations spread over many accounts (a few hot ones, as in the
+seeded workload) into a TransactionHistory backed by a segment file, then
+reports appends/sec, the history's memory per account, and the time to
+read a page of the hottest account at increasing depths by following
+cursors. Page time should not grow with depth.
+
+Usage:
+    python -m bench.bench_history [--accounts 10000] [--operations 500000] [--capacity 16]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from bench.workload import Workload
+from storage.history import TransactionHistory
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Transaction history benchmark")
+    parser.add_argument("--accounts", type=int, default=10_000)
+    parser.add_argument("--operations", type=int, default=500_000)
+    parser.add_argument("--capacity", type=int, default=16)
+    parser.add_argument("--page-size", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    workload = Workload(args.accounts)
+    pattern = workload.access_pattern(args.operations)
+    numbers = [f"ACC-{i:09d}" for i in range(args.accounts)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.seg")
+        history = TransactionHistory(path, capacity=args.capacity)
+        append = history.append
+        start = time.perf_counter()
+        for i, index in enumerate(pattern):
+            append(numbers[index], "withdraw" if i % 3 else "deposit", 1000, i)
+        elapsed = time.perf_counter() - start
+
+        # Same operations again under tracemalloc (which slows appends down), without a file
+        tracemalloc.start()
+        in_memory = TransactionHistory(capacity=args.capacity)
+        for i, index in enumerate(pattern):
+            in_memory.append(numbers[index], "withdraw" if i % 3 else "deposit", 1000, i)
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del in_memory
+        active = sum(1 for number in numbers if history.count(number))
+        print(f"Operations: {args.operations}  accounts: {args.accounts} ({active} active)  capacity {args.capacity}")
+        print(f"append                {args.operations / elapsed:12,.0f} ops/s")
+        print(f"memory                {memory / active:12,.0f} B/active account   "
+              f"segment file {os.path.getsize(path) / 1e6:.1f} MB")
+
+        hottest = max(numbers, key=history.count)
+        total = history.count(hottest)
+        print(f"hottest account: {total} operations; page of {args.page_size} by depth:")
+        cursor, depth, report_at = None, 0, 0
+        while True:
+            start = time.perf_counter()
+            entries, cursor = history.page(hottest, args.page_size, cursor)
+            page_us = (time.perf_counter() - start) * 1e6
+            if depth >= report_at:
+                print(f"    depth {depth:>9,}  {page_us:8.1f} µs")
+                report_at = max(args.page_size, report_at * 10)
+            depth += len(entries)
+            if cursor is None:
+                break
+        history.close()
+        print(f"read {depth} of {total} operations")
+
+
+if __name__ == "__main__":
+    main()
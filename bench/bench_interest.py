@@ -0,0 +1,68 @@
+"""
+Benchmark: month-end interest accrual over a credit portfolio.
+
+Compares the per-object loop (CreditAccount.apply_interest on every
+account), the batch accrue_interest over the same objects, and
+AccountStore.accrue_interest on the columnar store. All three must
+produce the same total.
+
+Usage:
+    python -m bench.bench_interest [num_accounts] [months]
+"""
+import random
+import sys
+import time
+
+from accounts.credit_account import CreditAccount
+from accounts.interest import accrue_interest, np
+from accounts.money import Money
+from accounts.store import AccountStore
+
+
+def _portfolio(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [(f"CRD-{i:09d}", rng.randint(-50_000, 500_000), rng.choice((9.99, 14.5, 19.99, 24.0)))
+            for i in range(n)]
+
+
+def _objects(rows):
+    return [CreditAccount("Holder", number, credit_limit=1000, interest_rate=rate,
+                          balance=Money.from_cents(cents)) for number, cents, rate in rows]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 1_000_000
+    months = int(argv[1]) if len(argv) > 1 else 1
+    rows = _portfolio(n)
+
+    accounts = _objects(rows)
+    before = sum(a.balance_cents for a in accounts)
+    start = time.perf_counter()
+    for account in accounts:
+        account.apply_interest(months)
+    loop = time.perf_counter() - start
+    loop_total = sum(a.balance_cents for a in accounts) - before
+
+    accounts = _objects(rows)
+    start = time.perf_counter()
+    batch = accrue_interest(accounts, months)
+    batch_time = time.perf_counter() - start
+
+    store = AccountStore()
+    for number, cents, rate in rows:
+        store.add("credit", "Holder", number, Money.from_cents(cents), 1000, rate)
+    start = time.perf_counter()
+    columnar = store.accrue_interest(months)
+    store_time = time.perf_counter() - start
+
+    print(f"Accounts: {n}  Months: {months}  NumPy: {'yes' if np is not None else 'no (fallback loop)'}")
+    print(f"apply_interest loop       {loop:8.3f} s  total {Money.from_cents(loop_total)}")
+    print(f"accrue_interest(objects)  {batch_time:8.3f} s  total {batch.total_interest}  ({loop / batch_time:.1f}x)")
+    print(f"AccountStore.accrue       {store_time:8.3f} s  total {columnar.total_interest}  ({loop / store_time:.1f}x)")
+    if not (loop_total == batch.total_interest.cents == columnar.total_interest.cents):
+        print("MISMATCH between accrual paths")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: journal commits/sec at different batch sizes.
+
+Each run appends the same number of records from several threads and
+reports records/s, the number of fsync'd group commits and the average
+records per commit. "async" returns as soon as a record is queued (loss
+window = commit interval); "wait" blocks every caller until its record is
+durable, so concurrent callers share fsyncs.
+
+Usage:
+    python -m bench.bench_journal [records] [threads]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from storage.journal import TransactionJournal
+
+
+def _run(path, records, threads, max_batch, wait_for_commit, commit_interval=0.002):
+    journal = TransactionJournal(path, commit_interval=commit_interval, max_batch=max_batch,
+                                 wait_for_commit=wait_for_commit)
+    per_thread = records // threads
+
+    def worker(index):
+        number = f"ACC-{index:05d}"
+        for i in range(per_thread):
+            journal.append(number, "deposit", 1000, i * 1000)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    journal.flush()
+    elapsed = time.perf_counter() - start
+    journal.close()
+    return per_thread * threads / elapsed, journal.commits
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    records = int(argv[0]) if argv else 20_000
+    threads = int(argv[1]) if len(argv) > 1 else 16
+
+    print(f"Records: {records}  Threads: {threads}")
+    print(f"{'mode':<6}{'max_batch':>10}{'records/s':>14}{'commits':>9}{'rec/commit':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for wait in (False, True):
+            for max_batch in (1, 16, 128, 1024):
+                path = os.path.join(tmp, f"journal-{wait}-{max_batch}.wal")
+                rate, commits = _run(path, records, threads, max_batch, wait)
+                mode = "wait" if wait else "async"
+                print(f"{mode:<6}{max_batch:>10}{rate:>14,.0f}{commits:>9}{records / max(commits, 1):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: cost of the sliding-window withdrawal limits.
+
+Issues one card per account for a seeded workload and runs a Zipf-skewed
+stream of withdrawals through WithdrawalLimits (hourly and daily per card,
+daily per account). A simulated clock spreads the stream over --days
+days, so the windows keep sliding and counters of idle cards are dropped.
+
+A rejected withdrawal never debits and is cheaper than an accepted one,
+so timing the whole stream would mostly measure the rejection path. The
+timings therefore replay only the withdrawals that were accepted, from
+the same balances and at the same simulated times (rejections change no
+state, so every one of them is accepted again): straight on each card's
+account and through the limits. Prints ns per accepted withdrawal for
+both, the added latency of the limit check, the share of the full stream
+the limits (or the balances) rejected and how many counters are alive at
+the end. The overhead should stay flat as --cards grows.
+
+Usage:
+    python -m bench.bench_limits [--cards 10000 1000000] [--operations 1000000] [--days 2]
+"""
+import argparse
+import time
+
+from accounts.money import Money
+from bench.workload import Workload
+from cards.limits import WithdrawalLimits
+
+
+def _run(cards: int, operations: int, days: float, amount: Money) -> None:
+    workload = Workload(cards)
+    registry = workload.build_registry()
+    card_list = [registry.get(workload.card_number(i)) for i in range(cards)]
+    pattern = workload.access_pattern(operations)
+    ops = [card_list[index] for index in pattern]
+
+    accounts = [card.get_account() for card in card_list]
+    balances = [account.balance_cents for account in accounts]
+    now = [0.0]
+    step = days * 86400 / operations
+
+    def new_limits():
+        for account, balance in zip(accounts, balances):
+            account.balance_cents = balance
+        return WithdrawalLimits(card_hourly=200, card_daily=600, account_daily=1000, clock=lambda: now[0])
+
+    # Untimed pass over the full stream: which withdrawals go through
+    withdraw = new_limits().withdraw
+    accepted = []
+    for i, card in enumerate(ops):
+        now[0] = i * step
+        if withdraw(card, amount).ok:
+            accepted.append((i * step, card))
+
+    new_limits()
+    start = time.perf_counter()
+    for t, card in accepted:
+        now[0] = t  # same loop body as below, minus the limits
+        card.get_account().withdraw(amount)
+    plain = time.perf_counter() - start
+
+    limits = new_limits()
+    withdraw = limits.withdraw
+    start = time.perf_counter()
+    for t, card in accepted:
+        now[0] = t
+        withdraw(card, amount)
+    limited = time.perf_counter() - start
+
+    plain_ns = plain / max(1, len(accepted)) * 1e9
+    limited_ns = limited / max(1, len(accepted)) * 1e9
+    print(f"{cards:>10,} {plain_ns:>9.0f} {limited_ns:>9.0f} {limited_ns - plain_ns:>9.0f} "
+          f"{1 - len(accepted) / operations:>9.1%} {len(limits):>10,}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Withdrawal limits benchmark")
+    parser.add_argument("--cards", type=int, nargs="+", default=[10_000, 1_000_000])
+    parser.add_argument("--operations", type=int, default=1_000_000)
+    parser.add_argument("--days", type=float, default=2.0, help="simulated time the withdrawals are spread over")
+    parser.add_argument("--amount", default="20")
+    args = parser.parse_args(argv)
+
+    print(f"Operations: {args.operations}  over {args.days:g} simulated days  amount {args.amount}")
+    print("limits: 200/h and 600/day per card, 1000/day per account; timings over accepted withdrawals only")
+    print(f"{'cards':>10} {'plain ns':>9} {'limit ns':>9} {'added ns':>9} {'rejected':>9} {'counters':>10}")
+    for cards in args.cards:
+        _run(cards, args.operations, args.days, Money(args.amount))
+
+
+if __name__ == "__main__":
+    main()
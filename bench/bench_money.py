@@ -0,0 +1,60 @@
+"""
+Benchmark: balance arithmetic with float, Decimal and integer cents.
+
+Runs the same deposit/withdraw kernel (check, then add or subtract) on each
+representation, then the full CheckingAccount path that now uses integer
+cents with Money amounts. Also reports the drift float accumulates over the
+same sequence of 0.10 deposits.
+
+Usage:
+    python -m bench.bench_money [num_operations]
+"""
+import sys
+import time
+from decimal import Decimal
+
+from accounts.checking_account import CheckingAccount
+from accounts.money import Money
+
+
+def _kernel(balance, amount, n):
+    start = time.perf_counter()
+    for _ in range(n // 2):
+        balance += amount
+        if 0 < amount <= balance:
+            balance -= amount
+        balance += amount
+    return time.perf_counter() - start, balance
+
+
+def _account_path(n):
+    account = CheckingAccount("Bench", "BENCH-001")
+    amount = Money("0.10")
+    deposit, withdraw = account.deposit, account.withdraw
+    start = time.perf_counter()
+    for _ in range(n // 2):
+        deposit(amount)
+        withdraw(amount)
+        deposit(amount)
+    return time.perf_counter() - start, account.get_balance()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 1_000_000
+    expected = Money.from_cents(10 * (n // 2))
+
+    print(f"Operations: {n} (each adds 0.10 net per pair)")
+    results = [
+        ("float", *_kernel(0.0, 0.10, n), lambda b: f"{b:.10f}"),
+        ("Decimal", *_kernel(Decimal("0"), Decimal("0.10"), n), str),
+        ("int cents", *_kernel(0, 10, n), lambda b: str(Money.from_cents(b))),
+        ("CheckingAccount", *_account_path(n), str),
+    ]
+    for label, elapsed, final, fmt in results:
+        print(f"{label:<16} {n / elapsed:12,.0f} ops/s  final balance {fmt(final)}")
+    print(f"expected balance {expected}")
+
+
+if __name__ == "__main__":
+    main()
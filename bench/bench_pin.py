@@ -0,0 +1,55 @@
+"""
+Benchmark: PIN verifications per second on one core, with and without the
+session verification cache.
+
+"PIN entry" runs the full PBKDF2 check on every call: this is the real
+cost of a PIN entry, since the PIN is entered once per session.
+"same-session re-check" measures the cache alone, re-validating inside sessions that
+were already verified; real sessions do not do that, so it is not a
+throughput figure for PIN entry.
+
+Usage:
+    python -m bench.bench_pin [kdf_iterations] [verifications] [sessions]
+"""
+import sys
+import time
+
+from cards.card import Card
+from cards.factory import CardFactory
+from cards.pin import PinVerificationCache
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    iterations = int(argv[0]) if argv else 100_000
+    n = int(argv[1]) if len(argv) > 1 else 200
+    sessions = int(argv[2]) if len(argv) > 2 else 10
+
+    CardFactory.configure(kdf_iterations=iterations)
+    card = CardFactory.create_card("debit", card_number="4000000000000001", pin="1234", linked_account=None)
+
+    previous_cache = Card.verification_cache
+    try:
+        Card.verification_cache = None
+        start = time.perf_counter()
+        for _ in range(n):
+            card.validate_pin("1234")
+        uncached = n / (time.perf_counter() - start)
+
+        Card.verification_cache = PinVerificationCache()
+        start = time.perf_counter()
+        for i in range(n):
+            card.validate_pin("1234", session_id=i % sessions)
+        cached = n / (time.perf_counter() - start)
+        stats = Card.verification_cache
+    finally:
+        Card.verification_cache = previous_cache
+
+    print(f"KDF iterations: {iterations}  verifications: {n}  sessions: {sessions}")
+    print(f"PIN entry (no cache)              {uncached:12,.1f} verifications/s")
+    print(f"same-session re-check (cache only) {cached:11,.1f} verifications/s  "
+          f"(hit rate {stats.hits / (stats.hits + stats.misses):.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Load generator for the asyncio ATM session server (ui/server.py).
+
+Opens one connection per simulated terminal and runs the full session
+script (CARD, PIN, BALANCE, WITHDRAW, DEPOSIT, EXIT) for several rounds,
+recording the round-trip latency of every command. Reports p50/p99 per
+operation, overall throughput and the rejections by reason.
+
+The started server runs with fraud blocking and withdrawal limits off:
+every terminal replays the same card, and otherwise most withdrawals would
+soon be rejected, so the numbers would measure the rejection path.
+
+By default a server with a synthetic book is started in a subprocess;
+use --connect to target a running one (started with --synthetic N >= the
+number of terminals). Thousands of terminals may need a higher open-file
+limit (ulimit -n).
+
+Usage:
+    python -m bench.bench_session_server --terminals 2000 --rounds 5
+    python -m bench.bench_session_server --connect 127.0.0.1:8765
+"""
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+
+from ui.demo_data import synthetic_card_number
+
+SCRIPT = ("CARD {card}", "PIN 1234", "BALANCE", "WITHDRAW 10", "DEPOSIT 10", "EXIT")
+
+
+def _percentile(sorted_values, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def _terminal(host, port, index, rounds, latencies, errors, start_gate):
+    await start_gate.wait()
+    reader, writer = await asyncio.open_connection(host, port)
+    card = synthetic_card_number(index)
+    try:
+        for _ in range(rounds):
+            for template in SCRIPT:
+                line = template.format(card=card)
+                op = line.split(" ", 1)[0]
+                t0 = time.perf_counter()
+                writer.write(line.encode() + b"\n")
+                response = await reader.readline()
+                latencies[op].append(time.perf_counter() - t0)
+                if not response.startswith(b"OK"):
+                    # "ERR <CODE> [detail]": the code is the second field
+                    fields = response.split()
+                    errors[op, fields[1].decode() if len(fields) > 1 else "NO_RESPONSE"] += 1
+        writer.write(b"QUIT\n")
+        await reader.readline()
+    finally:
+        writer.close()
+
+
+async def _run(host, port, terminals, rounds):
+    latencies = defaultdict(list)
+    errors = Counter()
+    start_gate = asyncio.Event()
+    tasks = [asyncio.create_task(_terminal(host, port, i, rounds, latencies, errors, start_gate))
+             for i in range(terminals)]
+    t0 = time.perf_counter()
+    start_gate.set()
+    await asyncio.gather(*tasks)
+    return time.perf_counter() - t0, latencies, errors
+
+
+def _start_server(terminals):
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "ui.server", "--port", "0", "--synthetic", str(terminals),
+         "--no-fraud", "--daily-limit", "0"],
+        stdout=subprocess.PIPE, text=True,
+    )
+    banner = proc.stdout.readline().strip()
+    host, port = banner.rsplit(" ", 1)[-1].rsplit(":", 1)
+    return proc, host, int(port)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--terminals", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--connect", help="host:port of a running server")
+    args = parser.parse_args(argv)
+
+    proc = None
+    if args.connect:
+        host, port = args.connect.rsplit(":", 1)
+        port = int(port)
+    else:
+        proc, host, port = _start_server(args.terminals)
+    try:
+        elapsed, latencies, errors = asyncio.run(_run(host, port, args.terminals, args.rounds))
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait()
+
+    total = sum(len(v) for v in latencies.values())
+    print(f"Terminals: {args.terminals}  Rounds: {args.rounds}  Requests: {total}")
+    print(f"Throughput: {total / elapsed:,.0f} req/s over {elapsed:.2f} s")
+    print(f"{'op':<10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for op in (template.split(" ", 1)[0] for template in SCRIPT):
+        values = sorted(latencies[op])
+        failed = sum(count for (error_op, _), count in errors.items() if error_op == op)
+        print(f"{op:<10}{_percentile(values, 0.50) * 1e3:10.2f}{_percentile(values, 0.99) * 1e3:10.2f}{failed:8d}")
+    for (op, reason), count in errors.most_common():
+        print(f"  {op} {reason}: {count}")
+
+
+if __name__ == "__main__":
+    main()
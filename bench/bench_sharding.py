@@ -0,0 +1,109 @@
+"""
+Scale benchmark for ShardedLedger.
+
+Settles the same generated workload (transfers, deposits and withdrawals
+over savings accounts) with 1 to N shard processes, reports ops/sec and
+speedup for each shard count, and checks that money is conserved: the
+final total must equal the initial total plus accepted deposits minus
+accepted withdrawals. The in-process TransactionEngine is timed as the
+single-core baseline. Speedup is bounded by the number of cores.
+
+Usage:
+    python -m bench.bench_sharding [num_operations] [num_accounts] [max_shards]
+"""
+import os
+import random
+import sys
+import time
+
+from accounts.engine import TransactionEngine
+from accounts.factory import AccountFactory
+from accounts.money import Money
+from accounts.sharding import ShardedLedger
+
+BATCH_SIZE = 50_000
+
+
+def _specs(num_accounts: int):
+    return [
+        {"account_type": "savings", "account_holder": f"Holder {i}",
+         "account_number": f"SAV-{i:07d}", "balance": 100}
+        for i in range(num_accounts)
+    ]
+
+
+def _build_operations(numbers, n: int, seed: int = 42):
+    rng = random.Random(seed)
+    amounts = [Money(a) for a in (5, 10, 20, 50, 120)]
+    operations = []
+    for _ in range(n):
+        kind = rng.random()
+        amount = rng.choice(amounts)
+        if kind < 0.6:
+            source, target = rng.sample(numbers, 2)
+            operations.append(("transfer", source, target, amount))
+        elif kind < 0.8:
+            operations.append(("deposit", rng.choice(numbers), amount))
+        else:
+            operations.append(("withdraw", rng.choice(numbers), amount))
+    return operations
+
+
+def _delta(operations, results) -> int:
+    delta = 0
+    for operation, result in zip(operations, results):
+        if result is not None and result.ok and operation[0] == "deposit":
+            delta += operation[2].cents
+        elif result is not None and result.ok and operation[0] == "withdraw":
+            delta -= operation[2].cents
+    return delta
+
+
+def _run_engine(specs, operations) -> float:
+    accounts = {}
+    for spec in specs:
+        kwargs = dict(spec)
+        account = AccountFactory.create_account(kwargs.pop("account_type"), **kwargs)
+        accounts[account.account_number] = account
+    resolved = [(name, *(accounts[a] if isinstance(a, str) else a for a in args))
+                for name, *args in operations]
+    with TransactionEngine(workers=1) as engine:
+        start = time.perf_counter()
+        engine.run_batch(resolved)
+        return time.perf_counter() - start
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 400_000
+    num_accounts = int(argv[1]) if len(argv) > 1 else 10_000
+    max_shards = int(argv[2]) if len(argv) > 2 else (os.cpu_count() or 1)
+
+    specs = _specs(num_accounts)
+    operations = _build_operations([s["account_number"] for s in specs], n)
+    print(f"Operations: {n}  Accounts: {num_accounts}  Cores: {os.cpu_count()}")
+
+    elapsed = _run_engine(specs, operations)
+    print(f"engine (1 process)  {n / elapsed:12,.0f} ops/s")
+
+    baseline = None
+    shards = 1
+    while shards <= max_shards:
+        with ShardedLedger(shards) as ledger:
+            ledger.open_accounts(specs)
+            initial = ledger.total_cents()
+            results = []
+            start = time.perf_counter()
+            for i in range(0, n, BATCH_SIZE):
+                results.extend(ledger.run_batch(operations[i:i + BATCH_SIZE]))
+            elapsed = time.perf_counter() - start
+            conserved = ledger.total_cents() == initial + _delta(operations, results)
+        rate = n / elapsed
+        baseline = baseline or rate
+        print(f"shards={shards:<3} {rate:12,.0f} ops/s  speedup {rate / baseline:4.2f}x  "
+              f"conserved={'yes' if conserved else 'NO'}")
+        shards *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Startup-time benchmark: rebuilding the book through the factories versus
+opening a memory-mapped snapshot.
+
+For each book size the "factories" column is the time to create every
+account and card (what _seed_demo_data and main.py do today); "snapshot"
+is the time to open the snapshot and resolve the first card, which should
+stay flat as the book grows.
+
+Usage:
+    python -m bench.bench_snapshot [sizes...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from storage.snapshot import SnapshotBook, write_snapshot
+from ui.demo_data import build_synthetic_registry, synthetic_card_number
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    sizes = [int(a) for a in argv] or [1_000, 10_000, 100_000]
+
+    print(f"{'cards':>10}{'factories s':>14}{'snapshot ms':>14}{'file MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            start = time.perf_counter()
+            registry = build_synthetic_registry(size)
+            rebuild = time.perf_counter() - start
+
+            path = os.path.join(tmp, f"book-{size}.snap")
+            write_snapshot(path, registry)
+            del registry
+
+            start = time.perf_counter()
+            with SnapshotBook(path) as book:
+                card = book.get(synthetic_card_number(size // 2))
+                card.get_account().get_balance()
+                startup = time.perf_counter() - start
+            print(f"{size:>10}{rebuild:>14.3f}{startup * 1e3:>14.3f}{os.path.getsize(path) / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Startup benchmark: import time of the front ends, measured with -X importtime.
+
+Each module is imported in a fresh interpreter several times; the median
+cumulative import time of the module and the wall time of the whole
+interpreter are reported, with the heaviest imports it pulls in. With
+--budget-ms the script exits with status 1 if any module's median import
+time goes over the budget, so kiosk boot time can be checked in CI as
+screens and account types are added.
+
+Usage:
+    python -m bench.bench_startup [--runs 5] [--budget-ms 150] [module ...]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+DEFAULT_MODULES = ("ui.app", "main", "ui.server", "ui.batch")
+
+
+def _import_profile(module: str) -> tuple[float, float, list[tuple[int, str]]]:
+    """Returns (cumulative import ms of module, interpreter wall ms, [(cumulative µs, name)] of its imports)."""
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, check=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+    total_us = None
+    imports = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        cumulative_us = int(cumulative)
+        if name.strip() == module and name == f" {module}":
+            total_us = cumulative_us
+        else:
+            imports.append((cumulative_us, name.strip()))
+    return (total_us or 0) / 1000, wall_ms, imports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import-time startup benchmark")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, help="fail if a module's median import time exceeds this")
+    parser.add_argument("--top", type=int, default=5, help="heaviest imports to list per module")
+    args = parser.parse_args(argv)
+
+    over_budget = []
+    for module in args.modules:
+        profiles = [_import_profile(module) for _ in range(args.runs)]
+        import_ms = statistics.median(p[0] for p in profiles)
+        wall_ms = statistics.median(p[1] for p in profiles)
+        print(f"{module:<10} import {import_ms:7.1f} ms   interpreter {wall_ms:7.1f} ms")
+        heaviest = sorted(profiles[-1][2], reverse=True)[:args.top]
+        for cumulative_us, name in heaviest:
+            print(f"    {cumulative_us / 1000:7.1f} ms  {name}")
+        if args.budget_ms is not None and import_ms > args.budget_ms:
+            over_budget.append(module)
+
+    if over_budget:
+        print(f"Over the {args.budget_ms:.0f} ms budget: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
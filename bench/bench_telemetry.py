@@ -0,0 +1,55 @@
+"""
+Benchmark: cost of the hot-path instrumentation per call.
+
+Times deposit/withdraw and card lookups with the instrumentation disabled
+(the original methods, no wrapper at all) and enabled, and prints the
+added nanoseconds per call.
+
+Usage:
+    python -m bench.bench_telemetry [calls]
+"""
+import sys
+import time
+
+from accounts.money import Money
+from telemetry.instrumentation import instrumentation
+from ui.demo_data import seed_demo_registry
+
+
+def _per_call_ns(fn, n: int) -> float:
+    start = time.perf_counter()
+    fn(n)
+    return (time.perf_counter() - start) / n * 1e9
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 200_000
+
+    registry = seed_demo_registry()
+    account = registry.get("5555666677778888").get_account()
+    amount = Money("1.00")
+
+    def money(calls):
+        for _ in range(calls // 2):
+            account.deposit(amount)
+            account.withdraw(amount)
+
+    def lookup(calls):
+        for _ in range(calls):
+            registry.get_by_last4("8888")
+
+    print(f"Calls: {n}")
+    for name, fn in (("deposit/withdraw", money), ("get_card_by_last4", lookup)):
+        instrumentation.disable()
+        disabled = _per_call_ns(fn, n)
+        instrumentation.enable()
+        enabled = _per_call_ns(fn, n)
+        instrumentation.disable()
+        print(f"{name:<18} disabled {disabled:8.0f} ns/call  enabled {enabled:8.0f} ns/call  "
+              f"(+{enabled - disabled:.0f} ns)")
+    instrumentation.metrics.reset()
+
+
+if __name__ == "__main__":
+    main()
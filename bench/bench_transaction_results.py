@@ -0,0 +1,54 @@
+"""
+Micro-benchmark: per-transaction cost of console output versus the silent result path.
+
+"print per call" reproduces the previous behavior (one formatted line per
+operation, written to /dev/null so the terminal does not dominate); "silent"
+only builds the TransactionResult.
+
+Usage:
+    python -m bench.bench_transaction_results [num_operations]
+"""
+import contextlib
+import os
+import sys
+import time
+
+from accounts.account_manager import AccountManager
+from accounts.checking_account import CheckingAccount
+from accounts.money import Money
+
+
+def _print_listener(account, operation, amount, result):
+    print(f"{operation} {amount}. New balance is {result.balance}.")
+
+
+def _run(n: int) -> float:
+    account = CheckingAccount("Bench", "BENCH-001", balance=1_000_000)
+    amount = Money(10)
+    deposit, withdraw = account.deposit, account.withdraw
+    start = time.perf_counter()
+    for _ in range(n // 2):
+        deposit(amount)
+        withdraw(amount)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 1_000_000
+
+    AccountManager.add_listener(_print_listener)
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            printed = _run(n)
+    finally:
+        AccountManager.remove_listener(_print_listener)
+    silent = _run(n)
+
+    print(f"Operations: {n}")
+    print(f"print per call  {n / printed:12,.0f} ops/s")
+    print(f"silent          {n / silent:12,.0f} ops/s  ({printed / silent:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: Tk frame latency while the backend is slow.
+
+Simulates a slow backend (a listener that blocks for delay_ms on every
+account operation, like a synchronous journal or a remote call) and runs
+the same withdrawals twice: inline on the Tk thread, as the screens used to
+do, and through UIWorker. A FrameLatencyMonitor ticking every 16 ms reports
+the worst and p99 event-loop lag and how many frames missed the budget.
+Needs a display (or Xvfb).
+
+Usage:
+    python -m bench.bench_ui_latency [calls] [delay_ms] [budget_ms]
+"""
+import sys
+import time
+import tkinter as tk
+
+from accounts.account_manager import AccountManager
+from accounts.factory import AccountFactory
+from accounts.money import Money
+from ui.worker import FrameLatencyMonitor, UIWorker
+
+
+def _run(root: tk.Tk, mode: str, calls: int, budget_ms: float) -> FrameLatencyMonitor:
+    account = AccountFactory.create_account("savings", account_holder="Bench", account_number="SAV-UI", balance=10_000)
+    amount = Money("1.00")
+    monitor = FrameLatencyMonitor(root.after, interval_ms=16, budget_ms=budget_ms)
+    worker = UIWorker(root.after)
+    remaining = [calls]
+
+    def next_call(_result=None):
+        if not remaining[0]:
+            root.quit()
+            return
+        remaining[0] -= 1
+        if mode == "inline":
+            account.withdraw(amount)
+            root.after(1, next_call)
+        else:
+            worker.submit(account.withdraw, amount, on_done=lambda result: root.after(1, next_call))
+
+    monitor.start()
+    root.after(50, next_call)
+    root.mainloop()
+    monitor.stop()
+    worker.shutdown(wait=True)
+    return monitor
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    calls = int(argv[0]) if argv else 20
+    delay_ms = float(argv[1]) if len(argv) > 1 else 100.0
+    budget_ms = float(argv[2]) if len(argv) > 2 else 50.0
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"No display available: {e}")
+        return 1
+    root.withdraw()
+
+    def slow_backend(account, operation, amount, result):
+        time.sleep(delay_ms / 1000)
+
+    AccountManager.add_listener(slow_backend)
+    try:
+        print(f"Calls: {calls}  backend delay: {delay_ms:.0f} ms  frame budget: {budget_ms:.0f} ms")
+        for mode in ("inline", "worker"):
+            monitor = _run(root, mode, calls, budget_ms)
+            p99 = monitor.metrics.quantile(0.99)
+            print(f"{mode:<7} max lag {monitor.max_lag_ms:8.1f} ms  p99 <= {p99 * 1000 if p99 else 0:8.1f} ms  "
+                  f"frames over budget {monitor.metrics.failures}/{monitor.metrics.count}")
+    finally:
+        AccountManager.remove_listener(slow_backend)
+        root.destroy()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""
+Scenario benchmark suite over a seeded synthetic workload.
+
+Scenarios (all driven by the same Zipf-skewed access pattern):
+
+    card_lookup       CardRegistry.get (full PAN) and get_by_last4
+    pin_validation    Card.validate_pin with the full KDF, as on every PIN entry
+    withdraw_deposit  alternating withdraw/deposit on the accessed accounts
+    interest          month-end accrue_interest over every account
+    session_flow      CARD -> PIN -> BALANCE -> WITHDRAW -> EXIT through the session server
+    session_replay    generated session traces replayed through SessionFlow over a simulated day
+
+Results are written as JSON (workload parameters, environment and one entry
+per scenario with ops, seconds and ops_per_second). Passing a previous
+results file with --baseline prints the ratio of every scenario against it.
+
+Usage:
+    python -m bench.run_suite --accounts 1000000 --output results.json
+    python -m bench.run_suite --scenarios card_lookup,session_flow --baseline results.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from collections import Counter
+
+from accounts.interest import accrue_interest
+from accounts.money import Money
+from bench.workload import DEFAULT_ACCOUNT_MIX, Workload
+from cards.card import Card
+from cards.lockout import PinLockoutService
+from fraud.detector import FraudDetector
+from ui.replay import SessionReplayer, generate_traces
+from ui.server import ATMSessionServer
+from ui.session import Session
+
+
+def _timed(ops: int, fn) -> dict:
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+    return {"ops": ops, "seconds": round(seconds, 6), "ops_per_second": round(ops / seconds, 1) if seconds else None}
+
+
+def bench_card_lookup(ctx: dict, n: int) -> dict:
+    registry, pattern = ctx["registry"], ctx["pattern"][:n]
+    numbers = [Workload.card_number(i) for i in pattern]
+    suffixes = [number[-4:] for number in numbers]
+
+    def by_number():
+        get = registry.get
+        for number in numbers:
+            get(number)
+
+    def by_last4():
+        get_by_last4 = registry.get_by_last4
+        for last4 in suffixes:
+            try:
+                get_by_last4(last4)
+            except ValueError:
+                pass  # ambiguous suffix: the front ends then ask for the full number
+
+    return {"by_number": _timed(len(numbers), by_number), "by_last4": _timed(len(suffixes), by_last4)}
+
+
+def bench_pin_validation(ctx: dict, n: int) -> dict:
+    """
+    Runs the KDF on every call, one call per new session.
+
+    The PIN is entered once per session, so the session verification cache
+    never serves real traffic and is not measured here (bench.bench_pin
+    shows it separately).
+    """
+    registry, pin = ctx["registry"], ctx["workload"].pin
+    cards = [registry.get(Workload.card_number(i)) for i in ctx["pattern"][:max(1, n // 100)]]
+    previous_cache = Card.verification_cache
+    try:
+        Card.verification_cache = None
+
+        def no_cache():
+            for card in cards:
+                card.validate_pin(pin)
+
+        cold = _timed(len(cards), no_cache)
+    finally:
+        Card.verification_cache = previous_cache
+    return {"uncached": cold}
+
+
+def bench_withdraw_deposit(ctx: dict, n: int) -> dict:
+    accounts = ctx["accounts"]
+    targets = [accounts[i] for i in ctx["pattern"][:n]]
+    amount = Money("20.00")
+
+    def run():
+        for i, account in enumerate(targets):
+            if i & 1:
+                account.deposit(amount)
+            else:
+                account.withdraw(amount)
+
+    return _timed(len(targets), run)
+
+
+def bench_interest(ctx: dict, n: int) -> dict:
+    accounts = ctx["accounts"]
+    return _timed(len(accounts), lambda: accrue_interest(accounts, 1))
+
+
+def bench_session_flow(ctx: dict, n: int) -> dict:
+    """Fraud blocking off: the Zipf-hot cards would otherwise be blocked and the run would time rejections."""
+    server = ATMSessionServer(ctx["registry"], PinLockoutService(), fraud=FraudDetector(rules={}))
+    pin = ctx["workload"].pin
+    sessions = ctx["pattern"][:max(1, n // 5)]
+    rejections = Counter()
+
+    def run():
+        dispatch = server.dispatch
+        session = Session()
+        for index in sessions:
+            for line in (f"CARD {Workload.card_number(index)}", f"PIN {pin}", "BALANCE", "WITHDRAW 20", "EXIT"):
+                response = dispatch(session, line)
+                if response[0] == "E":
+                    rejections[response.split()[1]] += 1
+
+    result = _timed(len(sessions) * 5, run)
+    result["sessions_per_second"] = round(len(sessions) / result["seconds"], 1) if result["seconds"] else None
+    result["rejections"] = dict(rejections)
+    return result
+
+
+def bench_session_replay(ctx: dict, n: int) -> dict:
+    """About five events per session: cards drawn uniformly, so limits and fraud rules rarely fire."""
+    workload = ctx["workload"]
+    numbers = [Workload.card_number(i) for i in range(len(ctx["accounts"]))]
+    traces = generate_traces(numbers, max(1, n // 5), seed=workload.seed)
+    replayer = SessionReplayer(ctx["registry"], pin=workload.pin)
+    events = sum(len(trace["events"]) for trace in traces)
+    result = _timed(events, lambda: replayer.run(traces))
+    result["sessions_per_second"] = round(len(traces) / result["seconds"], 1) if result["seconds"] else None
+    result["rejections"] = dict(replayer.errors)
+    return result
+
+
+SCENARIOS = {
+    "card_lookup": bench_card_lookup,
+    "pin_validation": bench_pin_validation,
+    "withdraw_deposit": bench_withdraw_deposit,
+    "interest": bench_interest,
+    "session_flow": bench_session_flow,
+    "session_replay": bench_session_replay,
+}
+
+
+def _rates(results: dict, prefix: str = "") -> dict:
+    """Flattens scenario results to {'scenario.variant': ops_per_second}."""
+    rates = {}
+    for name, value in results.items():
+        if "ops_per_second" in value:
+            rates[prefix + name] = value["ops_per_second"]
+        else:
+            rates.update(_rates(value, f"{prefix}{name}."))
+    return rates
+
+
+def compare(results: dict, baseline: dict) -> list[str]:
+    """One line per scenario: current ops/s, baseline ops/s and their ratio."""
+    current, previous = _rates(results["results"]), _rates(baseline["results"])
+    lines = []
+    for name, rate in current.items():
+        before = previous.get(name)
+        ratio = f"{rate / before:5.2f}x" if before and rate else "    -"
+        lines.append(f"{name:<28} {rate or 0:14,.0f} ops/s  baseline {before or 0:14,.0f}  {ratio}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ATM scenario benchmark suite")
+    parser.add_argument("--accounts", type=int, default=100_000)
+    parser.add_argument("--operations", type=int, default=200_000, help="operations per scenario")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent of the access pattern")
+    parser.add_argument("--mix", default=",".join(f"{k}={v}" for k, v in DEFAULT_ACCOUNT_MIX.items()),
+                        help="account type mix, e.g. savings=0.5,checking=0.35,credit=0.15")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--kdf-iterations", type=int, default=1_000)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset to run")
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    parser.add_argument("--baseline", help="previous results file to compare against")
+    args = parser.parse_args(argv)
+
+    mix = {k: float(v) for k, v in (item.split("=") for item in args.mix.split(","))}
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    workload = Workload(args.accounts, mix, zipf_s=args.zipf, seed=args.seed, kdf_iterations=args.kdf_iterations)
+    start = time.perf_counter()
+    accounts = workload.build_accounts()
+    ctx = {
+        "workload": workload,
+        "accounts": accounts,
+        "registry": workload.build_registry(accounts),
+        "pattern": workload.access_pattern(args.operations),
+    }
+    build_seconds = time.perf_counter() - start
+
+    results = {
+        "workload": workload.describe(),
+        "environment": {"python": platform.python_version(), "implementation": platform.python_implementation(),
+                        "machine": platform.machine(), "platform": platform.platform()},
+        "build_seconds": round(build_seconds, 3),
+        "results": {},
+    }
+    for name in names:
+        print(f"running {name}...", file=sys.stderr)
+        results["results"][name] = SCENARIOS[name](ctx, args.operations)
+
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print("\n".join(compare(results, baseline)), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
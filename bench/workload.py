@@ -0,0 +1,147 @@
+"""
+Seeded synthetic workload for the ATM domain.
+
+Builds any number of accounts and cards through AccountFactory and
+CardFactory with a configurable mix of account types, and draws
+Zipf-skewed access patterns over them (a few hot accounts take most of the
+traffic, as on real terminals). The same seed always produces the same
+accounts, cards and access sequence, so results can be compared between
+releases.
+
+Usage (prints a summary of a generated workload):
+    python -m bench.workload [num_accounts] [zipf_s]
+"""
+import random
+import sys
+from itertools import accumulate
+from typing import Iterator, Mapping
+
+from accounts.account_manager import AccountManager
+from accounts.factory import AccountFactory
+from cards.factory import CardFactory
+from cards.pin import PinHasher
+from cards.registry import CardRegistry
+
+DEFAULT_ACCOUNT_MIX = {"savings": 0.5, "checking": 0.35, "credit": 0.15}
+# Card type issued for each account type
+CARD_TYPES = {"savings": "debit", "checking": "debit", "credit": "credit"}
+_PREFIXES = {"savings": "SAV", "checking": "CHK", "credit": "CRD"}
+
+
+class Workload:
+    """
+    Deterministic generator of accounts, cards and access patterns.
+
+    Every account gets one card whose PIN is pin. All cards share one PIN
+    hash computed with kdf_iterations, so building millions of cards does
+    not pay for millions of KDF runs; PIN benchmarks still pay for the KDF
+    on every uncached validation.
+    """
+    def __init__(self, num_accounts: int, account_mix: Mapping[str, float] = DEFAULT_ACCOUNT_MIX,
+                 zipf_s: float = 1.1, seed: int = 42, pin: str = "1234", kdf_iterations: int = 1_000):
+        if num_accounts < 1:
+            raise ValueError("num_accounts must be at least 1")
+        unknown = set(account_mix) - set(CARD_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown account types in mix: {sorted(unknown)}")
+        self.num_accounts = num_accounts
+        self.account_mix = dict(account_mix)
+        self.zipf_s = zipf_s
+        self.seed = seed
+        self.pin = pin
+        self.kdf_iterations = kdf_iterations
+        self._zipf_cum_weights = None
+        self._hot_order = None
+
+    def describe(self) -> dict:
+        """Parameters of the workload, for machine-readable reports."""
+        return {
+            "num_accounts": self.num_accounts,
+            "account_mix": self.account_mix,
+            "zipf_s": self.zipf_s,
+            "seed": self.seed,
+            "kdf_iterations": self.kdf_iterations,
+        }
+
+    @staticmethod
+    def card_number(index: int) -> str:
+        return f"4{index:015d}"
+
+    def iter_account_specs(self) -> Iterator[dict]:
+        """Yields AccountFactory keyword arguments (plus 'account_type') for every account."""
+        rng = random.Random(self.seed)
+        types = list(self.account_mix)
+        weights = list(self.account_mix.values())
+        for i, account_type in enumerate(rng.choices(types, weights, k=self.num_accounts)):
+            spec = {
+                "account_type": account_type,
+                "account_holder": f"Cliente {i}",
+                "account_number": f"{_PREFIXES[account_type]}-{i:09d}",
+                "balance": rng.randrange(0, 500_000) / 100,
+            }
+            if account_type == "credit":
+                spec.update(balance=0, credit_limit=rng.choice((500, 1500, 5000)),
+                            interest_rate=rng.choice((12.0, 18.5, 24.0)))
+            yield spec
+
+    def build_accounts(self) -> list[AccountManager]:
+        accounts = []
+        for spec in self.iter_account_specs():
+            kwargs = dict(spec)
+            accounts.append(AccountFactory.create_account(kwargs.pop("account_type"), **kwargs))
+        return accounts
+
+    def build_registry(self, accounts: list[AccountManager] | None = None) -> CardRegistry:
+        """Issues one card per account through CardFactory and indexes them."""
+        accounts = self.build_accounts() if accounts is None else accounts
+        pin_hash = PinHasher(self.kdf_iterations).hash(self.pin)
+        registry = CardRegistry()
+        for i, account in enumerate(accounts):
+            registry.register(CardFactory.create_card(
+                CARD_TYPES[account.account_type_name.lower()],
+                card_number=self.card_number(i), pin_hash=pin_hash, linked_account=account,
+            ))
+        return registry
+
+    def access_pattern(self, k: int, stream: int = 0) -> list[int]:
+        """
+        Returns k account indexes drawn from a Zipf(s) distribution.
+
+        Rank 1 is the hottest account. Ranks are mapped to accounts through a
+        seeded permutation, so hot accounts are spread over all types instead
+        of being the first ones created. stream selects an independent but
+        reproducible sequence.
+        """
+        if self._zipf_cum_weights is None:
+            n = self.num_accounts
+            self._zipf_cum_weights = list(accumulate(1.0 / rank ** self.zipf_s for rank in range(1, n + 1)))
+            self._hot_order = list(range(n))
+            random.Random(self.seed).shuffle(self._hot_order)
+        rng = random.Random(f"{self.seed}:{stream}")
+        ranks = rng.choices(range(self.num_accounts), cum_weights=self._zipf_cum_weights, k=k)
+        hot_order = self._hot_order
+        return [hot_order[rank] for rank in ranks]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    num_accounts = int(argv[0]) if argv else 100_000
+    zipf_s = float(argv[1]) if len(argv) > 1 else 1.1
+
+    workload = Workload(num_accounts, zipf_s=zipf_s)
+    accounts = workload.build_accounts()
+    counts = {}
+    for account in accounts:
+        counts[type(account).__name__] = counts.get(type(account).__name__, 0) + 1
+    pattern = workload.access_pattern(100_000)
+    hits = {}
+    for index in pattern:
+        hits[index] = hits.get(index, 0) + 1
+    top = sorted(hits.values(), reverse=True)
+    print(f"Accounts: {num_accounts}  mix: {counts}")
+    print(f"Zipf s={zipf_s}: top 1% of accounts take "
+          f"{sum(top[:max(1, num_accounts // 100)]) / len(pattern):.1%} of 100,000 accesses")
+
+
+if __name__ == "__main__":
+    main()
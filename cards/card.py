@@ -1,14 +1,26 @@
 from abc import ABC, abstractmethod
 from accounts.account_manager import AccountManager
+from cards.pin import PinHasher, PinVerificationCache, verify_pin
 
 class Card(ABC):
     """
     Abstract base class to define the interface and common behavior
     for different types of bank cards.
+
+    The PIN is never kept in clear: the card stores a salted KDF hash,
+    either computed from a plaintext pin with the given hasher or passed
+    in already encoded through pin_hash.
     """
-    def __init__(self, card_number: str, pin: str, linked_account: AccountManager):
+    default_hasher = PinHasher()
+    # Shared cache of recent successful verifications; set to None to disable.
+    verification_cache: PinVerificationCache | None = PinVerificationCache()
+
+    def __init__(self, card_number: str, pin: str | None = None, linked_account: AccountManager | None = None,
+                 *, pin_hash: str | None = None, hasher: PinHasher | None = None):
+        if (pin is None) == (pin_hash is None):
+            raise ValueError("Exactly one of pin or pin_hash must be given.")
         self._card_number = card_number
-        self._pin = pin
+        self._pin_hash = pin_hash if pin is None else (hasher or self.default_hasher).hash(pin)
         self._linked_account = linked_account
 
     @abstractmethod
@@ -16,9 +28,29 @@ class Card(ABC):
         """Returns the type of the card (e.g., 'debit', 'credit')."""
         pass
 
-    def validate_pin(self, pin: str) -> bool:
-        """Validates if the provided PIN matches the card's PIN."""
-        return self._pin == pin
+    def validate_pin(self, pin: str, session_id=None) -> bool:
+        """Validates if the provided PIN matches the card's PIN.
+
+        With a session_id, a PIN already verified in that session is accepted
+        from the verification cache without running the KDF again.
+        """
+        cache = self.verification_cache
+        if session_id is not None and cache is not None:
+            if cache.check(self._card_number, session_id, pin):
+                return True
+            if verify_pin(pin, self._pin_hash):
+                cache.store(self._card_number, session_id, pin)
+                return True
+            return False
+        return verify_pin(pin, self._pin_hash)
+
+    def get_pin_hash(self) -> str:
+        """Returns the encoded PIN hash (for persistence)."""
+        return self._pin_hash
+
+    def get_card_number(self) -> str:
+        """Returns the full card number (PAN)."""
+        return self._card_number
 
     def get_account(self) -> AccountManager:
         """Returns the account linked to this card."""
@@ -1,12 +1,30 @@
+from typing import Any, Mapping, Sequence
+
+from accounts.type_registry import TypeRegistry, construct_many
 from cards.card import Card
-from cards.debit_card import DebitCard
-from cards.credit_card import CreditCard
+from cards.pin import DEFAULT_ITERATIONS, PinHasher
 
 class CardFactory:
     """
     A factory class responsible for creating instances of different types of cards.
     This decouples the client code from the concrete card implementations.
+
+    Plaintext PINs are hashed with pin_hasher, whose KDF cost is set with
+    configure(kdf_iterations=...). Card classes are imported lazily through
+    the types registry on first use; new card types can be plugged in with
+    register() or through the 'atm.card_types' entry point group.
     """
+    pin_hasher = PinHasher(DEFAULT_ITERATIONS)
+    types = TypeRegistry("card", {
+        "debit": "cards.debit_card:DebitCard",
+        "credit": "cards.credit_card:CreditCard",
+    }, entry_point_group="atm.card_types")
+
+    @classmethod
+    def configure(cls, kdf_iterations: int) -> None:
+        """Sets the PBKDF2 iteration count used for newly created cards."""
+        cls.pin_hasher = PinHasher(kdf_iterations)
+
     @staticmethod
     def create_card(card_type: str, **kwargs) -> Card:
         """
@@ -15,7 +33,7 @@ class CardFactory:
         Args:
             card_type (str): The type of card to create ('debit' or 'credit').
             **kwargs: The attributes required to initialize the card 
-                      (e.g., card_number, pin, linked_account).
+                      (e.g., card_number, pin or pin_hash, linked_account).
 
         Raises:
             ValueError: If the card_type provided is unknown.
@@ -23,9 +41,23 @@ class CardFactory:
         Returns:
             Card: An instance of a class that inherits from Card.
         """
-        if card_type == "debit":
-            return DebitCard(**kwargs)
-        elif card_type == "credit":
-            return CreditCard(**kwargs)
-        else:
-            raise ValueError(f"Unknown card type: {card_type}")
+        if "pin" in kwargs and "hasher" not in kwargs:
+            kwargs["hasher"] = CardFactory.pin_hasher
+        return CardFactory.types.get(card_type)(**kwargs)
+
+    @staticmethod
+    def create_many(card_type: str, columns: Mapping[str, Sequence], **constants: Any) -> list[Card]:
+        """
+        Creates one card per row of columnar input (see AccountFactory.create_many).
+
+        A 'pin' column is hashed with pin_hasher, one KDF run per card; pass
+        pin_hash instead (as a column or a shared constant) to skip it.
+        """
+        if "pin" in columns and "hasher" not in constants:
+            constants["hasher"] = CardFactory.pin_hasher
+        return construct_many(CardFactory.types.get(card_type), columns, constants)
+
+    @staticmethod
+    def register(card_type: str, cls: type | str, replace: bool = False) -> None:
+        """Registers a card class (or a lazy "module:Class" path) under card_type."""
+        CardFactory.types.register(card_type, cls, replace)
@@ -0,0 +1,163 @@
+import threading
+import time
+from array import array
+from typing import Callable
+
+from accounts.money import Money, to_cents
+from accounts.result import Reason, Status, TransactionResult
+from cards.card import Card
+
+
+class SlidingWindowCounter:
+    """
+    Per-key sum of amounts over the last window seconds.
+
+    The window is split into buckets of window / buckets seconds. Each key
+    holds one array of bucket sums plus the index of its newest bucket and
+    the running total, so adding and reading are O(1) amortized: moving
+    forward only clears the buckets that went out of the window since the
+    key was last touched, and no per-transaction history is kept or scanned.
+
+    The window is counted conservatively: the current bucket and the
+    buckets whole window before it are included, so an amount is forgotten
+    between window and window + window / buckets seconds after it was added.
+    Keys whose total drops to zero are removed, so only keys with activity
+    in the last window hold memory.
+    """
+    def __init__(self, window: float, buckets: int):
+        if window <= 0 or buckets < 1:
+            raise ValueError("Window and bucket count must be positive")
+        self.window = window
+        self.buckets = buckets
+        self.bucket_seconds = window / buckets
+        self._slots = buckets + 1
+        # key -> array: [newest bucket index, total, one sum per slot]
+        self._states: dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def _advance(self, state: array, bucket: int) -> None:
+        gap = bucket - state[0]
+        if gap <= 0:
+            return
+        slots = self._slots
+        if gap >= slots:
+            for i in range(2, slots + 2):
+                state[i] = 0
+            state[1] = 0
+        else:
+            total = state[1]
+            for b in range(state[0] + 1, bucket + 1):
+                i = 2 + b % slots
+                total -= state[i]
+                state[i] = 0
+            state[1] = total
+        state[0] = bucket
+
+    def total(self, key: str, now: float) -> int:
+        """Sum added for key over the window ending at now."""
+        state = self._states.get(key)
+        if state is None:
+            return 0
+        bucket = int(now // self.bucket_seconds)
+        if bucket != state[0]:
+            self._advance(state, bucket)
+            if not state[1]:
+                del self._states[key]
+                return 0
+        return state[1]
+
+    def add(self, key: str, amount: int, now: float) -> None:
+        bucket = int(now // self.bucket_seconds)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = array("q", bytes(8 * (self._slots + 2)))
+            state[0] = bucket
+        else:
+            self._advance(state, bucket)
+        state[2 + bucket % self._slots] += amount
+        state[1] += amount
+
+
+class WithdrawalLimits:
+    """
+    Hourly and daily withdrawal limits per card and per account.
+
+    withdraw(card, amount) checks every configured limit, withdraws from
+    the card's account and records the amount under the lock of that
+    account, so concurrent withdrawals against the same account (through
+    any of its cards) cannot both pass a check that only one of them fits
+    in. Each account maps to one of a fixed set of lock stripes (by account
+    number, as in TransactionEngine), so withdrawals on unrelated accounts
+    do not wait for each other; every counter key (card or account) belongs
+    to a single account and is only touched under its stripe. A withdrawal that would exceed a limit is rejected
+    with Reason.LIMIT_EXCEEDED (and reported to the account listeners like
+    any other rejection); rejected withdrawals do not count.
+
+    Limits are amounts (anything to_cents accepts); None disables one.
+    Each limit is a SlidingWindowCounter keyed by card number or account
+    number, so the check costs a few dict lookups whatever the number of
+    cards.
+    """
+    HOUR = 3600.0
+    DAY = 86400.0
+
+    def __init__(self, card_hourly=None, card_daily=None, account_hourly=None, account_daily=None,
+                 hour_buckets: int = 12, day_buckets: int = 24, clock: Callable[[], float] = time.time,
+                 stripes: int = 256):
+        if stripes < 1:
+            raise ValueError("stripes must be at least 1")
+        self._clock = clock
+        self._locks = tuple(threading.Lock() for _ in range(stripes))
+        # (limit cents, counter, True for the card key / False for the account key)
+        self._limits: list[tuple[int, SlidingWindowCounter, bool]] = []
+        for limit, window, buckets, per_card in (
+            (card_hourly, self.HOUR, hour_buckets, True),
+            (card_daily, self.DAY, day_buckets, True),
+            (account_hourly, self.HOUR, hour_buckets, False),
+            (account_daily, self.DAY, day_buckets, False),
+        ):
+            if limit is not None:
+                self._limits.append((to_cents(limit), SlidingWindowCounter(window, buckets), per_card))
+
+    def __len__(self) -> int:
+        """Number of (card or account, window) counters currently holding state."""
+        return sum(len(counter) for _, counter, _ in self._limits)
+
+    def _lock_for(self, account_number: str) -> threading.Lock:
+        return self._locks[hash(account_number) % len(self._locks)]
+
+    def remaining(self, card: Card) -> Money | None:
+        """Largest amount the card can withdraw now under the limits (None if there are none)."""
+        card_key = card.get_card_number()
+        account_key = card.get_account().account_number
+        with self._lock_for(account_key):
+            now = self._clock()
+            headroom = None
+            for limit, counter, per_card in self._limits:
+                left = limit - counter.total(card_key if per_card else account_key, now)
+                headroom = left if headroom is None else min(headroom, left)
+        return None if headroom is None else Money.from_cents(max(0, headroom))
+
+    def withdraw(self, card: Card, amount: Money | float) -> TransactionResult:
+        """Withdraws amount from the card's account if every limit allows it."""
+        account = card.get_account()
+        cents = to_cents(amount)
+        card_key = card.get_card_number()
+        account_key = account.account_number
+        with self._lock_for(account_key):
+            now = self._clock()
+            if cents > 0:
+                for limit, counter, per_card in self._limits:
+                    if counter.total(card_key if per_card else account_key, now) + cents > limit:
+                        result = TransactionResult(Status.REJECTED, Money.from_cents(account.balance_cents),
+                                                   Reason.LIMIT_EXCEEDED)
+                        if account._listeners:
+                            account._notify("withdraw", Money.from_cents(cents), result)
+                        return result
+            result = account.withdraw(amount)
+            if result.ok:
+                for _, counter, per_card in self._limits:
+                    counter.add(card_key if per_card else account_key, cents, now)
+        return result
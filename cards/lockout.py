@@ -0,0 +1,90 @@
+import heapq
+import time
+from typing import Callable
+
+from cards.registry import normalize_card_number
+
+
+class PinLockoutService:
+    """
+    Tracks failed PIN attempts and temporary lockouts per card number.
+
+    Lockout and attempt-counter expiry times are kept in a min-heap, so the
+    service never polls or sleeps: expired entries are evicted lazily, a few
+    at a time, whenever a failure is recorded, and is_locked() is a single
+    dict lookup. Idle cards cost nothing; only cards with recent failures
+    hold an entry.
+
+    Failed attempts are forgotten after attempt_window seconds without a
+    lockout, so a card is locked only after max_attempts failures within
+    that window.
+
+    Not thread-safe: use one instance per event loop or UI thread.
+    """
+    def __init__(self, max_attempts: int = 3, lockout_seconds: float = 30.0,
+                 attempt_window: float = 900.0, clock: Callable[[], float] = time.monotonic):
+        self.max_attempts = max_attempts
+        self.lockout_seconds = lockout_seconds
+        self.attempt_window = attempt_window
+        self._clock = clock
+        self._locked_until: dict[str, float] = {}
+        self._attempts: dict[str, tuple[int, float]] = {}
+        self._expiries: list[tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        """Number of cards currently holding state (locked or with failed attempts)."""
+        return len(self._locked_until.keys() | self._attempts.keys())
+
+    def is_locked(self, card_number: str) -> bool:
+        """Returns True while the card is locked out."""
+        key = normalize_card_number(card_number)
+        until = self._locked_until.get(key)
+        if until is None:
+            return False
+        if until > self._clock():
+            return True
+        del self._locked_until[key]
+        return False
+
+    def remaining_lockout(self, card_number: str) -> float:
+        """Seconds until the card is unlocked (0.0 if it is not locked)."""
+        until = self._locked_until.get(normalize_card_number(card_number))
+        return max(0.0, until - self._clock()) if until is not None else 0.0
+
+    def record_failure(self, card_number: str) -> int:
+        """
+        Records a failed PIN attempt.
+
+        Returns:
+            int: Attempts left before lockout; 0 means the card has just been locked.
+        """
+        now = self._clock()
+        self._evict_expired(now)
+        key = normalize_card_number(card_number)
+        count, expires = self._attempts.get(key, (0, 0.0))
+        count = count + 1 if expires > now else 1
+        if count >= self.max_attempts:
+            self._attempts.pop(key, None)
+            until = now + self.lockout_seconds
+            self._locked_until[key] = until
+            heapq.heappush(self._expiries, (until, key))
+            return 0
+        expires = now + self.attempt_window
+        self._attempts[key] = (count, expires)
+        heapq.heappush(self._expiries, (expires, key))
+        return self.max_attempts - count
+
+    def record_success(self, card_number: str) -> None:
+        """Clears the failed-attempt counter after a correct PIN."""
+        self._attempts.pop(normalize_card_number(card_number), None)
+
+    def _evict_expired(self, now: float) -> None:
+        expiries = self._expiries
+        while expiries and expiries[0][0] <= now:
+            expires, key = heapq.heappop(expiries)
+            # Stale heap entries (counter reset or re-locked later) no longer match the live value.
+            if self._locked_until.get(key) == expires:
+                del self._locked_until[key]
+            attempts = self._attempts.get(key)
+            if attempts is not None and attempts[1] == expires:
+                del self._attempts[key]
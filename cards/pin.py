@@ -0,0 +1,115 @@
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+DEFAULT_ITERATIONS = 100_000
+_ALGORITHM = "pbkdf2_sha256"
+
+
+class PinHasher:
+    """
+    Salted PBKDF2-HMAC-SHA256 hashing for card PINs.
+
+    Hashes are self-describing strings ('pbkdf2_sha256$<iterations>$<salt>$<hash>'),
+    so the cost can be raised for new cards while existing hashes keep
+    verifying with the iteration count they were created with.
+    """
+    def __init__(self, iterations: int = DEFAULT_ITERATIONS, salt_bytes: int = 16):
+        if iterations < 1:
+            raise ValueError("iterations must be at least 1")
+        self.iterations = iterations
+        self.salt_bytes = salt_bytes
+
+    def hash(self, pin: str) -> str:
+        """Returns the encoded salted hash of a PIN."""
+        salt = os.urandom(self.salt_bytes)
+        digest = hashlib.pbkdf2_hmac("sha256", pin.encode(), salt, self.iterations)
+        return f"{_ALGORITHM}${self.iterations}${salt.hex()}${digest.hex()}"
+
+
+def verify_pin(pin: str, encoded: str) -> bool:
+    """Checks a PIN against an encoded hash in constant time.
+
+    Raises:
+        ValueError: If the encoded hash is malformed or uses an unknown algorithm.
+    """
+    try:
+        algorithm, iterations, salt, expected = encoded.split("$")
+    except ValueError:
+        raise ValueError("Malformed PIN hash") from None
+    if algorithm != _ALGORITHM:
+        raise ValueError(f"Unknown PIN hash algorithm: {algorithm}")
+    digest = hashlib.pbkdf2_hmac("sha256", pin.encode(), bytes.fromhex(salt), int(iterations))
+    return hmac.compare_digest(digest, bytes.fromhex(expected))
+
+
+class PinVerificationCache:
+    """
+    Bounded LRU cache of recent successful PIN verifications.
+
+    Entries are keyed by (card number, session id) and expire after ttl
+    seconds, so repeated re-authentication inside one session skips the KDF
+    while a new session always pays for a full verification. The PIN itself
+    is not stored: each entry keeps an HMAC of it under a per-process random
+    key, and a lookup only hits when the same PIN is presented again.
+
+    Thread-safe: verifications run on worker threads (GUI worker, server
+    executor) and share one cache.
+    """
+    def __init__(self, max_entries: int = 10_000, ttl: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._secret = os.urandom(32)
+        self._entries: OrderedDict[tuple[str, object], tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _token(self, pin: str) -> bytes:
+        return hmac.new(self._secret, pin.encode(), hashlib.sha256).digest()
+
+    def check(self, card_number: str, session_id, pin: str) -> bool:
+        """Returns True if this PIN was verified for the card in this session and has not expired."""
+        key = (card_number, session_id)
+        presented = self._token(pin)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, token = entry
+                if expires > now and hmac.compare_digest(token, presented):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True
+                if expires <= now:
+                    del self._entries[key]
+            self.misses += 1
+            return False
+
+    def store(self, card_number: str, session_id, pin: str) -> None:
+        """Remembers a successful verification, evicting the least recently used entry if full."""
+        key = (card_number, session_id)
+        entry = (self._clock() + self.ttl, self._token(pin))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_session(self, card_number: str, session_id) -> None:
+        """Drops the cached verification of a session (e.g. when the card is ejected)."""
+        with self._lock:
+            self._entries.pop((card_number, session_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
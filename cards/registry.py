@@ -0,0 +1,108 @@
+from typing import Iterable, Iterator, Mapping
+
+from cards.card import Card
+from cards.factory import CardFactory
+
+
+def normalize_card_number(card_number: str) -> str:
+    """Strips separators (spaces, dashes) so '1234-5678' and '12345678' index the same card."""
+    if card_number.isdigit():
+        return card_number  # already normalized: the common case on every lookup and lockout check
+    return "".join(ch for ch in card_number if ch.isdigit())
+
+
+class CardRegistry:
+    """
+    In-memory index of cards for constant-time lookups.
+
+    Keeps two hash indexes: one by full card number (PAN) and one by the
+    last four digits. Several cards can share the same last four digits,
+    so the suffix index maps to a tuple of cards and ambiguous lookups are
+    reported explicitly instead of returning whichever card came first.
+    """
+    def __init__(self, cards: Iterable[Card] = ()):
+        self._by_number: dict[str, Card] = {}
+        self._by_last4: dict[str, tuple[Card, ...]] = {}
+        self.register_many(cards)
+
+    def __len__(self) -> int:
+        return len(self._by_number)
+
+    def __iter__(self) -> Iterator[Card]:
+        return iter(self._by_number.values())
+
+    def __contains__(self, card_number: str) -> bool:
+        return normalize_card_number(card_number) in self._by_number
+
+    def register(self, card: Card) -> None:
+        """Adds a card to both indexes.
+
+        Raises:
+            ValueError: If a card with the same number is already registered.
+        """
+        number = normalize_card_number(card.get_card_number())
+        if number in self._by_number:
+            raise ValueError(f"Card already registered: ...{number[-4:]}")
+        self._by_number[number] = card
+        last4 = number[-4:]
+        self._by_last4[last4] = self._by_last4.get(last4, ()) + (card,)
+
+    def register_many(self, cards: Iterable[Card]) -> None:
+        """Registers every card of an iterable."""
+        for card in cards:
+            self.register(card)
+
+    def load(self, specs: Iterable[Mapping]) -> list[Card]:
+        """
+        Bulk-creates cards through CardFactory and registers them.
+
+        Args:
+            specs: Mappings with a 'card_type' key plus the keyword arguments
+                   expected by CardFactory.create_card (card_number, pin,
+                   linked_account).
+
+        Returns:
+            list[Card]: The created cards, in input order.
+        """
+        cards = []
+        for spec in specs:
+            kwargs = dict(spec)
+            card = CardFactory.create_card(kwargs.pop("card_type"), **kwargs)
+            self.register(card)
+            cards.append(card)
+        return cards
+
+    def unregister(self, card_number: str) -> Card | None:
+        """Removes a card from both indexes and returns it (None if unknown)."""
+        number = normalize_card_number(card_number)
+        card = self._by_number.pop(number, None)
+        if card is None:
+            return None
+        last4 = number[-4:]
+        remaining = tuple(c for c in self._by_last4[last4] if c is not card)
+        if remaining:
+            self._by_last4[last4] = remaining
+        else:
+            del self._by_last4[last4]
+        return card
+
+    def get(self, card_number: str) -> Card | None:
+        """Returns the card with the given full number, or None."""
+        return self._by_number.get(normalize_card_number(card_number))
+
+    def find_by_last4(self, last4: str) -> tuple[Card, ...]:
+        """Returns every card whose number ends with the given four digits."""
+        return self._by_last4.get(last4, ())
+
+    def get_by_last4(self, last4: str) -> Card | None:
+        """
+        Returns the single card ending with the given four digits.
+
+        Raises:
+            ValueError: If more than one card shares those digits; callers
+                        must then ask for the full card number.
+        """
+        matches = self._by_last4.get(last4, ())
+        if len(matches) > 1:
+            raise ValueError(f"{len(matches)} cards end with {last4}; full card number required.")
+        return matches[0] if matches else None
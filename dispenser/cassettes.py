@@ -0,0 +1,105 @@
+from typing import Iterable
+
+from accounts.money import to_cents
+
+# Four-cassette terminal loaded with euro notes: "<denomination>x<notes>" per cassette
+DEFAULT_CASSETTES = "10x400,20x800,50x600,100x200"
+
+
+class Cassette:
+    """One cassette of a terminal: notes of a single denomination, in cents."""
+    __slots__ = ("denomination_cents", "count", "capacity")
+
+    def __init__(self, denomination_cents: int, count: int, capacity: int | None = None):
+        if denomination_cents <= 0 or count < 0:
+            raise ValueError("Cassette denomination must be positive and its note count non-negative")
+        self.denomination_cents = denomination_cents
+        self.count = count
+        self.capacity = count if capacity is None else capacity
+
+    def __repr__(self) -> str:
+        return f"Cassette({self.denomination_cents}, {self.count}, {self.capacity})"
+
+
+class CassetteInventory:
+    """
+    Notes loaded in one terminal, spread over its cassettes.
+
+    stock() aggregates the cassettes by denomination, largest first, which
+    is what the solver works on; it is rebuilt only after the inventory
+    changes. Every change bumps version; refills and new cassettes also
+    bump generation, because only they can make an amount cheaper (or
+    possible) to dispense.
+    """
+    def __init__(self, cassettes: Iterable[Cassette]):
+        self.cassettes = list(cassettes)
+        self.version = 0
+        self.generation = 0
+        self._stock: tuple[tuple[int, int], ...] | None = None
+        self._counts: dict[int, int] = {}
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "CassetteInventory":
+        """Builds an inventory from "10x400,20x800": one "<denomination>x<notes>" per cassette."""
+        cassettes = []
+        for part in spec.split(","):
+            denomination, sep, count = part.strip().lower().partition("x")
+            if not sep:
+                raise ValueError(f"Invalid cassette {part!r}, expected <denomination>x<notes>")
+            cassettes.append(Cassette(to_cents(denomination), int(count)))
+        return cls(cassettes)
+
+    def stock(self) -> tuple[tuple[int, int], ...]:
+        """(denomination cents, notes available) pairs, largest denomination first."""
+        if self._stock is None:
+            totals: dict[int, int] = {}
+            for cassette in self.cassettes:
+                if cassette.count:
+                    totals[cassette.denomination_cents] = totals.get(cassette.denomination_cents, 0) + cassette.count
+            self._stock = tuple(sorted(totals.items(), reverse=True))
+            self._counts = totals
+        return self._stock
+
+    def counts(self) -> dict[int, int]:
+        """Notes available per denomination (cents); do not modify."""
+        if self._stock is None:
+            self.stock()
+        return self._counts
+
+    def total_cents(self) -> int:
+        return sum(denomination * count for denomination, count in self.stock())
+
+    def remove(self, notes: Iterable[tuple[int, int]]) -> None:
+        """Takes (denomination cents, count) notes out, from the fullest cassettes first."""
+        notes = tuple(notes)
+        available = self.counts()
+        for denomination, count in notes:
+            if available.get(denomination, 0) < count:
+                raise ValueError(f"Not enough notes of {denomination} cents")
+        fullest_first = sorted(self.cassettes, key=lambda c: -c.count)
+        for denomination, count in notes:
+            for cassette in fullest_first:
+                if not count:
+                    break
+                if cassette.denomination_cents == denomination:
+                    taken = min(count, cassette.count)
+                    cassette.count -= taken
+                    count -= taken
+        self._changed()
+
+    def refill(self) -> None:
+        """Tops every cassette up to its capacity."""
+        for cassette in self.cassettes:
+            cassette.count = cassette.capacity
+        self.generation += 1
+        self._changed()
+
+    def load(self, cassette: Cassette) -> None:
+        """Adds a cassette to the terminal."""
+        self.cassettes.append(cassette)
+        self.generation += 1
+        self._changed()
+
+    def _changed(self) -> None:
+        self._stock = None
+        self.version += 1
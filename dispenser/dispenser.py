@@ -0,0 +1,115 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, NamedTuple
+
+from accounts.account_manager import AccountManager
+from accounts.money import Money, to_cents
+from accounts.result import Reason, Status, TransactionResult
+from dispenser.cassettes import CassetteInventory
+from dispenser.solver import solve_notes
+
+Notes = tuple[tuple[int, int], ...]  # (denomination cents, count) pairs, largest first
+
+
+class DispenseResult(NamedTuple):
+    """Result of a cash withdrawal: the debit's result and the notes handed out (empty if rejected)."""
+    result: TransactionResult
+    notes: Notes = ()
+
+    @property
+    def ok(self) -> bool:
+        return self.result.ok
+
+
+class CashDispenser:
+    """
+    Cash withdrawals of one terminal against its cassette inventory.
+
+    withdraw() finds the plan with the fewest notes for the amount before
+    touching the account: an amount the cassettes cannot pay (not a
+    multiple of the notes left, too large, or more than max_notes notes) is
+    rejected with Reason.CANNOT_DISPENSE and never debited. Planning, the
+    debit and taking the notes out run under one lock.
+
+    Plans are memoized per amount in an LRU of cache_size entries, since
+    terminals see the same few amounts over and over. Dispensing only takes
+    notes away, and a plan that is still available after that stays optimal
+    (nothing new became possible), so a cached plan is checked against the
+    stock on lookup and re-solved only if its notes ran out; a refill or a
+    new cassette (inventory.generation) drops the whole memo.
+    """
+    def __init__(self, inventory: CassetteInventory, max_notes: int = 40, cache_size: int = 256):
+        self.inventory = inventory
+        self.max_notes = max_notes
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._plans: OrderedDict[int, Notes | None] = OrderedDict()
+        self._generation = inventory.generation
+        self._lock = threading.Lock()
+
+    def denominations(self) -> list[Money]:
+        """Denominations the terminal can currently pay out, largest first."""
+        return [Money.from_cents(denomination) for denomination, _ in self.inventory.stock()]
+
+    def plan(self, amount: Money | float) -> Notes | None:
+        """Notes the terminal would hand out for amount now, or None if it cannot pay it."""
+        with self._lock:
+            return self._plan(to_cents(amount))
+
+    def _plan(self, cents: int) -> Notes | None:
+        plans = self._plans
+        if self.inventory.generation != self._generation:
+            plans.clear()
+            self._generation = self.inventory.generation
+        if cents in plans:
+            notes = plans[cents]
+            if notes is None or _available(notes, self.inventory.counts()):
+                plans.move_to_end(cents)
+                self.hits += 1
+                return notes
+        self.misses += 1
+        notes = solve_notes(cents, self.inventory.stock(), self.max_notes)
+        plans[cents] = notes
+        plans.move_to_end(cents)
+        if len(plans) > self.cache_size:
+            plans.popitem(last=False)
+        return notes
+
+    def withdraw(self, account: AccountManager, amount: Money | float,
+                 debit: Callable[[Money | float], TransactionResult] | None = None) -> DispenseResult:
+        """
+        Pays amount out of the account in notes.
+
+        debit performs the actual withdrawal (account.withdraw by default;
+        e.g. functools.partial(limits.withdraw, card) to apply withdrawal
+        limits) and only runs once the terminal knows it can pay the amount.
+        """
+        cents = to_cents(amount)
+        with self._lock:
+            notes = self._plan(cents) if cents > 0 else None
+            if cents > 0 and notes is None:
+                result = TransactionResult(Status.REJECTED, Money.from_cents(account.balance_cents),
+                                           Reason.CANNOT_DISPENSE)
+                if account._listeners:
+                    account._notify("withdraw", Money.from_cents(cents), result)
+                return DispenseResult(result)
+            result = (debit or account.withdraw)(amount)
+            if not result.ok:
+                return DispenseResult(result)
+            self.inventory.remove(notes)
+        return DispenseResult(result, notes)
+
+
+def _available(notes: Notes, available: dict[int, int]) -> bool:
+    return all(available.get(denomination, 0) >= count for denomination, count in notes)
+
+
+def describe_notes(notes: Notes, currency: str = "€") -> str:
+    """'2 x 50€, 1 x 20€' for a plan."""
+    return ", ".join(f"{count} x {_note(denomination)}{currency}" for denomination, count in notes)
+
+
+def _note(denomination_cents: int) -> str:
+    units, cents = divmod(denomination_cents, 100)
+    return str(units) if not cents else str(Money.from_cents(denomination_cents))
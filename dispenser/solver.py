@@ -0,0 +1,63 @@
+from math import gcd
+from typing import Sequence
+
+
+def solve_notes(amount_cents: int, stock: Sequence[tuple[int, int]],
+                max_notes: int = 40) -> tuple[tuple[int, int], ...] | None:
+    """
+    Splits an amount into the fewest notes the stock allows.
+
+    stock is (denomination cents, notes available) pairs, largest first, as
+    returned by CassetteInventory.stock(). Returns the (denomination, count)
+    pairs of an optimal plan, omitting unused denominations, or None if no
+    combination of at most max_notes notes adds up to the amount.
+
+    Exact branch and bound: denominations are tried largest first with as
+    many notes as fit, so the first plan found is the greedy one, and a
+    branch is cut as soon as it cannot beat the best plan so far (fewest
+    notes it could still need), cannot be paid by the smaller denominations
+    left (their total value), or cannot be expressed with them at all (gcd).
+    A terminal has a handful of denominations, so this explores a few dozen
+    nodes for typical amounts and stocks.
+    """
+    if amount_cents <= 0:
+        return None
+    stock = [(denomination, count) for denomination, count in stock if count > 0]
+    n = len(stock)
+    # value and gcd of the denominations from i onwards
+    suffix_value = [0] * (n + 1)
+    suffix_gcd = [0] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        denomination, count = stock[i]
+        suffix_value[i] = suffix_value[i + 1] + denomination * count
+        suffix_gcd[i] = gcd(suffix_gcd[i + 1], denomination)
+
+    counts = [0] * n
+    best: list | None = None
+    best_notes = max_notes + 1
+
+    def search(i: int, remaining: int, used: int) -> None:
+        nonlocal best, best_notes
+        if remaining == 0:
+            if used < best_notes:
+                best, best_notes = counts[:], used
+            return
+        if i == n or remaining > suffix_value[i] or remaining % suffix_gcd[i]:
+            return
+        denomination, count = stock[i]
+        if used - (-remaining // denomination) >= best_notes:
+            return
+        smaller = stock[i + 1][0] if i + 1 < n else 0
+        for k in range(min(count, remaining // denomination), -1, -1):
+            rest = remaining - k * denomination
+            # Fewer notes of this denomination only leave more for the smaller ones
+            if rest and (not smaller or used + k - (-rest // smaller) >= best_notes):
+                break
+            counts[i] = k
+            search(i + 1, rest, used + k)
+        counts[i] = 0
+
+    search(0, amount_cents, 0)
+    if best is None:
+        return None
+    return tuple((stock[i][0], k) for i, k in enumerate(best) if k)
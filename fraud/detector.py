@@ -0,0 +1,238 @@
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, NamedTuple
+
+from accounts.money import Money, to_cents
+from accounts.result import Reason, Status, TransactionResult
+from cards.card import Card
+from fraud.sketch import DecayedCountMinSketch, DecayedCounter, sketch_indexes
+
+
+class Action(str, Enum):
+    """What to do with a withdrawal after scoring it."""
+    ALLOW = "allow"
+    FLAG = "flag"
+    BLOCK = "block"
+
+
+class Verdict(NamedTuple):
+    action: Action
+    score: float
+    reasons: tuple[str, ...] = ()
+
+
+class Alert(NamedTuple):
+    timestamp: float
+    card_number: str
+    terminal: str
+    verdict: Verdict
+
+
+# feature -> (half-life seconds, flag at, block at); None never blocks
+DEFAULT_RULES: dict[str, tuple[float, float, float | None]] = {
+    "card_pin_failures": (900.0, 3.0, 5.0),           # PIN guessing spread over several lockouts
+    "card_withdrawals": (3600.0, 6.0, 12.0),          # withdrawal velocity of one card
+    "card_declines": (3600.0, 3.0, 8.0),              # probing balances or limits
+    "card_new_terminals": (3600.0, 3.0, 4.0),         # one card at many terminals: cloned card
+    "terminal_pin_failures": (900.0, 15.0, None),     # guessing or skimming at one terminal
+    "terminal_withdrawals": (600.0, 60.0, None),      # cash-out run at one terminal
+}
+# Cell indexes of this many recent keys are kept, since a session looks up the same card and terminal
+# several times; the cache is simply emptied when full.
+INDEX_CACHE_SIZE = 4096
+# A card is new at a terminal if it was not seen there within about this many seconds. The
+# (card, terminal) sketch tracks many more keys than the others, hence its own, larger width.
+PAIR_HALF_LIFE = 86400.0
+
+
+class FraudDetector:
+    """
+    Online scoring of card activity, fed by every PIN attempt and withdrawal.
+
+    Each feature of DEFAULT_RULES is a DecayedCountMinSketch keyed by card
+    or terminal, plus one sketch of (card, terminal) pairs to tell when a
+    card shows up at a terminal it has not used lately. Memory is fixed
+    (width * depth cells per feature, pair_width * depth for the pairs)
+    however many cards and terminals are seen, and every event reads or
+    updates a fixed number of cells, so its cost does not depend on the
+    traffic: tens of µs, well inside budget seconds. Events that still go
+    over budget (collector pauses, the rare sketch rescale) are counted in
+    over_budget rather than delayed or dropped.
+
+    withdraw() scores the card before running the debit: a feature at or
+    above its block threshold rejects the withdrawal with
+    Reason.SUSPECTED_FRAUD, one at or above its flag threshold lets it
+    through but raises an alert. The score is the highest feature value
+    over its flag threshold. Blocked attempts count as declines, so a card
+    that keeps retrying stays blocked until its counts decay.
+
+    Alerts are kept in a bounded deque (the newest max_alerts).
+    """
+    def __init__(self, rules: dict[str, tuple[float, float, float | None]] | None = None,
+                 width: int = 2048, depth: int = 4, pair_width: int = 1 << 17, budget: float = 0.0005,
+                 max_alerts: int = 1000,
+                 clock: Callable[[], float] = time.time, metrics=None):
+        self.rules = dict(DEFAULT_RULES if rules is None else rules)
+        self.budget = budget
+        self._clock = clock
+        self._width = width
+        self._depth = depth
+        self._index_cache: dict = {}
+        self._pair_index_cache: dict = {}
+        self._sketches = {name: DecayedCountMinSketch(width, depth, half_life)
+                          for name, (half_life, _, _) in self.rules.items()}
+        # (name, sketch, keyed by terminal, flag at, block at), in rule order
+        self._scored = [(name, self._sketches[name], name.startswith("terminal_"), flag_at, block_at)
+                        for name, (_, flag_at, block_at) in self.rules.items()]
+        self._pairs = DecayedCountMinSketch(pair_width, depth, PAIR_HALF_LIFE)
+        self._events = DecayedCounter(60.0)
+        self._lock = threading.Lock()
+        self._timer = time.perf_counter
+        self._metrics = None if metrics is None else metrics.operation("fraud_check")
+        self.alerts: deque[Alert] = deque(maxlen=max_alerts)
+        self.events = 0
+        self.over_budget = 0
+        self.flagged = 0
+        self.blocked = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the sketches."""
+        return self._pairs.nbytes + sum(sketch.nbytes for sketch in self._sketches.values())
+
+    def events_per_second(self) -> float:
+        """Recent event rate (decayed over about a minute)."""
+        with self._lock:
+            return self._events.value(self._clock()) * self._events.rate
+
+    def _indexes(self, key) -> list[int]:
+        # Every feature sketch has the same shape, so a key's cells serve all of them
+        cells = self._index_cache.get(key)
+        if cells is None:
+            if len(self._index_cache) >= INDEX_CACHE_SIZE:
+                self._index_cache.clear()
+            cells = self._index_cache[key] = sketch_indexes(key, self._width, self._depth)
+        return cells
+
+    def _pair_indexes(self, card_number: str, terminal: str) -> list[int]:
+        pair = (card_number, terminal)
+        cells = self._pair_index_cache.get(pair)
+        if cells is None:
+            if len(self._pair_index_cache) >= INDEX_CACHE_SIZE:
+                self._pair_index_cache.clear()
+            cells = self._pair_index_cache[pair] = self._pairs.indexes(pair)
+        return cells
+
+    def _add(self, feature: str, indexes: list[int], amount: float, now: float) -> None:
+        sketch = self._sketches.get(feature)
+        if sketch is not None:
+            sketch.add_at(indexes, amount, now)
+
+    def _done(self, started: float, ok: bool) -> None:
+        elapsed = self._timer() - started
+        with self._lock:
+            self.events += 1
+            if elapsed > self.budget:
+                self.over_budget += 1
+        if self._metrics is not None:
+            self._metrics.observe(elapsed, ok)
+
+    def record_pin(self, card_number: str, ok: bool, terminal: str = "") -> None:
+        """Feeds one PIN attempt; only failures count."""
+        started = self._timer()
+        with self._lock:
+            now = self._clock()
+            self._events.add(1, now)
+            if not ok:
+                self._add("card_pin_failures", self._indexes(card_number), 1, now)
+                self._add("terminal_pin_failures", self._indexes(terminal), 1, now)
+        self._done(started, True)
+
+    def score(self, card_number: str, terminal: str = "") -> Verdict:
+        """Scores a withdrawal about to be made with the card at the terminal."""
+        with self._lock:
+            return self._score(card_number, terminal, self._clock())
+
+    def _score(self, card_number: str, terminal: str, now: float) -> Verdict:
+        card_cells = self._indexes(card_number)
+        terminal_cells = self._indexes(terminal)
+        new_terminal = self._pairs.estimate_at(self._pair_indexes(card_number, terminal), now) < 0.5
+        action, score, reasons = Action.ALLOW, 0.0, []
+        for name, sketch, by_terminal, flag_at, block_at in self._scored:
+            value = sketch.estimate_at(terminal_cells if by_terminal else card_cells, now)
+            # The pending withdrawal counts, and so does the terminal if it is new for the card
+            if name == "card_withdrawals" or name == "terminal_withdrawals":
+                value += 1
+            elif name == "card_new_terminals" and new_terminal:
+                value += 1
+            if value / flag_at > score:
+                score = value / flag_at
+            if block_at is not None and value >= block_at:
+                action = Action.BLOCK
+                reasons.append(name)
+            elif value >= flag_at:
+                if action is Action.ALLOW:
+                    action = Action.FLAG
+                reasons.append(name)
+        return Verdict(action, score, tuple(reasons))
+
+    def _record_withdrawal(self, card_number: str, terminal: str, ok: bool, now: float) -> None:
+        self._events.add(1, now)
+        card_cells = self._indexes(card_number)
+        if ok:
+            self._add("card_withdrawals", card_cells, 1, now)
+            self._add("terminal_withdrawals", self._indexes(terminal), 1, now)
+        else:
+            self._add("card_declines", card_cells, 1, now)
+        pair_cells = self._pair_indexes(card_number, terminal)
+        if self._pairs.estimate_at(pair_cells, now) < 0.5:
+            self._add("card_new_terminals", card_cells, 1, now)
+        self._pairs.add_at(pair_cells, 1, now)
+
+    def record_withdrawal(self, card_number: str, result: TransactionResult, terminal: str = "") -> None:
+        """Feeds a withdrawal made without withdraw() (e.g. replayed traffic)."""
+        started = self._timer()
+        with self._lock:
+            self._record_withdrawal(card_number, terminal, result.ok, self._clock())
+        self._done(started, result.ok)
+
+    def withdraw(self, card: Card, amount: Money | float, debit: Callable[[Money | float], TransactionResult] | None = None,
+                 terminal: str = "") -> TransactionResult:
+        """
+        Scores the withdrawal and runs debit(amount) unless the card is blocked.
+
+        debit defaults to the card's account withdraw; the front ends pass
+        the withdrawal limits here. The scoring and the recording of the
+        outcome are timed against budget, the debit is not.
+        """
+        account = card.get_account()
+        card_number = card.get_card_number()
+        started = self._timer()
+        with self._lock:
+            now = self._clock()
+            verdict = self._score(card_number, terminal, now)
+            if verdict.action is not Action.ALLOW:
+                self.alerts.append(Alert(now, card_number, terminal, verdict))
+            if verdict.action is Action.BLOCK:
+                self.blocked += 1
+                self._record_withdrawal(card_number, terminal, False, now)
+            elif verdict.action is Action.FLAG:
+                self.flagged += 1
+        if verdict.action is Action.BLOCK:
+            self._done(started, False)
+            result = TransactionResult(Status.REJECTED, Money.from_cents(account.balance_cents),
+                                       Reason.SUSPECTED_FRAUD)
+            if account._listeners:
+                account._notify("withdraw", Money.from_cents(to_cents(amount)), result)
+            return result
+        scored = self._timer() - started
+
+        result = (debit or account.withdraw)(amount)
+
+        started = self._timer() - scored
+        with self._lock:
+            self._record_withdrawal(card_number, terminal, result.ok, self._clock())
+        self._done(started, result.ok)
+        return result
@@ -0,0 +1,122 @@
+import math
+from array import array
+from typing import Hashable
+
+# Counters are stored multiplied by exp(rate * (t - origin)); past this factor they are rescaled
+_MAX_SCALE = 1e100
+
+
+def sketch_indexes(key: Hashable, width: int, depth: int) -> list[int]:
+    """Cells of key in a width x depth sketch (double hashing of hash(key)), row by row."""
+    h = hash(key)
+    h1 = h & 0xFFFFFFFF
+    h2 = (h >> 32) | 1
+    return [row * width + (h1 + row * h2) % width for row in range(depth)]
+
+
+class DecayedCounter:
+    """
+    One exponentially decayed count: every unit added loses half its weight
+    each half_life seconds, so value() approximates the recent rate times
+    half_life / ln 2 without keeping any history.
+    """
+    __slots__ = ("rate", "_value", "_time")
+
+    def __init__(self, half_life: float):
+        if half_life <= 0:
+            raise ValueError("half_life must be positive")
+        self.rate = math.log(2) / half_life
+        self._value = 0.0
+        self._time = 0.0
+
+    def add(self, amount: float, now: float) -> float:
+        """Adds amount at time now and returns the decayed total."""
+        self._value = self.value(now) + amount
+        self._time = max(self._time, now)
+        return self._value
+
+    def value(self, now: float) -> float:
+        if now <= self._time:
+            return self._value
+        return self._value * math.exp(-self.rate * (now - self._time))
+
+
+class DecayedCountMinSketch:
+    """
+    Count-min sketch of exponentially decayed counts, in constant memory.
+
+    Estimates, for any key, the sum of the amounts added for it with each
+    one halved every half_life seconds. The estimate never undercounts
+    (up to float rounding) and overcounts by at most e / width of the
+    decayed total of all keys, with probability 1 - exp(-depth).
+
+    Decay is applied lazily to the whole table at once: counters are kept
+    multiplied by exp(rate * (t - origin)), so an add or estimate touches
+    only depth cells and one exp(); the factor is folded back into the
+    counters when it grows too large, which happens once every ~330
+    half-lives. Updates are conservative (only the cells at the current
+    minimum are raised), which tightens the estimates of light keys.
+
+    Rows are indexed by double hashing of hash(key), so keys must be
+    hashable and the sketch is only meaningful within one process.
+    Not thread-safe.
+    """
+    def __init__(self, width: int = 2048, depth: int = 4, half_life: float = 3600.0):
+        if width < 1 or depth < 1 or half_life <= 0:
+            raise ValueError("width, depth and half_life must be positive")
+        self.width = width
+        self.depth = depth
+        self.half_life = half_life
+        self.rate = math.log(2) / half_life
+        self._cells = array("d", bytes(8 * width * depth))
+        self._origin: float | None = None
+        self._scaled_at: float | None = None  # time of the last computed scale, reused while it does not move
+        self._scale_value = 1.0
+
+    @property
+    def nbytes(self) -> int:
+        return self._cells.itemsize * len(self._cells)
+
+    def indexes(self, key: Hashable) -> list[int]:
+        """Cells of key; the same for every sketch of equal width and depth, so they can be shared."""
+        return sketch_indexes(key, self.width, self.depth)
+
+    def _scale(self, now: float) -> float:
+        if now == self._scaled_at:
+            return self._scale_value
+        if self._origin is None:
+            self._origin = now
+        scale = math.exp(self.rate * (now - self._origin))
+        if scale > _MAX_SCALE:
+            self._rescale(now)
+            scale = 1.0
+        self._scaled_at, self._scale_value = now, scale
+        return scale
+
+    def _rescale(self, now: float) -> None:
+        factor = math.exp(-self.rate * (now - self._origin))
+        self._cells = array("d", (value * factor for value in self._cells))
+        self._origin = now
+
+    def add(self, key: Hashable, amount: float, now: float) -> float:
+        """Adds amount for key at time now and returns the key's new estimate."""
+        return self.add_at(self.indexes(key), amount, now)
+
+    def add_at(self, indexes: list[int], amount: float, now: float) -> float:
+        scale = self._scale(now)
+        cells = self._cells
+        target = min(map(cells.__getitem__, indexes)) + amount * scale
+        for i in indexes:
+            if cells[i] < target:
+                cells[i] = target
+        return target / scale
+
+    def estimate(self, key: Hashable, now: float) -> float:
+        """Decayed count of key at time now."""
+        return self.estimate_at(self.indexes(key), now)
+
+    def estimate_at(self, indexes: list[int], now: float) -> float:
+        if self._origin is None:
+            return 0.0
+        cells = self._cells
+        return min(map(cells.__getitem__, indexes)) / self._scale(now)
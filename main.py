@@ -8,14 +8,70 @@ promoting scalability and adherence to SOLID principles.
 Implemented account types include: SavingsAccount, CheckingAccount, and CreditAccount.
 """
 
+import argparse
+import time
+
 from accounts.factory import AccountFactory
 from cards.factory import CardFactory
+from cards.limits import WithdrawalLimits
+from cards.lockout import PinLockoutService
+from cards.registry import CardRegistry
+from dispenser.cassettes import DEFAULT_CASSETTES, CassetteInventory
+from dispenser.dispenser import CashDispenser, describe_notes
+from fraud.detector import FraudDetector
+from accounts.account_manager import AccountManager
+from accounts.money import Money
+from accounts.result import Reason
+from ui.flow import SessionFlow
+from ui.session import Session, State
 
-def main():
-    # --- FASE 1: PREPARACIÓN DEL ENTORNO (El banco crea los datos) ---
-    # Esto no lo hace el usuario en el cajero, es el estado inicial del sistema.
-    
-    print("Configurando el entorno del banco...")
+OPERACIONES = {
+    "deposit": "Depósito",
+    "withdraw": "Retiro",
+    "interest": "Intereses",
+    "repayment": "Amortización",
+}
+
+MOTIVOS = {
+    Reason.INVALID_AMOUNT: "la cantidad debe ser positiva",
+    Reason.INSUFFICIENT_FUNDS: "fondos insuficientes",
+    Reason.NON_POSITIVE_BALANCE: "el saldo no genera intereses",
+    Reason.LIMIT_EXCEEDED: "supera el límite de retirada",
+    Reason.CANNOT_DISPENSE: "el cajero no puede entregar ese importe con los billetes disponibles",
+    Reason.SUSPECTED_FRAUD: "operación bloqueada por seguridad, contacte con su banco",
+}
+
+
+def console_listener(account, operation, amount, result):
+    """Muestra por consola cada operación realizada sobre una cuenta."""
+    nombre = OPERACIONES.get(operation, operation)
+    if result.ok:
+        print(f"{nombre} de {amount}€ realizado. Nuevo saldo: {result.balance}€")
+    else:
+        print(f"{nombre} de {amount}€ rechazado: {MOTIVOS.get(result.reason, result.reason)}.")
+
+
+def mostrar_movimientos(historial, numero_cuenta, por_pagina=5):
+    """Muestra los últimos movimientos de la cuenta, por páginas de más reciente a más antiguo."""
+    cursor = None
+    while True:
+        movimientos, cursor = historial.page(numero_cuenta, por_pagina, cursor)
+        if not movimientos and cursor is None:
+            print("No hay movimientos registrados.")
+            return
+        for movimiento in movimientos:
+            fecha = time.strftime("%d/%m/%Y %H:%M", time.localtime(movimiento.timestamp))
+            nombre = OPERACIONES.get(movimiento.operation, movimiento.operation)
+            print(f"{fecha}  {nombre:<13} {Money.from_cents(movimiento.amount_cents):>10}€"
+                  f"  saldo {Money.from_cents(movimiento.balance_cents)}€")
+        if cursor is None:
+            return
+        if input("Intro para ver movimientos anteriores, 'q' para volver: ").strip().lower() == "q":
+            return
+
+
+def crear_tarjeta_de_ejemplo():
+    """Crea la cuenta de ahorros y la tarjeta de débito de ejemplo."""
     account_factory = AccountFactory()
     card_factory = CardFactory()
 
@@ -34,6 +90,104 @@ def main():
         pin="1234", 
         linked_account=savings_account_1
     )
+    return debit_card_1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ATM - Simulador (consola)")
+    parser.add_argument("--journal", help="fichero de diario para recuperar y persistir los saldos")
+    parser.add_argument("--history", help="fichero de movimientos por cuenta (sin él solo se guardan los recientes en memoria)")
+    parser.add_argument("--snapshot", help="instantánea de cuentas y tarjetas en lugar de la cuenta de ejemplo "
+                                           "(se crea con ella si no existe y se reescribe periódicamente y al salir)")
+    parser.add_argument("--snapshot-interval", type=float, default=300.0,
+                        help="segundos entre instantáneas; cada una vacía el diario (--journal)")
+    parser.add_argument("--db", help="base de datos SQLite de cuentas y tarjetas (se crea si no existe)")
+    parser.add_argument("--daily-limit", default="600", help="máximo retirable por tarjeta en 24 h ('0' sin límite)")
+    parser.add_argument("--hourly-limit", default="0", help="máximo retirable por tarjeta en 1 h ('0' sin límite)")
+    parser.add_argument("--account-daily-limit", default="0",
+                        help="máximo retirable por cuenta en 24 h entre todas sus tarjetas ('0' sin límite)")
+    parser.add_argument("--terminal", default="ATM-CONSOLA", help="identificador de este cajero")
+    parser.add_argument("--cassettes", default=DEFAULT_CASSETTES,
+                        help="billetes cargados en el cajero, '<valor>x<billetes>' por casete (p. ej. '20x800,50x600')")
+    parser.add_argument("--metrics", help="fichero donde volcar las métricas al salir (.json o texto Prometheus)")
+    parser.add_argument("--metrics-port", type=int, help="sirve /metrics y /metrics.json por HTTP en este puerto")
+    args = parser.parse_args(argv)
+
+    # Métricas de latencia y éxito/fallo de las operaciones (desactivadas por defecto, sin coste)
+    metricas = None
+    if args.metrics or args.metrics_port is not None:
+        from telemetry.export import MetricsReporter
+        from telemetry.instrumentation import instrumentation
+        metricas = MetricsReporter(instrumentation, args.metrics, args.metrics_port)
+        metricas.start()
+
+    # --- FASE 1: PREPARACIÓN DEL ENTORNO (El banco crea los datos) ---
+    # Esto no lo hace el usuario en el cajero, es el estado inicial del sistema.
+    
+    print("Configurando el entorno del banco...")
+    # Las cuentas no imprimen nada: la salida por consola la produce este listener
+    AccountManager.add_listener(console_listener)
+    repositorio = None
+    if args.snapshot:
+        # Arranque rápido: las cuentas se materializan al primer acceso
+        from storage.snapshot import open_snapshot
+        card_registry = open_snapshot(args.snapshot, lambda: [crear_tarjeta_de_ejemplo()])
+        cuentas = card_registry.accounts
+        numero_insertado = input("Introduzca el número de tarjeta: ")
+    elif args.db:
+        # Cuentas y tarjetas persistidas en SQLite; una base vacía se inicializa con la tarjeta de ejemplo
+        from storage.sqlite_repository import SQLiteRepository
+        repositorio = SQLiteRepository(args.db)
+        if len(repositorio) == 0:
+            repositorio.save_cards([crear_tarjeta_de_ejemplo()])
+            print("Base de datos vacía: creada la tarjeta de ejemplo 1234-5678-9012-3456.")
+        card_registry = repositorio
+        cuentas = repositorio.accounts
+        numero_insertado = input("Introduzca el número de tarjeta: ")
+    else:
+        debit_card_1 = crear_tarjeta_de_ejemplo()
+        savings_account_1 = debit_card_1.get_account()
+
+        # Registramos la tarjeta para poder resolverla en O(1) al insertarla
+        card_registry = CardRegistry([debit_card_1])
+        cuentas = {savings_account_1.account_number: savings_account_1}
+        # (Aquí simularíamos la inserción de debit_card_1)
+        numero_insertado = "1234-5678-9012-3456"
+
+    # Recuperamos los saldos del diario (si existe) y registramos los cambios a partir de ahora
+    journal = None
+    if args.journal:
+        from storage.journal import TransactionJournal
+        aplicados = TransactionJournal.replay(args.journal, cuentas)
+        print(f"Diario recuperado: {aplicados} operaciones reaplicadas.")
+        journal = TransactionJournal(args.journal)
+        journal.attach()
+    # Instantáneas periódicas: cada una deja el diario vacío, así que el arranque solo reaplica lo posterior
+    snapshotter = None
+    if args.snapshot:
+        from storage.snapshot import PeriodicSnapshotter
+        snapshotter = PeriodicSnapshotter(args.snapshot, card_registry, args.snapshot_interval, journal)
+        snapshotter.start()
+    # Historial de movimientos por cuenta: los recientes en memoria, los antiguos en disco
+    from storage.history import TransactionHistory
+    historial = TransactionHistory(args.history)
+    historial.attach()
+    if repositorio is not None:
+        # Cada operación aceptada actualiza el saldo en la base de datos
+        repositorio.attach()
+
+    lockouts = PinLockoutService(max_attempts=3, lockout_seconds=30)
+    # Límites de retirada por tarjeta y por cuenta en ventanas deslizantes
+    limites = WithdrawalLimits(card_hourly=Money(args.hourly_limit) or None,
+                               card_daily=Money(args.daily_limit) or None,
+                               account_daily=Money(args.account_daily_limit) or None)
+    # Casetes de billetes del cajero: solo se cobra lo que se puede entregar
+    cajero = CashDispenser(CassetteInventory.from_spec(args.cassettes))
+    # Detector de fraude: recibe cada intento de PIN y cada retirada, y puede bloquear la retirada
+    detector = FraudDetector()
+    # La sesión recorre el mismo flujo que la GUI y el servidor: aquí solo se lee la entrada y se imprime
+    flujo = SessionFlow(card_registry, lockouts, limites, detector, cajero)
+    sesion = Session(terminal=args.terminal)
     print("Entorno listo.\n")
 
 
@@ -41,76 +195,97 @@ def main():
     # El usuario "introduce" la tarjeta en el cajero.
     
     print("Bienvenido al ATM. Por favor, inserte su tarjeta.")
-    # (Aquí simularíamos la inserción de debit_card_1)
+    # El cajero lee el número de la tarjeta insertada y lo busca en el registro
+    paso = flujo.insert_card(sesion, numero_insertado)
+    if paso.error in ("CARD_NOT_FOUND", "CARD_AMBIGUOUS"):
+        print("Tarjeta no reconocida.")
+        if journal is not None:
+            journal.detach()
+        if snapshotter is not None:
+            snapshotter.stop()
+        if journal is not None:
+            journal.close()
+        historial.detach()
+        historial.close()
+        if repositorio is not None:
+            repositorio.close()
+        if metricas is not None:
+            metricas.stop()
+        return
     
-    # Gestión de PIN con 3 intentos y bloqueo temporal
-    MAX_INTENTOS = 3
-    BLOQUEO_SEGUNDOS = 30  # bloquear durante 30 segundos tras 3 fallos
-
-    intentos = 0
-    bloqueado_hasta = None
-
-    import time
-
-    while True:
-        # Comprobar si hay bloqueo activo
-        if bloqueado_hasta and time.time() < bloqueado_hasta:
-            restante = int(bloqueado_hasta - time.time())
-            print(f"Tarjeta temporalmente bloqueada. Inténtelo de nuevo en {restante} s...")
-            time.sleep(min(3, max(1, restante)))
+    # Gestión de PIN con 3 intentos y bloqueo temporal (30 s tras 3 fallos).
+    # El servicio guarda el bloqueo por número de tarjeta: no hay que esperar activamente.
+    while sesion.state is not State.MENU:
+        # Tarjeta bloqueada: se devuelve y se vuelve a insertar al reintentar
+        if sesion.state is State.CARD:
+            print(f"Tarjeta temporalmente bloqueada. Inténtelo de nuevo en {paso.remaining} s.")
+            input("Pulse Intro para reintentar...")
+            paso = flujo.insert_card(sesion, numero_insertado)
             continue
 
-        pin_introducido = input("Introduzca su PIN: ")
-
-        if debit_card_1.validate_pin(pin_introducido):
-            print("PIN correcto.")
-            break
-        else:
-            intentos += 1
-            restantes = MAX_INTENTOS - intentos
-            if restantes > 0:
-                print(f"PIN incorrecto. Intentos restantes: {restantes}")
-            if intentos >= MAX_INTENTOS:
-                print("Demasiados intentos fallidos. Bloqueando temporalmente la tarjeta...")
-                bloqueado_hasta = time.time() + BLOQUEO_SEGUNDOS
-                intentos = 0  # resetear el contador tras aplicar bloqueo
-                continue
+        paso = flujo.enter_pin(sesion, input("Introduzca su PIN: "))
+        if paso.error == "PIN_INVALID":
+            print(f"PIN incorrecto. Intentos restantes: {paso.remaining}")
+        elif paso.error == "CARD_BLOCKED":
+            print("Demasiados intentos fallidos. Bloqueando temporalmente la tarjeta...")
 
     if True:  # ya validado el PIN y salimos del bucle
         print("PIN correcto.")
 
-        # El cajero opera con la cuenta asociada
-        cuenta_actual = debit_card_1.get_account()
-
         # Menú de operaciones básicas
         while True:
             print("\nSeleccione una opción:")
             print("1) Consultar saldo")
             print("2) Retirar efectivo")
-            print("3) Salir")
+            print("3) Últimos movimientos")
+            print("4) Salir")
             opcion = input("> ").strip()
 
             if opcion == "1":
-                print(f"Saldo actual: {cuenta_actual.get_balance()}€")
+                print(f"Saldo actual: {flujo.select(sesion, 'balance').balance}€")
             elif opcion == "2":
                 try:
-                    cantidad_a_retirar = float(input("Introduzca la cantidad a retirar: "))
+                    cantidad_a_retirar = Money(input("Introduzca la cantidad a retirar: "))
                     if cantidad_a_retirar <= 0:
                         print("La cantidad debe ser positiva.")
                         continue
                     print(f"Retirando {cantidad_a_retirar}€...")
-                    cuenta_actual.withdraw(cantidad_a_retirar)
-                    print(f"Nuevo saldo: {cuenta_actual.get_balance()}€")
+                    # Primero se comprueba que el cajero pueda entregar el importe; después el
+                    # detector de fraude puntúa la tarjeta y el límite se comprueba y se descuenta
+                    # junto con la retirada
+                    flujo.select(sesion, "withdraw")
+                    paso = flujo.enter_amount(sesion, cantidad_a_retirar)
+                    if paso.ok:
+                        print(f"Retire su dinero: {describe_notes(paso.notes)}")
+                    elif paso.result.reason is Reason.CANNOT_DISPENSE:
+                        billetes = ", ".join(f"{billete:.0f}€" for billete in cajero.denominations())
+                        print(f"Billetes disponibles: {billetes}")
                 except ValueError as e:
                     print(f"Error: {e}")
                 except Exception as e:
                     print(f"Operación no completada: {e}")
             elif opcion == "3":
+                mostrar_movimientos(historial, sesion.account.account_number)
+            elif opcion == "4":
+                flujo.end(sesion)
                 print("Gracias por usar el ATM. ¡Hasta pronto!")
                 break
             else:
                 print("Opción no válida. Intente de nuevo.")
-        
+
+    if journal is not None:
+        journal.detach()
+    if snapshotter is not None:
+        snapshotter.stop()
+    if journal is not None:
+        journal.close()
+    historial.detach()
+    historial.close()
+    if repositorio is not None:
+        repositorio.close()
+    if metricas is not None:
+        metricas.stop()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,476 @@
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable, Iterator, Mapping
+
+from telemetry.metrics import MetricsRegistry
+
+_MISSING = object()
+
+
+class LRUPolicy:
+    """Least-recently-used residency: one ordered dict, evicting from the cold end."""
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._entries: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def items(self) -> Iterator[tuple]:
+        return iter(list(self._entries.items()))
+
+    def peek(self, key):
+        return self._entries.get(key, _MISSING)
+
+    def lookup(self, key):
+        value = self._entries.get(key, _MISSING)
+        if value is not _MISSING:
+            self._entries.move_to_end(key)
+        return value
+
+    def admit(self, key, value) -> list[tuple]:
+        """Inserts or replaces key and returns the (key, value) pairs evicted to make room."""
+        entries = self._entries
+        entries[key] = value
+        entries.move_to_end(key)
+        evicted = []
+        while len(entries) > self.capacity:
+            evicted.append(entries.popitem(last=False))
+        return evicted
+
+    def remove(self, key):
+        return self._entries.pop(key, _MISSING)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class ARCPolicy:
+    """
+    Adaptive Replacement Cache (Megiddo & Modha).
+
+    Resident entries are split between t1 (seen once recently) and t2 (seen
+    at least twice); b1 and b2 remember the keys recently evicted from each.
+    A miss that hits a ghost list moves the target size p of t1 towards the
+    list that would have kept it, so the cache adapts between recency and
+    frequency, and a one-off scan over many accounts cannot flush the hot
+    ones out of t2.
+    """
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.p = 0.0
+        self._t1: OrderedDict = OrderedDict()
+        self._t2: OrderedDict = OrderedDict()
+        self._b1: OrderedDict = OrderedDict()
+        self._b2: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._t1) + len(self._t2)
+
+    def __contains__(self, key) -> bool:
+        return key in self._t1 or key in self._t2
+
+    def items(self) -> Iterator[tuple]:
+        return iter(list(self._t1.items()) + list(self._t2.items()))
+
+    def peek(self, key):
+        value = self._t1.get(key, _MISSING)
+        return self._t2.get(key, _MISSING) if value is _MISSING else value
+
+    def lookup(self, key):
+        value = self._t1.pop(key, _MISSING)
+        if value is not _MISSING:
+            self._t2[key] = value
+            return value
+        value = self._t2.get(key, _MISSING)
+        if value is not _MISSING:
+            self._t2.move_to_end(key)
+        return value
+
+    def admit(self, key, value) -> list[tuple]:
+        """Inserts or replaces key and returns the (key, value) pairs evicted to make room."""
+        t1, t2, b1, b2, c = self._t1, self._t2, self._b1, self._b2, self.capacity
+        if key in t1 or key in t2:
+            t1.pop(key, None)
+            t2[key] = value
+            t2.move_to_end(key)
+            return []
+        evicted = []
+        if key in b1:
+            self.p = min(c, self.p + max(len(b2) / len(b1), 1))
+            self._replace(key, evicted)
+            del b1[key]
+            t2[key] = value
+            return evicted
+        if key in b2:
+            self.p = max(0.0, self.p - max(len(b1) / len(b2), 1))
+            self._replace(key, evicted)
+            del b2[key]
+            t2[key] = value
+            return evicted
+        if len(t1) + len(b1) >= c:
+            if len(t1) < c:
+                b1.popitem(last=False)
+                self._replace(key, evicted)
+            else:
+                evicted.append(t1.popitem(last=False))
+        elif len(t1) + len(t2) + len(b1) + len(b2) >= c:
+            if len(t1) + len(t2) + len(b1) + len(b2) >= 2 * c:
+                b2.popitem(last=False)
+            self._replace(key, evicted)
+        t1[key] = value
+        return evicted
+
+    def _replace(self, key, evicted: list) -> None:
+        t1, t2 = self._t1, self._t2
+        if len(t1) + len(t2) < self.capacity:
+            return  # room left (entries were removed or invalidated)
+        if t1 and (len(t1) > self.p or (key in self._b2 and len(t1) == self.p) or not t2):
+            old_key, old_value = t1.popitem(last=False)
+            self._b1[old_key] = None
+        else:
+            old_key, old_value = t2.popitem(last=False)
+            self._b2[old_key] = None
+        evicted.append((old_key, old_value))
+
+    def remove(self, key):
+        value = self._t1.pop(key, _MISSING)
+        if value is _MISSING:
+            value = self._t2.pop(key, _MISSING)
+        self._b1.pop(key, None)
+        self._b2.pop(key, None)
+        return value
+
+    def clear(self) -> None:
+        for entries in (self._t1, self._t2, self._b1, self._b2):
+            entries.clear()
+        self.p = 0.0
+
+
+POLICIES = {"lru": LRUPolicy, "arc": ARCPolicy}
+
+
+class WriteBackCache:
+    """
+    Bounded cache of mutable objects (accounts) in front of a slower store.
+
+    get() returns the cached object, or loads it with load(key) on a miss;
+    concurrent misses on one key share a single load. Changes to cached
+    objects are not written immediately: mark_dirty() sets the entry's
+    dirty bit and flush() hands every dirty entry to write_back({key: value})
+    in one call, so many operations on a hot account cost one write. With
+    flush_interval, start() runs that flush periodically on a background
+    thread.
+
+    There is never more than one live object per key: an evicted object
+    that is still dirty, being written, or referenced elsewhere (e.g. by a
+    session holding its card) is put back by the next get() instead of
+    being reloaded from the store, so no change is lost or read back stale.
+    Values must therefore support weak references. on_evict(key, value) is
+    called for every entry leaving the cache (eviction or invalidation).
+
+    invalidate() tombstones the objects it drops that are still referenced
+    elsewhere: they are never taken back, so a change made through one of
+    them cannot be written over the store's newer data. stale(value) returns
+    their key and the stale_state(value) recorded at invalidation (e.g. the
+    balance), so the owner can re-apply just that change to a fresh copy.
+
+    With a metrics registry, every get is timed as '<name>_get' (success =
+    hit, failure = miss) and every flush as '<name>_flush'.
+    """
+    def __init__(self, load: Callable[[Hashable], object], write_back: Callable[[Mapping], None],
+                 capacity: int = 100_000, policy: str = "lru", flush_interval: float | None = None,
+                 on_evict: Callable[[Hashable, object], None] | None = None,
+                 metrics: MetricsRegistry | None = None, name: str = "cache",
+                 clock: Callable[[], float] = time.perf_counter,
+                 stale_state: Callable[[object], object] | None = None):
+        if capacity < 1:
+            raise ValueError("Cache capacity must be at least 1")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown eviction policy: {policy}")
+        self.capacity = capacity
+        self.policy = policy
+        self.flush_interval = flush_interval
+        self._entries = POLICIES[policy](capacity)
+        self._load = load
+        self._write_back = write_back
+        self._on_evict = on_evict
+        self._dirty: set = set()
+        self._evicted_dirty: dict = {}
+        self._flushing: dict = {}  # batch being written: a miss must not reload these from the store
+        self._released = weakref.WeakValueDictionary()  # evicted objects still referenced elsewhere
+        self._loading: dict = {}  # key -> lock held by the thread running its single in-flight load
+        self._stale = weakref.WeakKeyDictionary()  # invalidated objects still in use -> (key, state)
+        self._stale_state = stale_state
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._clock = clock
+        self._get_metrics = metrics.operation(f"{name}_get") if metrics is not None else None
+        self._flush_metrics = metrics.operation(f"{name}_flush") if metrics is not None else None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.flushes = 0
+        self.written = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def dirty_count(self) -> int:
+        return len(self._dirty) + len(self._evicted_dirty)
+
+    def stats(self) -> dict:
+        return {
+            "policy": self.policy,
+            "capacity": self.capacity,
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "evictions": self.evictions,
+            "dirty": self.dirty_count,
+            "flushes": self.flushes,
+            "written": self.written,
+        }
+
+    # --- lookups ---
+
+    def peek(self, key):
+        """Live object for key (None if there is none), without loading it or touching recency."""
+        with self._lock:
+            value = self._entries.peek(key)
+            if value is _MISSING:
+                value = self._evicted_dirty.get(key)
+                if value is None:
+                    value = self._flushing.get(key)
+                if value is None:
+                    value = self._released.get(key)
+            return value
+
+    def get(self, key):
+        """Cached object for key, loading it on a miss (None if the store does not have it)."""
+        metrics = self._get_metrics
+        start = self._clock() if metrics is not None else 0.0
+        with self._lock:
+            value = self._entries.lookup(key)
+            if value is not _MISSING:
+                self.hits += 1
+                if metrics is not None:
+                    metrics.observe(self._clock() - start, True)
+                return value
+            self.misses += 1
+        value = self._load_once(key)
+        if metrics is not None:
+            metrics.observe(self._clock() - start, False)
+        return value
+
+    def _load_once(self, key):
+        while True:
+            with self._lock:
+                value = self._entries.peek(key)
+                if value is not _MISSING:
+                    return value  # loaded or put back by another thread meanwhile
+                value = self._recover(key)
+                if value is not _MISSING:
+                    return value
+                loading = self._loading.get(key)
+                if loading is None:
+                    loading = self._loading[key] = threading.Lock()
+                    loading.acquire()
+                    break
+            # Another thread is loading key: wait for it, then take its result from the cache
+            loading.acquire()
+            loading.release()
+        # Load outside the lock so a slow store does not stall hits on other keys
+        try:
+            value = self._load(key)
+            if value is not None:
+                with self._lock:
+                    self._admit(key, value)
+        finally:
+            with self._lock:
+                del self._loading[key]
+            loading.release()
+        return value
+
+    def _recover(self, key):
+        """Puts back an evicted object that is still dirty, being written or referenced elsewhere."""
+        value = self._evicted_dirty.pop(key, _MISSING)
+        if value is not _MISSING:
+            self._dirty.add(key)
+        else:
+            value = self._flushing.get(key, _MISSING)
+            if value is _MISSING:
+                value = self._released.get(key, _MISSING)
+                if value is _MISSING:
+                    return _MISSING
+        self._admit(key, value)
+        return value
+
+    def put(self, key, value, dirty: bool = False) -> bool:
+        """
+        Caches value under key, replacing any object cached for it.
+
+        A clean put makes value current again even if it was invalidated
+        (the caller has just stored it). A dirty put of an invalidated object
+        returns False and does nothing: its changes are based on old data.
+        """
+        with self._lock:
+            if dirty and value in self._stale:
+                return False
+            self._stale.pop(value, None)
+            self._evicted_dirty.pop(key, None)
+            self._released.pop(key, None)
+            self._admit(key, value)
+            if dirty:
+                self._dirty.add(key)
+            return True
+
+    def stale(self, value) -> tuple | None:
+        """(key, state) recorded when value was invalidated, or None if value is not stale."""
+        with self._lock:
+            return self._stale.get(value)
+
+    def retire(self, key, value) -> None:
+        """Tombstones value for key as invalidate() does, recording its current state."""
+        with self._lock:
+            self._stale[value] = (key, self._stale_state(value) if self._stale_state is not None else None)
+
+    def _admit(self, key, value) -> None:
+        for old_key, old_value in self._entries.admit(key, value):
+            self.evictions += 1
+            if old_key in self._dirty:
+                self._dirty.discard(old_key)
+                self._evicted_dirty[old_key] = old_value
+            self._released[old_key] = old_value
+            if self._on_evict is not None:
+                self._on_evict(old_key, old_value)
+
+    # --- writes ---
+
+    def mark_dirty(self, key, value) -> bool:
+        """
+        Flags key as changed since the last flush.
+
+        Returns False (and does nothing) if value is not the object cached
+        for key, so changes to foreign or evicted objects are not written
+        behind the cache's back; put(key, value, dirty=True) takes an
+        evicted object back.
+        """
+        with self._lock:
+            current = self._entries.peek(key)
+            if current is _MISSING:
+                # Already waiting in the evicted set for the next flush
+                return self._evicted_dirty.get(key) is value
+            if current is not value:
+                return False
+            self._dirty.add(key)
+            return True
+
+    def flush(self) -> int:
+        """Writes every dirty entry with one write_back call and returns how many were written."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty and not self._evicted_dirty:
+                    return 0
+                batch = dict(self._evicted_dirty)
+                for key in self._dirty:
+                    value = self._entries.peek(key)
+                    if value is not _MISSING:
+                        batch[key] = value
+                dirty, evicted = self._dirty, self._evicted_dirty
+                self._dirty, self._evicted_dirty = set(), {}
+                self._flushing = batch
+            start = self._clock()
+            try:
+                self._write_back(batch)
+            except BaseException:
+                # Nothing was written: restore the dirty bits so the next flush retries
+                with self._lock:
+                    self._flushing = {}
+                    self._dirty |= {key for key in dirty if key in self._entries}
+                    for key, value in evicted.items():
+                        if key not in self._entries:
+                            self._evicted_dirty.setdefault(key, value)
+                if self._flush_metrics is not None:
+                    self._flush_metrics.observe(self._clock() - start, False)
+                raise
+            with self._lock:
+                self._flushing = {}
+            if self._flush_metrics is not None:
+                self._flush_metrics.observe(self._clock() - start, True)
+            self.flushes += 1
+            self.written += len(batch)
+            return len(batch)
+
+    def invalidate(self, keys: Iterable | None = None) -> None:
+        """
+        Drops keys (every entry if None) after an update made outside this cache.
+
+        The store is the source of truth for invalidated keys: their
+        unflushed changes are discarded, the next get() reloads them, and
+        the dropped objects are tombstoned (see stale()).
+        """
+        with self._lock:
+            if keys is None:
+                live = [*self._released.items(), *self._flushing.items(), *self._evicted_dirty.items()]
+                dropped = list(self._entries.items())
+                for key, value in live + dropped:
+                    self.retire(key, value)
+                self._entries.clear()
+                self._dirty.clear()
+                self._evicted_dirty.clear()
+                self._released.clear()
+            else:
+                dropped = []
+                for key in keys:
+                    live = self.peek(key)
+                    if live is not None:
+                        self.retire(key, live)
+                    value = self._entries.remove(key)
+                    if value is not _MISSING:
+                        dropped.append((key, value))
+                    self._dirty.discard(key)
+                    self._evicted_dirty.pop(key, None)
+                    self._released.pop(key, None)
+            if self._on_evict is not None:
+                for key, value in dropped:
+                    self._on_evict(key, value)
+
+    # --- periodic flush ---
+
+    def start(self) -> None:
+        """Starts flushing every flush_interval seconds on a background thread."""
+        if self.flush_interval is None or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="cache-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self, final_flush: bool = True) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if final_flush:
+            self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
@@ -0,0 +1,233 @@
+import os
+import struct
+import threading
+import time
+from array import array
+from typing import Callable, NamedTuple
+
+from accounts.account_manager import AccountManager
+from accounts.result import TransactionResult
+from storage.journal import OPERATION_CODES, OPERATION_NAMES
+
+# Block header: offset of the account's previous block (-1 if none), seq of the first entry,
+# entry count, account number length. Followed by the account number and the entries.
+_BLOCK = struct.Struct("<qqHB")
+# Entry: timestamp in µs, op code, amount cents, balance cents
+_ENTRY = struct.Struct("<qBqq")
+_FIELDS = 4  # values per entry in a ring array
+
+
+class HistoryEntry(NamedTuple):
+    seq: int
+    timestamp: float
+    operation: str
+    amount_cents: int
+    balance_cents: int
+
+
+class StatementCursor(NamedTuple):
+    """Where the next page starts: entries older than before_seq, expected in the block at block."""
+    before_seq: int
+    block: int
+
+
+class _AccountHistory:
+    __slots__ = ("ring", "start", "count", "next_seq", "last_block")
+
+    def __init__(self):
+        self.ring: array | None = None  # allocated on the account's first operation
+        self.start = 0
+        self.count = 0
+        self.next_seq = 0
+        self.last_block = -1
+
+
+class TransactionHistory:
+    """
+    Per-account history of accepted operations, for mini-statements.
+
+    Each account keeps its newest operations in a fixed-size array ring of
+    capacity entries (32 bytes each, allocated on its first operation).
+    When the ring is full its oldest half is spilled as one block to an
+    append-only segment file; every block points to the previous block of
+    the same account, so memory per account stays bounded however long it
+    has been active, and the newest capacity/2 operations are always served
+    from memory. Without a path, spilled operations are dropped.
+
+    page() returns the newest operations first and a cursor for the next
+    page; following a cursor reads only the entries of that page (one slice
+    per block touched), never the operations skipped before it. close()
+    spills the rings, and reopening the file restores every account's
+    history.
+    """
+    def __init__(self, path: str | None = None, capacity: int = 16, clock: Callable[[], float] = time.time):
+        if capacity < 2 or capacity % 2:
+            raise ValueError("History capacity must be an even number of at least 2")
+        self.path = path
+        self.capacity = capacity
+        self._clock = clock
+        self._accounts: dict[str, _AccountHistory] = {}
+        self._lock = threading.Lock()
+        self._file = None
+        self._end = 0
+        if path is not None:
+            self._end = self._scan(path)
+            self._file = open(path, "a+b")
+            self._file.truncate(self._end)
+
+    def __enter__(self) -> "TransactionHistory":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _scan(self, path: str) -> int:
+        """Rebuilds the per-account block chains from a segment file; returns the end of its last whole block."""
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return 0
+        offset = 0
+        with open(path, "rb") as f:
+            while offset + _BLOCK.size <= size:
+                f.seek(offset)
+                prev, first_seq, count, key_length = _BLOCK.unpack(f.read(_BLOCK.size))
+                end = offset + _BLOCK.size + key_length + count * _ENTRY.size
+                if end > size:
+                    break  # torn tail left by a crash
+                number = f.read(key_length).decode()
+                history = self._accounts.get(number)
+                if history is None:
+                    history = self._accounts[number] = _AccountHistory()
+                history.last_block = offset
+                history.next_seq = first_seq + count
+                offset = end
+        return offset
+
+    def attach(self) -> None:
+        """Starts recording every AccountManager operation."""
+        AccountManager.add_listener(self.record)
+
+    def detach(self) -> None:
+        AccountManager.remove_listener(self.record)
+
+    def record(self, account: AccountManager, operation: str, amount, result: TransactionResult) -> None:
+        """AccountManager listener: records accepted operations, ignores rejected ones."""
+        if result.ok:
+            self.append(account.account_number, operation, amount.cents, result.balance.cents)
+
+    def append(self, account_number: str, operation: str, amount_cents: int, balance_cents: int) -> int:
+        """Adds one operation to an account's history and returns its per-account sequence number."""
+        timestamp_us = int(self._clock() * 1_000_000)
+        op_code = OPERATION_CODES[operation]
+        capacity = self.capacity
+        with self._lock:
+            history = self._accounts.get(account_number)
+            if history is None:
+                history = self._accounts[account_number] = _AccountHistory()
+            if history.ring is None:
+                history.ring = array("q", bytes(8 * _FIELDS * capacity))
+            elif history.count == capacity:
+                self._spill(account_number, history, capacity // 2)
+            index = (history.start + history.count) % capacity * _FIELDS
+            ring = history.ring
+            ring[index] = timestamp_us
+            ring[index + 1] = op_code
+            ring[index + 2] = amount_cents
+            ring[index + 3] = balance_cents
+            history.count += 1
+            seq = history.next_seq
+            history.next_seq = seq + 1
+        return seq
+
+    def _spill(self, account_number: str, history: _AccountHistory, count: int) -> None:
+        """Moves the oldest count entries of the ring to a new block of the segment file."""
+        if self._file is not None:
+            key = account_number.encode()
+            parts = [_BLOCK.pack(history.last_block, history.next_seq - history.count, count, len(key)), key]
+            ring = history.ring
+            for i in range(count):
+                index = (history.start + i) % self.capacity * _FIELDS
+                parts.append(_ENTRY.pack(*ring[index:index + _FIELDS]))
+            block = b"".join(parts)
+            self._file.seek(self._end)
+            self._file.write(block)
+            history.last_block = self._end
+            self._end += len(block)
+        history.start = (history.start + count) % self.capacity
+        history.count -= count
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            for number, history in self._accounts.items():
+                if history.count:
+                    self._spill(number, history, history.count)
+            self._file.close()
+            self._file = None
+
+    def count(self, account_number: str) -> int:
+        """Number of operations recorded for an account."""
+        history = self._accounts.get(account_number)
+        return 0 if history is None else history.next_seq
+
+    def page(self, account_number: str, limit: int = 10,
+             cursor: StatementCursor | None = None) -> tuple[list[HistoryEntry], StatementCursor | None]:
+        """
+        Returns up to limit operations of an account, newest first, and the
+        cursor of the next (older) page, or None when there are no more.
+        """
+        with self._lock:
+            history = self._accounts.get(account_number)
+            if history is None:
+                return [], None
+            entries: list[HistoryEntry] = []
+            seq = (history.next_seq if cursor is None else cursor.before_seq) - 1
+            ring_first = history.next_seq - history.count
+            while len(entries) < limit and seq >= ring_first:
+                index = (history.start + seq - ring_first) % self.capacity * _FIELDS
+                entries.append(_entry(seq, history.ring[index:index + _FIELDS]))
+                seq -= 1
+
+            block = -1 if self._file is None else history.last_block
+            if block != -1 and seq < ring_first and len(entries) < limit:
+                self._file.flush()
+                # The cursor's block is right unless more blocks were spilled since it was made
+                if cursor is not None and cursor.block != -1 and self._holds(cursor.block, seq):
+                    block = cursor.block
+            while len(entries) < limit and seq >= 0 and block != -1:
+                prev, first_seq, count, key_length = self._header(block)
+                if seq >= first_seq + count:
+                    block = -1  # the range was never spilled to this file; nothing older is reachable
+                    break
+                if seq < first_seq:
+                    block = prev
+                    continue
+                take = min(limit - len(entries), seq - first_seq + 1)
+                low = seq - take + 1
+                self._file.seek(block + _BLOCK.size + key_length + (low - first_seq) * _ENTRY.size)
+                data = self._file.read(take * _ENTRY.size)
+                chunk = [_entry(low + i, values) for i, values in enumerate(_ENTRY.iter_unpack(data))]
+                entries.extend(reversed(chunk))
+                seq = low - 1
+                if seq < first_seq:
+                    block = prev
+
+            if seq < 0 or (seq < ring_first and block == -1):
+                return entries, None
+            return entries, StatementCursor(seq + 1, block)
+
+    def _header(self, block: int) -> tuple[int, int, int, int]:
+        self._file.seek(block)
+        return _BLOCK.unpack(self._file.read(_BLOCK.size))
+
+    def _holds(self, block: int, seq: int) -> bool:
+        _, first_seq, count, _ = self._header(block)
+        return first_seq <= seq < first_seq + count
+
+
+def _entry(seq: int, values) -> HistoryEntry:
+    timestamp_us, op_code, amount_cents, balance_cents = values
+    return HistoryEntry(seq, timestamp_us / 1_000_000, OPERATION_NAMES.get(op_code, str(op_code)),
+                        amount_cents, balance_cents)
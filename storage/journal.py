@@ -0,0 +1,249 @@
+import os
+import shutil
+import struct
+import threading
+import time
+import zlib
+from typing import Callable, Iterator, Mapping, NamedTuple
+
+from accounts.account_manager import AccountManager
+from accounts.result import TransactionResult
+
+OPERATION_CODES = {"deposit": 1, "withdraw": 2, "interest": 3, "repayment": 4}
+OPERATION_NAMES = {code: name for name, code in OPERATION_CODES.items()}
+
+# Frame: crc32 of the payload, payload length. Payload: seq, op code, amount, balance, account number.
+_FRAME = struct.Struct("<IH")
+_PAYLOAD = struct.Struct("<QBqq")
+# Records moved aside by checkpoint() until its snapshot is durable
+ROTATED_SUFFIX = ".prev"
+
+
+class JournalRecord(NamedTuple):
+    seq: int
+    operation: str
+    account_number: str
+    amount_cents: int
+    balance_cents: int
+
+
+def _encode(seq: int, op_code: int, account_number: str, amount_cents: int, balance_cents: int) -> bytes:
+    payload = _PAYLOAD.pack(seq, op_code, amount_cents, balance_cents) + account_number.encode()
+    return _FRAME.pack(zlib.crc32(payload), len(payload)) + payload
+
+
+def _scan(path: str) -> Iterator[tuple[int, JournalRecord]]:
+    """Yields (end offset, record) for every intact record, stopping at the first torn or corrupt one."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        offset = 0
+        while True:
+            frame = f.read(_FRAME.size)
+            if len(frame) < _FRAME.size:
+                return
+            crc, length = _FRAME.unpack(frame)
+            payload = f.read(length)
+            if len(payload) < max(length, _PAYLOAD.size) or zlib.crc32(payload) != crc:
+                return
+            seq, op_code, amount, balance = _PAYLOAD.unpack_from(payload)
+            number = payload[_PAYLOAD.size:].decode()
+            offset += _FRAME.size + length
+            yield offset, JournalRecord(seq, OPERATION_NAMES.get(op_code, str(op_code)), number, amount, balance)
+
+
+class TransactionJournal:
+    """
+    Binary append-only write-ahead journal of account mutations.
+
+    Every accepted deposit, withdrawal, interest charge and repayment is
+    appended as a checksummed record holding the amount and the resulting
+    balance. A background writer groups pending records and makes each group
+    durable with a single write + fsync:
+
+    - commit_interval bounds how long a record may wait for its group
+      (the latency/durability window),
+    - max_batch flushes early once that many records are pending,
+    - with wait_for_commit=True, record() blocks until the record is on disk;
+      concurrent callers share one fsync. With False, it returns immediately
+      and at most commit_interval worth of records can be lost on a crash.
+
+    On open, a torn or corrupt tail left by a crash is truncated, and
+    replay() restores balances onto freshly created accounts.
+
+    checkpoint() bounds the file: once a snapshot holds every balance, the
+    records before it are dropped (see storage.snapshot.PeriodicSnapshotter).
+    """
+    def __init__(self, path: str, commit_interval: float = 0.005, max_batch: int = 1024,
+                 wait_for_commit: bool = False, fsync: bool = True):
+        self.path = path
+        self.commit_interval = commit_interval
+        self.max_batch = max_batch
+        self.wait_for_commit = wait_for_commit
+        self._fsync = fsync
+        self.commits = 0
+
+        last_seq = 0
+        for _, record in _scan(path + ROTATED_SUFFIX):
+            last_seq = record.seq
+        valid_end = 0
+        for valid_end, record in _scan(path):
+            last_seq = record.seq
+        self._file = open(path, "ab")
+        self._file.truncate(valid_end)
+        self._seq = last_seq
+        self._durable_seq = last_seq
+        self._pending: list[bytes] = []
+        self._closing = False
+        self._cond = threading.Condition()
+        self._io = threading.Lock()  # serializes writing a batch with checkpoint() swapping files; taken before _cond
+        self._writer = threading.Thread(target=self._write_loop, name="journal-writer", daemon=True)
+        self._writer.start()
+
+    def __enter__(self) -> "TransactionJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def attach(self) -> None:
+        """Starts journaling every AccountManager operation."""
+        AccountManager.add_listener(self.record)
+
+    def detach(self) -> None:
+        AccountManager.remove_listener(self.record)
+
+    def record(self, account: AccountManager, operation: str, amount, result: TransactionResult) -> None:
+        """AccountManager listener: journals accepted operations, ignores rejected ones."""
+        if result.ok:
+            self.append(account.account_number, operation, amount.cents, result.balance.cents)
+
+    def append(self, account_number: str, operation: str, amount_cents: int, balance_cents: int) -> int:
+        """Queues one record and returns its sequence number."""
+        with self._cond:
+            if self._closing:
+                raise ValueError("Journal is closed")
+            self._seq += 1
+            seq = self._seq
+            self._pending.append(_encode(seq, OPERATION_CODES[operation], account_number, amount_cents, balance_cents))
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch:
+                self._cond.notify_all()
+            if self.wait_for_commit:
+                while self._durable_seq < seq:
+                    self._cond.wait()
+        return seq
+
+    def flush(self) -> None:
+        """Blocks until every record appended so far is durable."""
+        with self._cond:
+            target = self._seq
+            self._cond.notify_all()
+            while self._durable_seq < target:
+                self._cond.wait()
+
+    def checkpoint(self, snapshot: Callable[[], None]) -> None:
+        """
+        Runs snapshot() and drops the records it makes redundant.
+
+        Records written so far are moved to path + ROTATED_SUFFIX and new
+        ones go to an empty file, so operations are not held up while
+        snapshot() runs. snapshot() must capture the balances after the
+        rotation (records carry absolute balances, so overlap is harmless).
+        The rotated records are deleted once it returns; if it raises or the
+        process dies first, they are kept and replay() still reads them.
+        """
+        rotated = self.path + ROTATED_SUFFIX
+        with self._io:
+            with self._cond:
+                batch, self._pending = self._pending, []
+                last_seq = self._seq
+            if batch:
+                self._file.write(b"".join(batch))
+            self._file.flush()
+            if self._fsync:
+                os.fsync(self._file.fileno())
+            if os.path.exists(rotated):
+                # the snapshot of an earlier checkpoint failed: keep those records too
+                with open(rotated, "ab") as f, open(self.path, "rb") as current:
+                    shutil.copyfileobj(current, f)
+                    f.flush()
+                    if self._fsync:
+                        os.fsync(f.fileno())
+                self._file.truncate(0)
+            else:
+                self._file.close()
+                os.replace(self.path, rotated)
+                self._file = open(self.path, "ab")
+            with self._cond:
+                self._durable_seq = max(self._durable_seq, last_seq)
+                self._cond.notify_all()
+        snapshot()
+        os.remove(rotated)
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closing:
+                return
+            self._closing = True
+            self._cond.notify_all()
+        self._writer.join()
+        self._file.close()
+
+    def _write_loop(self) -> None:
+        cond = self._cond
+        while True:
+            with cond:
+                while not self._pending and not self._closing:
+                    cond.wait()
+                deadline = time.monotonic() + self.commit_interval
+                while len(self._pending) < self.max_batch and not self._closing:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    cond.wait(remaining)
+            with self._io:
+                with cond:
+                    batch, self._pending = self._pending, []
+                    last_seq = self._seq
+                    closing = self._closing
+                if batch:
+                    self._file.write(b"".join(batch))
+                    self._file.flush()
+                    if self._fsync:
+                        os.fsync(self._file.fileno())
+                    self.commits += 1
+                with cond:
+                    self._durable_seq = max(self._durable_seq, last_seq)
+                    cond.notify_all()
+            if closing and not batch:
+                return
+
+    @staticmethod
+    def read(path: str) -> Iterator[JournalRecord]:
+        """Yields the intact records of a journal file in order, including those of an unfinished checkpoint."""
+        for _, record in _scan(path + ROTATED_SUFFIX):
+            yield record
+        for _, record in _scan(path):
+            yield record
+
+    @staticmethod
+    def replay(path: str, accounts: Mapping[str, AccountManager]) -> int:
+        """
+        Restores balances from a journal onto freshly created accounts.
+
+        Each record carries the balance after the operation, so replay is
+        idempotent: the last record of each account wins. Records for
+        accounts missing from the mapping are skipped.
+
+        Returns:
+            int: Number of records applied.
+        """
+        applied = 0
+        for record in TransactionJournal.read(path):
+            account = accounts.get(record.account_number)
+            if account is not None:
+                account.balance_cents = record.balance_cents
+                applied += 1
+        return applied
@@ -0,0 +1,378 @@
+import mmap
+import os
+import struct
+import threading
+from typing import Callable, Iterable, Iterator
+
+from accounts.account_manager import AccountManager
+from accounts.checking_account import CheckingAccount
+from accounts.credit_account import CreditAccount
+from accounts.factory import AccountFactory
+from accounts.money import Money
+from accounts.savings_account import SavingsAccount
+from cards.card import Card
+from cards.factory import CardFactory
+from cards.registry import normalize_card_number
+from storage.journal import TransactionJournal
+
+MAGIC = b"ATMSNAP1"
+
+# magic, account count, card count
+_HEADER = struct.Struct("<8sII")
+# type code, account number, holder, balance cents, credit limit cents, interest rate
+_ACCOUNT = struct.Struct("<B32s64sqqd")
+# type code, card number, PIN hash, account record index
+_CARD = struct.Struct("<B19s128sI")
+_INDEX = struct.Struct("<I")
+
+_ACCOUNT_TYPES = ((SavingsAccount, "savings"), (CheckingAccount, "checking"), (CreditAccount, "credit"))
+_CARD_TYPES = ("debit", "credit")
+
+
+def _fixed(text: str, size: int, field: str) -> bytes:
+    raw = text.encode()
+    if len(raw) > size:
+        raise ValueError(f"{field} longer than {size} bytes: {text!r}")
+    return raw.ljust(size, b"\0")
+
+
+def _lookup_key(text: str, size: int) -> bytes | None:
+    """Fixed-width key of a lookup, or None if text is too long to be in the file."""
+    raw = text.encode()
+    return raw.ljust(size, b"\0") if len(raw) <= size else None
+
+
+def _account_code(account: AccountManager) -> int:
+    for code, (cls, _) in enumerate(_ACCOUNT_TYPES):
+        if isinstance(account, cls):
+            return code
+    raise ValueError(f"Unsupported account class: {type(account).__name__}")
+
+
+def write_snapshot(path: str, cards: Iterable[Card], accounts: Iterable[AccountManager] = ()) -> None:
+    """
+    Writes accounts and cards to a fixed-width binary snapshot file.
+
+    Accounts linked to the cards are included automatically; accounts is for
+    extra accounts without a card. Records are sorted by account number and
+    card number, followed by an index of cards sorted by last four digits, so
+    a reader can binary-search the file without building any index. The file
+    is written to a temporary name and renamed, so readers never see a
+    partial snapshot.
+
+    Raises:
+        ValueError: If a field does not fit its fixed width.
+    """
+    cards = list(cards)
+    by_number = {a.account_number: a for a in accounts}
+    for card in cards:
+        account = card.get_account()
+        by_number.setdefault(account.account_number, account)
+
+    account_keys = sorted((_fixed(n, 32, "account number"), n) for n in by_number)
+    account_row = {number: row for row, (_, number) in enumerate(account_keys)}
+    card_keys = sorted(cards, key=lambda c: normalize_card_number(c.get_card_number()))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(account_keys), len(card_keys)))
+        for _, number in account_keys:
+            f.write(_pack_account(by_number[number]))
+        for card in card_keys:
+            f.write(_pack_card(card, account_row[card.get_account().account_number]))
+        last4_order = sorted(range(len(card_keys)),
+                             key=lambda i: normalize_card_number(card_keys[i].get_card_number())[-4:])
+        for index in last4_order:
+            f.write(_INDEX.pack(index))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _pack_account(account: AccountManager) -> bytes:
+    return _ACCOUNT.pack(
+        _account_code(account), _fixed(account.account_number, 32, "account number"),
+        _fixed(account.account_holder, 64, "account holder"),
+        account.balance_cents, getattr(account, "credit_limit_cents", 0),
+        getattr(account, "interest_rate", 0.0),
+    )
+
+
+def _pack_card(card: Card, account_row: int) -> bytes:
+    return _CARD.pack(
+        _CARD_TYPES.index(card.card_type()),
+        _fixed(normalize_card_number(card.get_card_number()), 19, "card number"),
+        _fixed(card.get_pin_hash(), 128, "PIN hash"),
+        account_row,
+    )
+
+
+class _AccountIndex:
+    """Mapping-style access to the accounts of a SnapshotBook (supports .get and [])."""
+    def __init__(self, book: "SnapshotBook"):
+        self._book = book
+
+    def get(self, account_number: str, default=None):
+        account = self._book.get_account(account_number)
+        return default if account is None else account
+
+    def __getitem__(self, account_number: str) -> AccountManager:
+        account = self._book.get_account(account_number)
+        if account is None:
+            raise KeyError(account_number)
+        return account
+
+    def __contains__(self, account_number: str) -> bool:
+        return self._book.get_account(account_number) is not None
+
+    def __len__(self) -> int:
+        return self._book.account_count
+
+
+class SnapshotBook:
+    """
+    Read-only, memory-mapped view of a snapshot file.
+
+    Opening a book only maps the file and reads the header, so startup time
+    does not depend on the number of accounts. SavingsAccount, CheckingAccount,
+    CreditAccount and Card objects are materialized through the factories on
+    first access and cached, so later changes to them stay in memory. Lookups
+    binary-search the sorted fixed-width records in place.
+
+    Card lookups mirror CardRegistry (get, find_by_last4, get_by_last4), so a
+    book can stand in for a registry in the front ends.
+
+    write_to() saves the book with its current balances without
+    materializing it: untouched records are copied from the file as is.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.account_count, self.card_count = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not an ATM snapshot: {path}")
+        self._accounts_at = _HEADER.size
+        self._cards_at = self._accounts_at + self.account_count * _ACCOUNT.size
+        self._last4_at = self._cards_at + self.card_count * _CARD.size
+        self._accounts: dict[int, AccountManager] = {}
+        self._cards: dict[int, Card] = {}
+        self._lock = threading.Lock()
+        self.accounts = _AccountIndex(self)
+
+    def __enter__(self) -> "SnapshotBook":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.card_count
+
+    def __iter__(self) -> Iterator[Card]:
+        return (self.card_at(i) for i in range(self.card_count))
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def materialized(self) -> tuple[int, int]:
+        """Number of (accounts, cards) turned into objects so far."""
+        return len(self._accounts), len(self._cards)
+
+    def write_to(self, path: str) -> None:
+        """
+        Writes a snapshot of the book as it is now, in the same layout as write_snapshot().
+
+        Only materialized accounts and cards (the only ones that can have
+        changed) are encoded again; every other record, the header and the
+        last-four index are copied from the mapped file. path may be the
+        book's own file: the mapping keeps reading the replaced one.
+        """
+        with self._lock:
+            accounts, cards = dict(self._accounts), dict(self._cards)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f, memoryview(self._map) as view:
+            f.write(view[:self._accounts_at])
+            _write_rows(f, view, self._accounts_at, _ACCOUNT.size, self.account_count,
+                        {row: _pack_account(account) for row, account in accounts.items()})
+            _write_rows(f, view, self._cards_at, _CARD.size, self.card_count,
+                        {index: _pack_card(card, _CARD.unpack_from(view, self._cards_at + index * _CARD.size)[3])
+                         for index, card in cards.items()})
+            f.write(view[self._last4_at:])
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    # --- accounts ---
+
+    def _account_key(self, row: int) -> bytes:
+        offset = self._accounts_at + row * _ACCOUNT.size + 1
+        return self._map[offset:offset + 32]
+
+    def account_at(self, row: int) -> AccountManager:
+        account = self._accounts.get(row)
+        if account is not None:
+            return account
+        with self._lock:
+            account = self._accounts.get(row)
+            if account is None:
+                code, number, holder, balance, limit, rate = _ACCOUNT.unpack_from(
+                    self._map, self._accounts_at + row * _ACCOUNT.size)
+                kwargs = {
+                    "account_holder": holder.rstrip(b"\0").decode(),
+                    "account_number": number.rstrip(b"\0").decode(),
+                    "balance": Money.from_cents(balance),
+                }
+                account_type = _ACCOUNT_TYPES[code][1]
+                if account_type == "credit":
+                    kwargs.update(credit_limit=Money.from_cents(limit), interest_rate=rate)
+                account = AccountFactory.create_account(account_type, **kwargs)
+                self._accounts[row] = account
+        return account
+
+    def get_account(self, account_number: str) -> AccountManager | None:
+        key = _lookup_key(account_number, 32)
+        if key is None:
+            return None
+        row = _bisect(self._account_key, self.account_count, key)
+        if row < self.account_count and self._account_key(row) == key:
+            return self.account_at(row)
+        return None
+
+    def iter_accounts(self) -> Iterator[AccountManager]:
+        return (self.account_at(row) for row in range(self.account_count))
+
+    # --- cards ---
+
+    def _card_key(self, index: int) -> bytes:
+        offset = self._cards_at + index * _CARD.size + 1
+        return self._map[offset:offset + 19]
+
+    def _last4_entry(self, position: int) -> int:
+        return _INDEX.unpack_from(self._map, self._last4_at + position * _INDEX.size)[0]
+
+    def _last4_key(self, position: int) -> bytes:
+        return self._card_key(self._last4_entry(position)).rstrip(b"\0")[-4:]
+
+    def card_at(self, index: int) -> Card:
+        card = self._cards.get(index)
+        if card is not None:
+            return card
+        account_row = _CARD.unpack_from(self._map, self._cards_at + index * _CARD.size)[3]
+        account = self.account_at(account_row)
+        with self._lock:
+            card = self._cards.get(index)
+            if card is None:
+                code, number, pin_hash, _ = _CARD.unpack_from(self._map, self._cards_at + index * _CARD.size)
+                card = CardFactory.create_card(
+                    _CARD_TYPES[code],
+                    card_number=number.rstrip(b"\0").decode(),
+                    pin_hash=pin_hash.rstrip(b"\0").decode(),
+                    linked_account=account,
+                )
+                self._cards[index] = card
+        return card
+
+    def get(self, card_number: str) -> Card | None:
+        key = _lookup_key(normalize_card_number(card_number), 19)
+        if key is None:
+            return None
+        index = _bisect(self._card_key, self.card_count, key)
+        if index < self.card_count and self._card_key(index) == key:
+            return self.card_at(index)
+        return None
+
+    def find_by_last4(self, last4: str) -> tuple[Card, ...]:
+        key = last4.encode()
+        start = _bisect(self._last4_key, self.card_count, key)
+        matches = []
+        position = start
+        while position < self.card_count and self._last4_key(position) == key:
+            matches.append(self.card_at(self._last4_entry(position)))
+            position += 1
+        return tuple(matches)
+
+    def get_by_last4(self, last4: str) -> Card | None:
+        """Same contract as CardRegistry.get_by_last4 (ValueError if ambiguous)."""
+        matches = self.find_by_last4(last4)
+        if len(matches) > 1:
+            raise ValueError(f"{len(matches)} cards end with {last4}; full card number required.")
+        return matches[0] if matches else None
+
+
+def open_snapshot(path: str, seed: Callable[[], Iterable[Card]]) -> SnapshotBook:
+    """Opens the snapshot at path, first writing one with the cards from seed() if the file does not exist."""
+    if not os.path.exists(path):
+        write_snapshot(path, seed())
+    return SnapshotBook(path)
+
+
+def _write_rows(f, view: memoryview, start: int, size: int, count: int, encoded: dict[int, bytes]) -> None:
+    """Writes count fixed-width rows: encoded[row] where given, otherwise the row as it is in view."""
+    position = 0
+    for row in sorted(encoded):
+        f.write(view[start + position * size:start + row * size])
+        f.write(encoded[row])
+        position = row + 1
+    f.write(view[start + position * size:start + count * size])
+
+
+def _bisect(key_at: Callable[[int], bytes], count: int, key: bytes) -> int:
+    """Leftmost position whose key is >= key, over records sorted by key_at."""
+    lo, hi = 0, count
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if key_at(mid) < key:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+class PeriodicSnapshotter:
+    """
+    Rewrites a snapshot every interval seconds on a background thread.
+
+    source returns the (cards, accounts) iterables to persist, e.g. the
+    registry plus accounts without a card, or is a SnapshotBook, saved with
+    SnapshotBook.write_to() so that nothing is materialized. With a journal, each snapshot is
+    a journal checkpoint: the records it covers are dropped, so the journal
+    only grows between snapshots and startup replays just that tail.
+    """
+    def __init__(self, path: str,
+                 source: SnapshotBook | Callable[[], tuple[Iterable[Card], Iterable[AccountManager]]],
+                 interval: float = 300.0, journal: TransactionJournal | None = None):
+        self.path = path
+        self.interval = interval
+        self.journal = journal
+        self._source = source
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="snapshotter", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def snapshot_now(self) -> None:
+        if self.journal is not None:
+            self.journal.checkpoint(self._write)
+        else:
+            self._write()
+
+    def _write(self) -> None:
+        if isinstance(self._source, SnapshotBook):
+            self._source.write_to(self.path)
+            return
+        cards, accounts = self._source()
+        write_snapshot(self.path, cards, accounts)
+
+    def stop(self, final_snapshot: bool = True) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        if final_snapshot:
+            self.snapshot_now()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.snapshot_now()
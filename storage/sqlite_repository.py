@@ -0,0 +1,453 @@
+import queue
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+from accounts.account_manager import AccountManager
+from accounts.factory import AccountFactory
+from accounts.money import Money
+from accounts.result import TransactionResult
+from cards.card import Card
+from cards.factory import CardFactory
+from cards.registry import normalize_card_number
+from storage.cache import WriteBackCache
+from telemetry.metrics import MetricsRegistry
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS accounts (
+        number TEXT PRIMARY KEY,
+        type TEXT NOT NULL,
+        holder TEXT NOT NULL,
+        balance_cents INTEGER NOT NULL,
+        credit_limit_cents INTEGER NOT NULL DEFAULT 0,
+        interest_rate REAL NOT NULL DEFAULT 0
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS cards (
+        number TEXT PRIMARY KEY,
+        type TEXT NOT NULL,
+        pin_hash TEXT NOT NULL,
+        account_number TEXT NOT NULL REFERENCES accounts(number),
+        last4 TEXT NOT NULL
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS cards_by_last4 ON cards(last4, number)",
+)
+
+# Statements are module constants: sqlite3 keeps a per-connection cache of compiled
+# statements keyed by SQL text, so every call after the first reuses the prepared statement.
+_SELECT_ACCOUNT = ("SELECT type, holder, balance_cents, credit_limit_cents, interest_rate "
+                   "FROM accounts WHERE number = ?")
+_SELECT_BALANCE = "SELECT balance_cents FROM accounts WHERE number = ?"
+_SELECT_CARD = "SELECT type, pin_hash, account_number FROM cards WHERE number = ?"
+_SELECT_CARDS_BY_LAST4 = "SELECT number FROM cards WHERE last4 = ? ORDER BY number"
+_SELECT_CARD_NUMBERS = "SELECT number FROM cards ORDER BY number"
+_COUNT_ACCOUNTS = "SELECT COUNT(*) FROM accounts"
+_COUNT_CARDS = "SELECT COUNT(*) FROM cards"
+_UPSERT_ACCOUNT = (
+    "INSERT INTO accounts (number, type, holder, balance_cents, credit_limit_cents, interest_rate) "
+    "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(number) DO UPDATE SET type = excluded.type, "
+    "holder = excluded.holder, balance_cents = excluded.balance_cents, "
+    "credit_limit_cents = excluded.credit_limit_cents, interest_rate = excluded.interest_rate"
+)
+_UPSERT_CARD = (
+    "INSERT INTO cards (number, type, pin_hash, account_number, last4) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT(number) DO UPDATE SET type = excluded.type, pin_hash = excluded.pin_hash, "
+    "account_number = excluded.account_number, last4 = excluded.last4"
+)
+_UPDATE_BALANCE = "UPDATE accounts SET balance_cents = ? WHERE number = ?"
+
+STATEMENT_CACHE_SIZE = 64
+
+
+class ConnectionPool:
+    """
+    Fixed-size pool of SQLite connections shared by threads.
+
+    Connections are opened lazily up to size, in WAL mode so readers never
+    block the writer, and handed out by connection(). A thread waits up to
+    timeout seconds for a free connection before giving up.
+    """
+    def __init__(self, path: str, size: int = 4, timeout: float = 5.0):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._opened: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False,
+                               cached_statements=STATEMENT_CACHE_SIZE)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL only syncs at checkpoints: a crash can lose the last
+        # commits but never corrupts the database.
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._opened) < self.size:
+                conn = self._connect()
+                self._opened.append(conn)
+                return conn
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No free database connection after {self.timeout} s") from None
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrows a connection for the duration of the with block."""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            opened, self._opened = self._opened, []
+        for conn in opened:
+            conn.close()
+
+
+def _account_type(account: AccountManager) -> str:
+    name = getattr(account, "account_type_name", "").lower()
+    if name not in AccountFactory.types:
+        raise ValueError(f"Unsupported account class: {type(account).__name__}")
+    return name
+
+
+def _account_row(account: AccountManager) -> tuple:
+    return (
+        account.account_number, _account_type(account), account.account_holder, account.balance_cents,
+        getattr(account, "credit_limit_cents", 0), getattr(account, "interest_rate", 0.0),
+    )
+
+
+class _AccountIndex:
+    """Mapping-style access to the accounts of a SQLiteRepository (supports .get and [])."""
+    def __init__(self, repository: "SQLiteRepository"):
+        self._repository = repository
+
+    def get(self, account_number: str, default=None):
+        account = self._repository.get_account(account_number)
+        return default if account is None else account
+
+    def __getitem__(self, account_number: str) -> AccountManager:
+        account = self._repository.get_account(account_number)
+        if account is None:
+            raise KeyError(account_number)
+        return account
+
+    def __contains__(self, account_number: str) -> bool:
+        return self._repository.get_account(account_number) is not None
+
+    def __len__(self) -> int:
+        return self._repository.account_count()
+
+
+class SQLiteRepository:
+    """
+    Accounts and cards stored in a local SQLite database (WAL mode).
+
+    Accounts and cards are materialized through the factories on first
+    access and kept in a bounded WriteBackCache of account_cache_size
+    accounts ('lru' or 'arc' cache_policy), so every front end thread works
+    on the same object for a given account without a round trip per
+    operation. Cards are cached with their account and dropped with it.
+    Once attach()ed, accepted operations on cached accounts set their dirty
+    bit; dirty balances are coalesced per account and written with a single
+    executemany transaction once write_batch accounts are dirty, every
+    flush_interval seconds if given, and on flush() and close()
+    (write_batch=1 is write-through). After another process changes the
+    database, invalidate() drops the affected accounts.
+
+    Balance inquiries for accounts outside the account cache go through a
+    read-through LRU cache of balance_cache_size entries, which also keeps
+    the last balance of accounts evicted from the account cache.
+
+    Card lookups mirror CardRegistry (get, find_by_last4, get_by_last4), so a
+    repository can stand in for a registry in the front ends. The database
+    must be a file: every pooled connection opens it separately.
+    """
+    def __init__(self, path: str, pool_size: int = 4, balance_cache_size: int = 4096, write_batch: int = 1,
+                 account_cache_size: int = 100_000, cache_policy: str = "lru", flush_interval: float | None = None,
+                 metrics: MetricsRegistry | None = None):
+        self.path = path
+        self.pool = ConnectionPool(path, pool_size)
+        self.balance_cache_size = balance_cache_size
+        self.write_batch = write_batch
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.account_cache = WriteBackCache(
+            self._load_account, self._write_balances, capacity=account_cache_size, policy=cache_policy,
+            flush_interval=flush_interval, on_evict=self._account_evicted, metrics=metrics, name="account_cache",
+            stale_state=lambda account: account.balance_cents,
+        )
+        self._cards: dict[str, Card] = {}
+        self._card_numbers: dict[str, list[str]] = {}  # account number -> cached card numbers
+        self._balances: OrderedDict[str, int] = OrderedDict()
+        self._lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        self.accounts = _AccountIndex(self)
+        with self.pool.connection() as conn:
+            with conn:
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+        self.account_cache.start()
+
+    def __enter__(self) -> "SQLiteRepository":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self.pool.connection() as conn:
+            return conn.execute(_COUNT_CARDS).fetchone()[0]
+
+    def __iter__(self) -> Iterator[Card]:
+        with self.pool.connection() as conn:
+            numbers = [row[0] for row in conn.execute(_SELECT_CARD_NUMBERS)]
+        return (self.get(number) for number in numbers)
+
+    def close(self) -> None:
+        self.detach()
+        self.account_cache.stop()
+        self.pool.close()
+
+    def account_count(self) -> int:
+        with self.pool.connection() as conn:
+            return conn.execute(_COUNT_ACCOUNTS).fetchone()[0]
+
+    def materialized(self) -> tuple[int, int]:
+        """Number of (accounts, cards) turned into objects so far."""
+        return len(self.account_cache), len(self._cards)
+
+    # --- writes ---
+
+    def save_accounts(self, accounts: Iterable[AccountManager]) -> int:
+        """
+        Inserts or updates accounts in one transaction and returns how many were written.
+
+        The saved objects join the account cache, so their later operations
+        are persisted once the repository is attached.
+
+        Raises:
+            ValueError: If an account's class has no registered account type.
+        """
+        accounts = list(accounts)
+        rows = [_account_row(account) for account in accounts]
+        with self.pool.connection() as conn:
+            with conn:
+                conn.executemany(_UPSERT_ACCOUNT, rows)
+        for account in accounts:
+            self.account_cache.put(account.account_number, account)
+        self._invalidate(account.account_number for account in accounts)
+        return len(rows)
+
+    def save_cards(self, cards: Iterable[Card]) -> int:
+        """Inserts or updates cards (and their linked accounts) in one transaction."""
+        cards = list(cards)
+        accounts = {}
+        for card in cards:
+            account = card.get_account()
+            accounts.setdefault(account.account_number, account)
+        account_rows = [_account_row(account) for account in accounts.values()]
+        card_rows = []
+        for card in cards:
+            number = normalize_card_number(card.get_card_number())
+            card_rows.append((number, card.card_type(), card.get_pin_hash(),
+                              card.get_account().account_number, number[-4:]))
+        with self.pool.connection() as conn:
+            with conn:
+                conn.executemany(_UPSERT_ACCOUNT, account_rows)
+                conn.executemany(_UPSERT_CARD, card_rows)
+        for number, account in accounts.items():
+            self.account_cache.put(number, account)
+        for card, row in zip(cards, card_rows):
+            self._cache_card(row[0], row[3], card)
+        self._invalidate(accounts)
+        return len(card_rows)
+
+    def attach(self) -> None:
+        """Starts persisting every AccountManager operation on accounts of this repository."""
+        AccountManager.add_listener(self.record)
+
+    def detach(self) -> None:
+        AccountManager.remove_listener(self.record)
+
+    def record(self, account: AccountManager, operation: str, amount, result: TransactionResult) -> None:
+        """AccountManager listener: marks cached accounts dirty after accepted operations."""
+        if not result.ok:
+            return
+        cache = self.account_cache
+        number = account.account_number
+        if not cache.mark_dirty(number, account):
+            stale = cache.stale(account)
+            if stale is not None:
+                self._reapply(number, account, stale[1])
+            else:
+                current = cache.peek(number)
+                if current is not None and current is not account:
+                    return  # another object holds this account number; not ours to write
+                # Evicted while a session still held it: take it back with its change
+                cache.put(number, account, dirty=True)
+        if cache.dirty_count >= self.write_batch:
+            self.flush()
+
+    def _reapply(self, number: str, account: AccountManager, baseline_cents: int) -> None:
+        """
+        Applies an operation made on an invalidated account to a fresh copy of it.
+
+        The session that held the old object keeps it; only its change since
+        the invalidation (or the previous re-apply) is added to the balance
+        read from the database, so the external update is not overwritten.
+        The old object is then brought up to date.
+        """
+        fresh = self.account_cache.get(number)
+        if fresh is None:
+            return  # deleted elsewhere
+        fresh.balance_cents += account.balance_cents - baseline_cents
+        self.account_cache.mark_dirty(number, fresh)
+        account.balance_cents = fresh.balance_cents
+        self.account_cache.retire(number, account)
+
+    def flush(self) -> int:
+        """Writes every dirty balance in one transaction and returns how many accounts were written."""
+        return self.account_cache.flush()
+
+    def invalidate(self, account_numbers: Iterable[str] | None = None) -> None:
+        """
+        Forgets cached accounts (all if None) after the database was changed elsewhere.
+
+        Their unflushed changes are discarded and the next access reloads them.
+        Operations later made on the old objects (held by sessions through
+        their cards) are re-applied as deltas on the reloaded accounts.
+        """
+        if account_numbers is not None:
+            account_numbers = list(account_numbers)
+        self.account_cache.invalidate(account_numbers)
+        if account_numbers is None:
+            with self._cache_lock:
+                self._balances.clear()
+        else:
+            self._invalidate(account_numbers)
+
+    def _write_balances(self, accounts: dict[str, AccountManager]) -> None:
+        rows = [(account.balance_cents, number) for number, account in accounts.items()]
+        with self.pool.connection() as conn:
+            with conn:
+                conn.executemany(_UPDATE_BALANCE, rows)
+
+    # --- accounts ---
+
+    def get_account(self, account_number: str) -> AccountManager | None:
+        return self.account_cache.get(account_number)
+
+    def _load_account(self, account_number: str) -> AccountManager | None:
+        with self.pool.connection() as conn:
+            row = conn.execute(_SELECT_ACCOUNT, (account_number,)).fetchone()
+        if row is None:
+            return None
+        account_type, holder, balance, limit, rate = row
+        kwargs = {
+            "account_holder": holder,
+            "account_number": account_number,
+            "balance": Money.from_cents(balance),
+        }
+        if account_type == "credit":
+            kwargs.update(credit_limit=Money.from_cents(limit), interest_rate=rate)
+        return AccountFactory.create_account(account_type, **kwargs)
+
+    def _account_evicted(self, account_number: str, account: AccountManager) -> None:
+        # Cards hold their account: drop them too, so a later lookup links the reloaded object
+        with self._lock:
+            for card_number in self._card_numbers.pop(account_number, ()):
+                self._cards.pop(card_number, None)
+        self._cache_balance(account_number, account.balance_cents)
+
+    def get_balance(self, account_number: str) -> Money | None:
+        """
+        Current balance of an account, or None if it does not exist.
+
+        Cached accounts answer from memory; other accounts are read through
+        the balance cache.
+        """
+        account = self.account_cache.peek(account_number)
+        if account is not None:
+            return Money.from_cents(account.balance_cents)
+        with self._cache_lock:
+            cents = self._balances.get(account_number)
+            if cents is not None:
+                self._balances.move_to_end(account_number)
+                self.cache_hits += 1
+                return Money.from_cents(cents)
+            self.cache_misses += 1
+        with self.pool.connection() as conn:
+            row = conn.execute(_SELECT_BALANCE, (account_number,)).fetchone()
+        if row is None:
+            return None
+        self._cache_balance(account_number, row[0])
+        return Money.from_cents(row[0])
+
+    def _cache_balance(self, account_number: str, cents: int) -> None:
+        if self.balance_cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._balances[account_number] = cents
+            self._balances.move_to_end(account_number)
+            if len(self._balances) > self.balance_cache_size:
+                self._balances.popitem(last=False)
+
+    def _invalidate(self, account_numbers: Iterable[str]) -> None:
+        with self._cache_lock:
+            for number in account_numbers:
+                self._balances.pop(number, None)
+
+    # --- cards ---
+
+    def get(self, card_number: str) -> Card | None:
+        number = normalize_card_number(card_number)
+        card = self._cards.get(number)
+        if card is not None:
+            return card
+        with self.pool.connection() as conn:
+            row = conn.execute(_SELECT_CARD, (number,)).fetchone()
+        if row is None:
+            return None
+        card_type, pin_hash, account_number = row
+        account = self.get_account(account_number)
+        card = CardFactory.create_card(card_type, card_number=number, pin_hash=pin_hash, linked_account=account)
+        return self._cache_card(number, account_number, card)
+
+    def _cache_card(self, number: str, account_number: str, card: Card) -> Card:
+        """Caches card unless one is already cached for number, and returns the cached one."""
+        with self._lock:
+            cached = self._cards.get(number)
+            if cached is not None:
+                return cached
+            self._cards[number] = card
+            self._card_numbers.setdefault(account_number, []).append(number)
+        return card
+
+    def find_by_last4(self, last4: str) -> tuple[Card, ...]:
+        with self.pool.connection() as conn:
+            numbers = [row[0] for row in conn.execute(_SELECT_CARDS_BY_LAST4, (last4,))]
+        return tuple(self.get(number) for number in numbers)
+
+    def get_by_last4(self, last4: str) -> Card | None:
+        """Same contract as CardRegistry.get_by_last4 (ValueError if ambiguous)."""
+        matches = self.find_by_last4(last4)
+        if len(matches) > 1:
+            raise ValueError(f"{len(matches)} cards end with {last4}; full card number required.")
+        return matches[0] if matches else None
@@ -0,0 +1,150 @@
+import json
+import math
+import os
+import threading
+import time
+
+from telemetry.metrics import MetricsRegistry
+
+_PREFIX = "atm_operation"
+
+
+def _le(bound: float) -> str:
+    return "+Inf" if math.isinf(bound) else repr(bound)
+
+
+def to_prometheus(metrics: MetricsRegistry) -> str:
+    """Prometheus text exposition: one latency histogram and a success/failure counter per operation."""
+    lines = [
+        f"# HELP {_PREFIX}_seconds Latency of ATM operations.",
+        f"# TYPE {_PREFIX}_seconds histogram",
+    ]
+    for op in metrics:
+        label = f'operation="{op.name}"'
+        for bound, total in zip(op.buckets + (math.inf,), op.cumulative_counts()):
+            lines.append(f'{_PREFIX}_seconds_bucket{{{label},le="{_le(bound)}"}} {total}')
+        lines.append(f"{_PREFIX}_seconds_sum{{{label}}} {op.sum_seconds!r}")
+        lines.append(f"{_PREFIX}_seconds_count{{{label}}} {op.count}")
+    lines += [
+        f"# HELP {_PREFIX}s_total ATM operations by outcome.",
+        f"# TYPE {_PREFIX}s_total counter",
+    ]
+    for op in metrics:
+        lines.append(f'{_PREFIX}s_total{{operation="{op.name}",outcome="success"}} {op.successes}')
+        lines.append(f'{_PREFIX}s_total{{operation="{op.name}",outcome="failure"}} {op.failures}')
+    return "\n".join(lines) + "\n"
+
+
+def to_json(metrics: MetricsRegistry) -> dict:
+    """JSON-friendly snapshot: counters, latency sum, approximate quantiles and cumulative buckets."""
+    operations = {}
+    for op in metrics:
+        operations[op.name] = {
+            "count": op.count,
+            "success": op.successes,
+            "failure": op.failures,
+            "sum_seconds": op.sum_seconds,
+            "p50_seconds": op.quantile(0.5),
+            "p90_seconds": op.quantile(0.9),
+            "p99_seconds": op.quantile(0.99),
+            "buckets": {_le(b): total for b, total in zip(op.buckets + (math.inf,), op.cumulative_counts())},
+        }
+    return {"timestamp": time.time(), "operations": operations}
+
+
+def write_metrics(path: str, metrics: MetricsRegistry) -> None:
+    """
+    Dumps the metrics to a file: JSON if the path ends in .json,
+    Prometheus text otherwise. Written to a temporary name and renamed, so
+    a scraper reading the file never sees a partial dump.
+    """
+    if path.endswith(".json"):
+        text = json.dumps(to_json(metrics), indent=2)
+    else:
+        text = to_prometheus(metrics)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+class MetricsServer:
+    """
+    Serves the metrics over HTTP on a background thread:
+    /metrics (Prometheus text) and /metrics.json (JSON snapshot).
+    """
+    def __init__(self, metrics: MetricsRegistry, host: str = "127.0.0.1", port: int = 0):
+        # http.server pulls in email/http.client: only loaded when metrics are actually served
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, content_type = to_prometheus(registry).encode(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, content_type = json.dumps(to_json(registry)).encode(), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self.host, self.port = self._httpd.server_address[:2]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="metrics-server", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+class MetricsReporter:
+    """
+    Front-end helper: enables the instrumentation and reports it to a file
+    and/or over HTTP.
+
+    The file is rewritten every interval seconds (if given) and once more on
+    stop(), which also disables the instrumentation again.
+    """
+    def __init__(self, instrumentation, path: str | None = None, port: int | None = None,
+                 host: str = "127.0.0.1", interval: float | None = None):
+        self.instrumentation = instrumentation
+        self.path = path
+        self.interval = interval
+        self.server = MetricsServer(instrumentation.metrics, host, port) if port is not None else None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        self.instrumentation.enable()
+        if self.server is not None:
+            self.server.start()
+        if self.path and self.interval:
+            self._thread = threading.Thread(target=self._run, name="metrics-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self.server is not None:
+            self.server.stop()
+        if self.path:
+            write_metrics(self.path, self.instrumentation.metrics)
+        self.instrumentation.disable()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            write_metrics(self.path, self.instrumentation.metrics)
@@ -0,0 +1,120 @@
+import functools
+import threading
+import time
+from typing import Any, Callable
+
+from telemetry.metrics import MetricsRegistry
+
+
+def _result_ok(result) -> bool:
+    return result.ok
+
+
+def _truthy(result) -> bool:
+    return bool(result)
+
+
+def _found(result) -> bool:
+    return result is not None
+
+
+class Instrumentation:
+    """
+    Runtime-switchable timing of hot-path methods.
+
+    enable() swaps each target method on its class for a wrapper that times
+    the call and records it in metrics; disable() puts the original
+    function back. While disabled the classes hold their original methods,
+    so the cost is exactly zero, and toggling affects every existing
+    instance. A call that raises counts as a failure and re-raises.
+    """
+    def __init__(self, metrics: MetricsRegistry | None = None, clock: Callable[[], float] = time.perf_counter,
+                 default_targets: Callable[["Instrumentation"], None] | None = None):
+        self.metrics = metrics or MetricsRegistry()
+        self._clock = clock
+        # Called once on the first enable(), so importing telemetry does not import the domain classes
+        self._default_targets = default_targets
+        self._targets: list[tuple[type, str, str, Callable[[Any], bool]]] = []
+        self._originals: list[tuple[type, str, Callable]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._originals)
+
+    def add_target(self, owner: type, attr: str, operation: str | None = None,
+                   succeeded: Callable[[Any], bool] = _truthy) -> None:
+        """
+        Registers a method to time while enabled.
+
+        Args:
+            owner: Class that defines the method in its own __dict__.
+            attr: Method name.
+            operation: Metric name (defaults to attr); several targets may
+                       share one name, e.g. withdraw on every account class.
+            succeeded: Maps the return value to success/failure.
+        """
+        if attr not in vars(owner):
+            raise ValueError(f"{owner.__name__} does not define {attr}")
+        with self._lock:
+            if any(o is owner and a == attr for o, a, _, _ in self._targets):
+                return
+            self._targets.append((owner, attr, operation or attr, succeeded))
+            if self._originals:
+                self._patch(owner, attr, operation or attr, succeeded)
+
+    def enable(self) -> None:
+        if self._default_targets is not None:
+            add_defaults, self._default_targets = self._default_targets, None
+            add_defaults(self)
+        with self._lock:
+            if self._originals:
+                return
+            for owner, attr, operation, succeeded in self._targets:
+                self._patch(owner, attr, operation, succeeded)
+
+    def disable(self) -> None:
+        with self._lock:
+            for owner, attr, original in reversed(self._originals):
+                setattr(owner, attr, original)
+            self._originals = []
+
+    def _patch(self, owner: type, attr: str, operation: str, succeeded: Callable[[Any], bool]) -> None:
+        original = vars(owner)[attr]
+        observe = self.metrics.operation(operation).observe
+        clock = self._clock
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                result = original(*args, **kwargs)
+            except Exception:
+                observe(clock() - start, False)
+                raise
+            observe(clock() - start, succeeded(result))
+            return result
+
+        self._originals.append((owner, attr, original))
+        setattr(owner, attr, timed)
+
+
+def _add_default_targets(instrumentation: Instrumentation) -> None:
+    from accounts.checking_account import CheckingAccount
+    from accounts.credit_account import CreditAccount
+    from accounts.savings_account import SavingsAccount
+    from cards.card import Card
+    from cards.registry import CardRegistry
+    from storage.snapshot import SnapshotBook
+
+    for cls in (SavingsAccount, CheckingAccount, CreditAccount):
+        instrumentation.add_target(cls, "withdraw", succeeded=_result_ok)
+        instrumentation.add_target(cls, "deposit", succeeded=_result_ok)
+    instrumentation.add_target(Card, "validate_pin")
+    for cls in (CardRegistry, SnapshotBook):
+        instrumentation.add_target(cls, "get_by_last4", "get_card_by_last4", _found)
+        instrumentation.add_target(cls, "get", "get_card", _found)
+
+
+# Shared instance covering withdraw, deposit, validate_pin and the card lookups.
+instrumentation = Instrumentation(default_targets=_add_default_targets)
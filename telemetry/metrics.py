@@ -0,0 +1,93 @@
+import threading
+from bisect import bisect_left
+
+# Upper bounds in seconds: 1, 2.5, 5 per decade from 1 µs to 10 s (Prometheus 'le' buckets).
+DEFAULT_BUCKETS = tuple(float(f"{m}e{e}") for e in range(-6, 1) for m in (1, 2.5, 5)) + (10.0,)
+
+
+class OperationMetrics:
+    """
+    Latency histogram plus success/failure counters for one operation.
+
+    Observations go into fixed buckets, so recording is a bisect and a few
+    increments under a lock, and memory does not grow with traffic.
+    """
+    def __init__(self, name: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum_seconds = 0.0
+        self.successes = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        # Bound methods: cheaper than a with-block on the per-call path
+        self._acquire = self._lock.acquire
+        self._release = self._lock.release
+
+    @property
+    def count(self) -> int:
+        return self.successes + self.failures
+
+    def observe(self, seconds: float, ok: bool) -> None:
+        index = bisect_left(self.buckets, seconds)
+        self._acquire()
+        self._counts[index] += 1
+        self.sum_seconds += seconds
+        if ok:
+            self.successes += 1
+        else:
+            self.failures += 1
+        self._release()
+
+    def cumulative_counts(self) -> list[int]:
+        """Cumulative count per bucket, '+Inf' last (the Prometheus histogram layout)."""
+        with self._lock:
+            counts = list(self._counts)
+        total = 0
+        cumulative = []
+        for count in counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the q-quantile (None without observations)."""
+        cumulative = self.cumulative_counts()
+        if not cumulative[-1]:
+            return None
+        rank = q * cumulative[-1]
+        for bound, total in zip(self.buckets, cumulative):
+            if total >= rank:
+                return bound
+        return float("inf")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = [0] * (len(self.buckets) + 1)
+            self.sum_seconds = 0.0
+            self.successes = 0
+            self.failures = 0
+
+
+class MetricsRegistry:
+    """Named OperationMetrics, created on first use."""
+    def __init__(self):
+        self._operations: dict[str, OperationMetrics] = {}
+        self._lock = threading.Lock()
+
+    def __iter__(self):
+        return iter(sorted(self._operations.values(), key=lambda m: m.name))
+
+    def __len__(self) -> int:
+        return len(self._operations)
+
+    def operation(self, name: str) -> OperationMetrics:
+        metrics = self._operations.get(name)
+        if metrics is None:
+            with self._lock:
+                metrics = self._operations.setdefault(name, OperationMetrics(name))
+        return metrics
+
+    def reset(self) -> None:
+        for metrics in self._operations.values():
+            metrics.reset()
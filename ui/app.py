@@ -1,97 +1,215 @@
+import argparse
+import time
 import tkinter as tk
 from tkinter import messagebox
 
-# Importar tu lógica existente
-from accounts.factory import AccountFactory
-from cards.debit_card import DebitCard
-from cards.credit_card import CreditCard
-
-
-class Session:
-    """Mantiene el estado de la sesión actual de ATM."""
-    def __init__(self):
-        self.card = None
-        self.account = None
-        self.authenticated = False
-        self.pin_attempts = 0
-        self.max_attempts = 3
-
-    def reset(self):
-        self.card = None
-        self.account = None
-        self.authenticated = False
-        self.pin_attempts = 0
+# Importar tu lógica existente. Diario, instantáneas, métricas y datos demo
+# se importan al usarse para que el arranque del kiosco sea rápido.
+from accounts.account_manager import AccountManager
+from accounts.money import Money
+from accounts.result import Reason
+from cards.limits import WithdrawalLimits
+from cards.lockout import PinLockoutService
+from dispenser.cassettes import DEFAULT_CASSETTES, CassetteInventory
+from dispenser.dispenser import CashDispenser, describe_notes
+from fraud.detector import FraudDetector
+from telemetry.instrumentation import instrumentation
+from ui.flow import SessionFlow
+from ui.session import Session, State
+from ui.worker import FrameLatencyMonitor, UIWorker
+
+
+REASON_MESSAGES = {
+    Reason.INVALID_AMOUNT: "El monto debe ser mayor que 0.",
+    Reason.INSUFFICIENT_FUNDS: "Fondos insuficientes.",
+    Reason.NON_POSITIVE_BALANCE: "El saldo no genera intereses.",
+    Reason.LIMIT_EXCEEDED: "El monto supera su límite de retirada.",
+    Reason.CANNOT_DISPENSE: "El cajero no puede entregar ese monto con los billetes disponibles.",
+    Reason.SUSPECTED_FRAUD: "Operación bloqueada por seguridad. Contacte con su banco.",
+}
+
+
+MOVIMIENTOS = {
+    "deposit": "Depósito",
+    "withdraw": "Retiro",
+    "interest": "Intereses",
+    "repayment": "Amortización",
+}
+
+
+def log_transaction(account, operation, amount, result):
+    """Listener opcional que registra en consola cada operación de cuenta."""
+    estado = "OK" if result.ok else f"RECHAZADA ({result.reason.value})"
+    print(f"[{account.account_number}] {operation} {amount:.2f} -> {estado}, saldo {result.balance:.2f}")
 
 
 class ATMApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, transaction_listener=None, journal_path=None, snapshot_path=None,
+                 metrics_path=None, metrics_port=None, db_path=None, history_path=None, limits=None,
+                 cassettes=DEFAULT_CASSETTES, terminal="ATM-GUI", snapshot_interval=300.0):
         super().__init__()
         self.title("ATM - Simulador")
         self.geometry("420x560")
         self.resizable(False, False)
 
-        # Datos de ejemplo: crear cuentas y tarjetas usando tu modelo
-        self._seed_demo_data()
-
-        self.session = Session()
-
-        container = tk.Frame(self)
-        container.pack(fill="both", expand=True)
+        # Registro de métricas solo con --metrics/--metrics-port: sin él, ningún componente las recoge
+        registry = instrumentation.metrics if metrics_path or metrics_port is not None else None
 
+        # Datos de ejemplo: crear cuentas y tarjetas usando tu modelo
+        self.repository = None
+        if snapshot_path:
+            # Arranque rápido: las cuentas y tarjetas se materializan al primer acceso
+            from storage.snapshot import open_snapshot
+            from ui.demo_data import seed_demo_registry
+            self.card_registry = open_snapshot(snapshot_path, seed_demo_registry)
+        elif db_path:
+            # Cuentas y tarjetas en SQLite; una base vacía se inicializa con los datos demo.
+            # Los saldos modificados se escriben agrupados cada segundo (caché write-back).
+            from storage.sqlite_repository import SQLiteRepository
+            self.repository = SQLiteRepository(db_path, write_batch=256, flush_interval=1.0,
+                                               metrics=registry)
+            if len(self.repository) == 0:
+                from ui.demo_data import seed_demo_registry
+                self.repository.save_cards(seed_demo_registry())
+            self.card_registry = self.repository
+        else:
+            self._seed_demo_data()
+
+        # Diario de operaciones: se reaplica al arrancar y registra cada cambio de saldo
+        self.journal = None
+        if journal_path:
+            from storage.journal import TransactionJournal
+            if snapshot_path or db_path:
+                accounts = self.card_registry.accounts
+            else:
+                accounts = {c.get_account().account_number: c.get_account() for c in self.card_registry}
+            TransactionJournal.replay(journal_path, accounts)
+            self.journal = TransactionJournal(journal_path)
+            self.journal.attach()
+        # Instantáneas periódicas (y al salir); cada una vacía el diario
+        self.snapshotter = None
+        if snapshot_path:
+            from storage.snapshot import PeriodicSnapshotter
+            self.snapshotter = PeriodicSnapshotter(snapshot_path, self.card_registry,
+                                                   snapshot_interval, self.journal)
+            self.snapshotter.start()
+        if self.repository is not None:
+            self.repository.attach()
+
+        # Movimientos por cuenta para la pantalla "Movimientos" (los antiguos, en disco si se indica fichero)
+        from storage.history import TransactionHistory
+        self.history = TransactionHistory(history_path)
+        self.history.attach()
+
+        # Métricas de las operaciones (latencia y éxito/fallo); sin coste si no se activan
+        self.metrics = None
+        if registry is not None:
+            from telemetry.export import MetricsReporter
+            self.metrics = MetricsReporter(instrumentation, metrics_path, metrics_port, interval=10.0)
+            self.metrics.start()
+
+        self._transaction_listener = transaction_listener
+        if transaction_listener is not None:
+            AccountManager.add_listener(transaction_listener)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+        # Las operaciones de dominio corren en un hilo de fondo para no congelar la pantalla
+        self.worker = UIWorker(self.after, report=self.report_callback_exception)
+        self.frame_monitor = FrameLatencyMonitor(
+            self.after, metrics=registry.operation("ui_frame_lag") if registry is not None else None)
+        self.frame_monitor.start()
+
+        self.session = Session(terminal=terminal)
+        # Bloqueos por número de tarjeta: 3 fallos bloquean la tarjeta 30 s
+        self.lockouts = PinLockoutService(max_attempts=3, lockout_seconds=30)
+        # Límites de retirada por tarjeta y cuenta (ventanas deslizantes de 1 h y 24 h)
+        self.limits = limits if limits is not None else WithdrawalLimits(card_daily=600)
+        # Casetes de billetes del terminal: un monto que no se puede entregar no llega a cobrarse
+        self.dispenser = CashDispenser(CassetteInventory.from_spec(cassettes))
+        # Detector de fraude alimentado con cada intento de PIN y cada retirada de este terminal
+        self.fraud = FraudDetector(metrics=registry)
+        # Flujo tarjeta -> PIN -> menú -> monto -> comprobante; las pantallas solo lo muestran
+        self.flow = SessionFlow(self.card_registry, self.lockouts, self.limits, self.fraud, self.dispenser)
+
+        self._container = tk.Frame(self)
+        self._container.pack(fill="both", expand=True)
+
+        # Las pantallas se construyen la primera vez que se muestran (ver get_frame)
         self.frames = {}
-        for F in (WelcomeScreen, CardInsertScreen, PinScreen, MenuScreen, AmountScreen, ReceiptScreen):
-            frame = F(parent=container, controller=self)
-            self.frames[F.__name__] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
-
         self.show_frame("WelcomeScreen")
 
     def _seed_demo_data(self):
-        # Crear cuentas de ejemplo con la factory si existe
-        # Crear una factory; si tu AccountFactory requiere un manager concreto,
-        # asume su propia configuración interna.
-        factory = AccountFactory()
-        # Cuentas
-        # Ajustar a las firmas reales de tus cuentas
-        # Checking/Savings: (account_holder: str, account_number: str, balance: float = 0.0)
-        checking = factory.create_account(
-            "checking",
-            account_holder="Alice",
-            account_number="CHK-001",
-            balance=1000.0,
-        )
-        savings = factory.create_account(
-            "savings",
-            account_holder="Bob",
-            account_number="SAV-001",
-            balance=2500.0,
-        )
-        # Credit: (account_holder: str, account_number: str, credit_limit: float, interest_rate: float, balance: float = 0.0)
-        credit = factory.create_account(
-            "credit",
-            account_holder="Carlos",
-            account_number="CRD-001",
-            credit_limit=1500.0,
-            interest_rate=20.0,
-            balance=0.0,
-        )
-
-        # Tarjetas asociadas
-        self.demo_cards = [
-            DebitCard(card_number="1111222233334444", pin="1234", linked_account=checking),
-            DebitCard(card_number="5555666677778888", pin="4321", linked_account=savings),
-            CreditCard(card_number="9999000011112222", pin="2468", linked_account=credit),
-        ]
+        # Cuentas y tarjetas de ejemplo creadas con las factories
+        from ui.demo_data import seed_demo_registry
+        self.card_registry = seed_demo_registry()
+
+    def _on_close(self):
+        self.frame_monitor.stop()
+        # La operación en curso termina antes de cerrar diario, instantánea y base de datos:
+        # un retiro cobrado después no quedaría guardado
+        self.worker.shutdown(wait=True)
+        if self._transaction_listener is not None:
+            AccountManager.remove_listener(self._transaction_listener)
+        if self.journal is not None:
+            self.journal.detach()
+        if self.snapshotter is not None:
+            self.snapshotter.stop()
+        if self.journal is not None:
+            self.journal.close()
+        self.history.detach()
+        self.history.close()
+        if self.repository is not None:
+            self.repository.close()
+        if self.metrics is not None:
+            self.metrics.stop()
+        self.destroy()
+
+    def get_frame(self, name):
+        """Devuelve la pantalla indicada, construyéndola en el primer acceso."""
+        frame = self.frames.get(name)
+        if frame is None:
+            frame = SCREENS[name](parent=self._container, controller=self)
+            frame.grid(row=0, column=0, sticky="nsew")
+            self.frames[name] = frame
+        return frame
 
     def show_frame(self, name):
-        frame = self.frames[name]
-        frame.tkraise()
+        self.get_frame(name).tkraise()
+
+    def run_in_background(self, screen: "BusyFrame", fn, *args, on_done, on_error=None):
+        """Ejecuta fn(*args) en el hilo de fondo con la pantalla en estado ocupado; on_done recibe el resultado en el hilo de Tk."""
+        def done(result):
+            screen.set_busy(False)
+            on_done(result)
+
+        def failed(error):
+            screen.set_busy(False)
+            if on_error is not None:
+                on_error(error)
+            else:
+                messagebox.showerror("Operación", f"No se pudo completar: {error}")
+
+        screen.set_busy(True)
+        self.worker.submit(fn, *args, on_done=done, on_error=failed)
+
+
+class BusyFrame(tk.Frame):
+    """Pantalla que puede bloquearse mientras una operación corre en segundo plano."""
+    _busy_label = None
 
-    def get_card_by_last4(self, last4: str):
-        for c in self.demo_cards:
-            if c._card_number.endswith(last4):
-                return c
-        return None
+    def set_busy(self, busy: bool):
+        if self._busy_label is None:
+            self._busy_label = tk.Label(self, text="", font=("Arial", 12), fg="#555")
+            self._busy_label.pack(side="bottom", pady=8)
+        self._busy_label.config(text="Procesando..." if busy else "")
+        self.config(cursor="watch" if busy else "")
+        state = "disabled" if busy else "normal"
+        pending = list(self.winfo_children())
+        while pending:
+            widget = pending.pop()
+            if isinstance(widget, tk.Button):
+                widget.config(state=state)
+            pending.extend(widget.winfo_children())
 
 
 class WelcomeScreen(tk.Frame):
@@ -123,16 +241,18 @@ class CardInsertScreen(tk.Frame):
         tk.Label(self, text="Tarjetas demo: 4444, 8888, 2222", font=("Arial", 10), fg="#555").pack(pady=6)
 
     def continue_next(self):
-        last4 = self.entry.get().strip()
-        card = self.controller.get_card_by_last4(last4)
-        if not card:
+        step = self.controller.flow.insert_card(self.controller.session, self.entry.get())
+        if step.error == "CARD_AMBIGUOUS":
+            messagebox.showerror("Tarjeta", "Varias tarjetas terminan en esos dígitos. Ingrese el número completo.")
+        elif step.error == "CARD_NOT_FOUND":
             messagebox.showerror("Tarjeta", "No se encontró una tarjeta con esos dígitos.")
-            return
-        self.controller.session.card = card
-        self.controller.show_frame("PinScreen")
+        elif step.error == "CARD_BLOCKED":
+            messagebox.showerror("Tarjeta", f"Tarjeta bloqueada temporalmente. Inténtelo en {step.remaining} s.")
+        else:
+            self.controller.show_frame("PinScreen")
 
 
-class PinScreen(tk.Frame):
+class PinScreen(BusyFrame):
     def __init__(self, parent, controller: ATMApp):
         super().__init__(parent)
         self.controller = controller
@@ -168,42 +288,40 @@ class PinScreen(tk.Frame):
 
     def _validate(self):
         pin = self.pin_var.get()
-        card = self.controller.session.card
-        if not card:
+        session = self.controller.session
+        if session.state is not State.PIN:
             messagebox.showerror("Error", "No hay tarjeta seleccionada.")
             return
-        if card.validate_pin(pin):
-            self.controller.session.authenticated = True
-            self.controller.session.account = card.get_account()
-            self.controller.session.pin_attempts = 0
-            self.pin_var.set("")
+        if not self.controller.flow.pin_needed(session):
+            # Tarjeta bloqueada: el flujo la expulsa sin pasar por el KDF
+            self._on_pin_checked(pin, False)
+            return
+        # El KDF del PIN es deliberadamente lento: se verifica fuera del hilo de Tk y el
+        # resultado se aplica al flujo (bloqueos, detector de fraude) ya en el hilo de Tk
+        self.controller.run_in_background(
+            self, self.controller.flow.verify_pin, session, pin,
+            on_done=lambda valid: self._on_pin_checked(pin, valid),
+        )
+
+    def _on_pin_checked(self, pin: str, valid: bool):
+        step = self.controller.flow.enter_pin(self.controller.session, pin, verified=valid)
+        self.pin_var.set("")
+        if step.ok:
             self.controller.show_frame("MenuScreen")
+        elif step.error == "PIN_INVALID":
+            messagebox.showerror("PIN", f"PIN incorrecto. Intentos restantes: {step.remaining}.")
         else:
-            sess = self.controller.session
-            sess.pin_attempts += 1
-            remaining = max(sess.max_attempts - sess.pin_attempts, 0)
-            if sess.pin_attempts >= sess.max_attempts:
-                messagebox.showerror(
-                    "PIN",
-                    "Tarjeta bloqueada por intentos fallidos (3). Regresando al inicio.",
-                )
-                self.pin_var.set("")
-                self.controller.session.reset()
-                self.controller.show_frame("WelcomeScreen")
-            else:
-                messagebox.showerror(
-                    "PIN",
-                    f"PIN incorrecto. Intentos restantes: {remaining}.",
-                )
-                self.pin_var.set("")
+            if step.error == "CARD_BLOCKED":
+                messagebox.showerror("PIN", f"Tarjeta bloqueada temporalmente ({step.remaining} s). Regresando al inicio.")
+            self.controller.show_frame("WelcomeScreen")
 
     def cancel(self):
-        self.controller.session.reset()
+        self.controller.flow.end(self.controller.session)
         self.pin_var.set("")
         self.controller.show_frame("WelcomeScreen")
 
 
-class MenuScreen(tk.Frame):
+class MenuScreen(BusyFrame):
     def __init__(self, parent, controller: ATMApp):
         super().__init__(parent)
         self.controller = controller
@@ -216,11 +334,12 @@ class MenuScreen(tk.Frame):
         tk.Button(btn_frame, text="Retirar", font=("Arial", 16), width=16, command=lambda: self.goto_amount('withdraw')).grid(row=0, column=1, padx=8, pady=8)
         tk.Button(btn_frame, text="Depositar", font=("Arial", 16), width=16, command=lambda: self.goto_amount('deposit')).grid(row=1, column=0, padx=8, pady=8)
         tk.Button(btn_frame, text="Salir", font=("Arial", 16), width=16, command=self.exit_session).grid(row=1, column=1, padx=8, pady=8)
+        tk.Button(btn_frame, text="Movimientos", font=("Arial", 16), width=16, command=self.show_history).grid(row=2, column=0, padx=8, pady=8)
 
     def _require_session(self):
-        if not (self.controller.session.authenticated and self.controller.session.account):
+        if not self.controller.session.authenticated:
             messagebox.showerror("Sesión", "Sesión no válida. Regresando al inicio.")
-            self.controller.session.reset()
+            self.controller.flow.end(self.controller.session)
             self.controller.show_frame("WelcomeScreen")
             return False
         return True
@@ -228,28 +347,36 @@ class MenuScreen(tk.Frame):
     def show_balance(self):
         if not self._require_session():
             return
-        acc = self.controller.session.account
-        try:
-            balance = acc.get_balance()
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo obtener el saldo: {e}")
-            return
-        self.controller.frames["ReceiptScreen"].set_message(f"Saldo disponible: ${balance:.2f}")
+        # El saldo puede leerse de la base de datos: fuera del hilo de Tk
+        self.controller.run_in_background(
+            self, self.controller.flow.select, self.controller.session, "balance", on_done=self._on_balance,
+            on_error=lambda e: messagebox.showerror("Error", f"No se pudo obtener el saldo: {e}"),
+        )
+
+    def _on_balance(self, step):
+        self.controller.get_frame("ReceiptScreen").set_message(f"Saldo disponible: ${step.balance:.2f}")
         self.controller.show_frame("ReceiptScreen")
 
+    def show_history(self):
+        if not self._require_session():
+            return
+        self.controller.get_frame("HistoryScreen").load_first_page()
+        self.controller.show_frame("HistoryScreen")
+
     def goto_amount(self, op):
         if not self._require_session():
             return
-        amount_screen = self.controller.frames["AmountScreen"]
+        self.controller.flow.select(self.controller.session, op)
+        amount_screen = self.controller.get_frame("AmountScreen")
         amount_screen.set_mode(op)
         self.controller.show_frame("AmountScreen")
 
     def exit_session(self):
-        self.controller.session.reset()
+        self.controller.flow.end(self.controller.session)
         self.controller.show_frame("WelcomeScreen")
 
 
-class AmountScreen(tk.Frame):
+class AmountScreen(BusyFrame):
     def __init__(self, parent, controller: ATMApp):
         super().__init__(parent)
         self.controller = controller
@@ -274,7 +401,11 @@ class AmountScreen(tk.Frame):
             cmd = (lambda x=b: self.on_key(x))
             tk.Button(keypad, text=b, font=("Arial", 18), width=5, height=2, command=cmd).grid(row=i//3, column=i%3, padx=6, pady=6)
 
-        tk.Button(self, text="Cancelar", font=("Arial", 14), command=lambda: controller.show_frame("MenuScreen")).pack(pady=6)
+        tk.Button(self, text="Cancelar", font=("Arial", 14), command=self.cancel).pack(pady=6)
+
+    def cancel(self):
+        self.controller.flow.back(self.controller.session)
+        self.controller.show_frame("MenuScreen")
 
     def set_mode(self, mode: str):
         self.mode = mode
@@ -300,28 +431,36 @@ class AmountScreen(tk.Frame):
             messagebox.showwarning("Monto", "Ingrese un monto válido.")
             return
         try:
-            amount = float(txt)
+            amount = Money(txt)
         except ValueError:
             messagebox.showerror("Monto", "Formato de monto inválido.")
             return
         if amount <= 0:
             messagebox.showerror("Monto", "El monto debe ser mayor que 0.")
             return
+        # En una retirada el cajero comprueba antes que puede entregar el monto; después el detector
+        # de fraude puntúa la tarjeta y el límite se comprueba y se descuenta junto con la retirada
+        self.controller.run_in_background(
+            self, self.controller.flow.enter_amount, self.controller.session, amount,
+            on_done=lambda step: self._on_result(amount, step),
+        )
 
-        acc = self.controller.session.account
-        result_msg = ""
-        try:
-            if self.mode == 'withdraw':
-                acc.withdraw(amount)
-                result_msg = f"Retiro exitoso: ${amount:.2f}. Saldo: ${acc.get_balance():.2f}"
-            else:
-                acc.deposit(amount)
-                result_msg = f"Depósito exitoso: ${amount:.2f}. Saldo: ${acc.get_balance():.2f}"
-        except Exception as e:
-            messagebox.showerror("Operación", f"No se pudo completar: {e}")
+    def _on_result(self, amount, step):
+        result = step.result
+        if not step.ok:
+            reason = result.reason if result is not None else None
+            message = REASON_MESSAGES.get(reason, "No se pudo completar.")
+            if reason is Reason.CANNOT_DISPENSE:
+                billetes = ", ".join(f"${billete:.0f}" for billete in self.controller.dispenser.denominations())
+                message += f"\nBilletes disponibles: {billetes}"
+            messagebox.showerror("Operación", message)
             return
-
-        self.controller.frames["ReceiptScreen"].set_message(result_msg)
+        if self.mode == 'withdraw':
+            result_msg = (f"Retiro exitoso: ${amount:.2f}. Saldo: ${result.balance:.2f}\n"
+                          f"Billetes: {describe_notes(step.notes, currency='')}")
+        else:
+            result_msg = f"Depósito exitoso: ${amount:.2f}. Saldo: ${result.balance:.2f}"
+        self.controller.get_frame("ReceiptScreen").set_message(result_msg)
         self.controller.show_frame("ReceiptScreen")
 
 
@@ -331,19 +470,113 @@ class ReceiptScreen(tk.Frame):
         self.controller = controller
         self.msg_var = tk.StringVar(value="")
         tk.Label(self, textvariable=self.msg_var, font=("Arial", 16), wraplength=380, justify="center").pack(pady=40)
-        tk.Button(self, text="Volver al menú", font=("Arial", 14), command=lambda: controller.show_frame("MenuScreen")).pack(pady=10)
+        tk.Button(self, text="Volver al menú", font=("Arial", 14), command=self.back_to_menu).pack(pady=10)
         tk.Button(self, text="Finalizar", font=("Arial", 14), command=self.end_session).pack(pady=6)
 
     def set_message(self, msg: str):
         self.msg_var.set(msg)
 
+    def back_to_menu(self):
+        self.controller.flow.back(self.controller.session)
+        self.controller.show_frame("MenuScreen")
+
     def end_session(self):
-        self.controller.session.reset()
+        self.controller.flow.end(self.controller.session)
         self.controller.show_frame("WelcomeScreen")
 
 
-def main():
-    app = ATMApp()
+class HistoryScreen(BusyFrame):
+    """Últimos movimientos de la cuenta de la sesión, por páginas (más recientes primero)."""
+    PAGE_SIZE = 8
+
+    def __init__(self, parent, controller: ATMApp):
+        super().__init__(parent)
+        self.controller = controller
+        self._cursors = []  # cursor de cada página mostrada, para volver a las más recientes
+        self._next_cursor = None
+        tk.Label(self, text="Últimos movimientos", font=("Arial", 20, "bold")).pack(pady=16)
+
+        self.listbox = tk.Listbox(self, font=("Courier", 11), width=44, height=self.PAGE_SIZE, activestyle="none")
+        self.listbox.pack(pady=8)
+
+        nav = tk.Frame(self)
+        nav.pack(pady=6)
+        self.newer_btn = tk.Button(nav, text="< Recientes", font=("Arial", 14), width=12, command=self.newer_page)
+        self.newer_btn.grid(row=0, column=0, padx=6)
+        self.older_btn = tk.Button(nav, text="Anteriores >", font=("Arial", 14), width=12, command=self.older_page)
+        self.older_btn.grid(row=0, column=1, padx=6)
+        tk.Button(self, text="Volver al menú", font=("Arial", 14), command=lambda: controller.show_frame("MenuScreen")).pack(pady=10)
+
+    def load_first_page(self):
+        self._cursors = []
+        self._load(None)
+
+    def older_page(self):
+        if self._next_cursor is not None:
+            self._load(self._next_cursor)
+
+    def newer_page(self):
+        if len(self._cursors) > 1:
+            self._cursors.pop()
+            self._load(self._cursors.pop())
+
+    def _load(self, cursor):
+        # La página puede leerse del fichero de movimientos: fuera del hilo de Tk
+        account = self.controller.session.account
+        self._cursors.append(cursor)
+        self.controller.run_in_background(
+            self, self.controller.history.page, account.account_number, self.PAGE_SIZE, cursor,
+            on_done=self._show_page,
+        )
+
+    def _show_page(self, page):
+        entries, self._next_cursor = page
+        self.listbox.delete(0, "end")
+        if not entries:
+            self.listbox.insert("end", "No hay movimientos registrados.")
+        for entry in entries:
+            fecha = time.strftime("%d/%m %H:%M", time.localtime(entry.timestamp))
+            nombre = MOVIMIENTOS.get(entry.operation, entry.operation)
+            self.listbox.insert("end", f"{fecha} {nombre:<12} {Money.from_cents(entry.amount_cents):>9} "
+                                       f"{Money.from_cents(entry.balance_cents):>10}")
+        self.older_btn.config(state="normal" if self._next_cursor is not None else "disabled")
+        self.newer_btn.config(state="normal" if len(self._cursors) > 1 else "disabled")
+
+
+SCREENS = {
+    screen.__name__: screen
+    for screen in (WelcomeScreen, CardInsertScreen, PinScreen, MenuScreen, AmountScreen, ReceiptScreen, HistoryScreen)
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ATM - Simulador (GUI)")
+    parser.add_argument("--verbose", action="store_true", help="registra en consola cada operación realizada")
+    parser.add_argument("--journal", help="fichero de diario para recuperar y persistir los saldos")
+    parser.add_argument("--snapshot", help="instantánea de cuentas y tarjetas a cargar en lugar de los datos demo "
+                                           "(se crea con ellos si no existe y se reescribe periódicamente y al salir)")
+    parser.add_argument("--snapshot-interval", type=float, default=300.0,
+                        help="segundos entre instantáneas; cada una vacía el diario (--journal)")
+    parser.add_argument("--db", help="base de datos SQLite de cuentas y tarjetas (se crea con los datos demo)")
+    parser.add_argument("--history", help="fichero de movimientos por cuenta (sin él solo se guardan los recientes en memoria)")
+    parser.add_argument("--daily-limit", default="600", help="máximo retirable por tarjeta en 24 h ('0' sin límite)")
+    parser.add_argument("--hourly-limit", default="0", help="máximo retirable por tarjeta en 1 h ('0' sin límite)")
+    parser.add_argument("--account-daily-limit", default="0",
+                        help="máximo retirable por cuenta en 24 h entre todas sus tarjetas ('0' sin límite)")
+    parser.add_argument("--terminal", default="ATM-GUI", help="identificador de este cajero")
+    parser.add_argument("--cassettes", default=DEFAULT_CASSETTES,
+                        help="billetes cargados en el cajero, '<valor>x<billetes>' por casete (p. ej. '20x800,50x600')")
+    parser.add_argument("--metrics", help="fichero de métricas (.json o texto Prometheus), reescrito cada 10 s y al salir")
+    parser.add_argument("--metrics-port", type=int, help="sirve /metrics y /metrics.json por HTTP en este puerto")
+    args = parser.parse_args(argv)
+    listener = log_transaction if args.verbose else None
+    app = ATMApp(transaction_listener=listener, journal_path=args.journal, snapshot_path=args.snapshot,
+                 metrics_path=args.metrics, metrics_port=args.metrics_port, db_path=args.db,
+                 history_path=args.history,
+                 limits=WithdrawalLimits(card_hourly=Money(args.hourly_limit) or None,
+                                         card_daily=Money(args.daily_limit) or None,
+                                         account_daily=Money(args.account_daily_limit) or None),
+                 cassettes=args.cassettes, terminal=args.terminal, snapshot_interval=args.snapshot_interval)
     app.mainloop()
 
 
@@ -0,0 +1,164 @@
+"""
+Modo batch: aplica un fichero de transacciones (JSONL o CSV) en streaming.
+
+Cada registro indica la tarjeta ("card") o la cuenta ("account"), la
+operación ("op": deposit, withdraw o repayment) y el importe ("amount").
+El fichero se procesa registro a registro con una cadena de generadores,
+así que la memoria no depende del tamaño del fichero. Las transacciones
+rechazadas se escriben en un fichero JSONL con el motivo.
+
+Uso:
+    python -m ui.batch transacciones.jsonl --rejects rechazadas.jsonl
+    python -m ui.batch transacciones.csv --snapshot libro.snap --journal diario.wal
+
+Con --snapshot, la instantánea se reescribe cada --snapshot-interval
+segundos y al terminar, y cada reescritura vacía el diario.
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from typing import Callable, Iterable, Iterator
+
+from accounts.account_manager import AccountManager
+from accounts.money import Money
+from storage.journal import TransactionJournal
+from storage.snapshot import PeriodicSnapshotter, open_snapshot
+from ui.demo_data import seed_demo_registry
+
+# op del fichero -> método de la cuenta
+OPERATIONS = {"deposit": "deposit", "withdraw": "withdraw", "repayment": "make_repayment"}
+
+
+def read_records(path: str) -> Iterator[tuple[int, object]]:
+    """
+    Genera (número de línea, registro) desde un fichero .csv o JSONL.
+
+    Una línea JSONL que no se puede decodificar se genera tal cual (str),
+    para que apply_records la rechace como invalid_record.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            for line_no, row in enumerate(csv.DictReader(f), start=2):
+                yield line_no, row
+        else:
+            for line_no, line in enumerate(f, start=1):
+                if line.strip():
+                    try:
+                        yield line_no, json.loads(line)
+                    except json.JSONDecodeError:
+                        yield line_no, line.rstrip("\n")
+
+
+def apply_records(records: Iterable[tuple[int, object]],
+                  resolve: Callable[[dict], AccountManager | None]) -> Iterator[tuple[int, object, str | None]]:
+    """
+    Aplica cada registro y genera (línea, registro, motivo de rechazo o None).
+
+    Los motivos son los de TransactionResult (en minúsculas) o errores de
+    formato: invalid_record (no es un objeto JSON), unknown_account,
+    unknown_operation, unsupported_operation, invalid_amount.
+    """
+    for line_no, record in records:
+        if not isinstance(record, dict):
+            yield line_no, record, "invalid_record"
+            continue
+        account = resolve(record)
+        if account is None:
+            yield line_no, record, "unknown_account"
+            continue
+        method_name = OPERATIONS.get(str(record.get("op", "")).strip().lower())
+        if method_name is None:
+            yield line_no, record, "unknown_operation"
+            continue
+        # make_repayment sólo existe en cuentas de crédito
+        method = getattr(account, method_name, None)
+        if method is None:
+            yield line_no, record, "unsupported_operation"
+            continue
+        try:
+            amount = Money(record.get("amount", ""))
+        except (TypeError, ValueError, ArithmeticError):
+            yield line_no, record, "invalid_amount"
+            continue
+        result = method(amount)
+        yield line_no, record, None if result.ok else result.reason.value
+
+
+def make_resolver(cards, accounts) -> Callable[[dict], AccountManager | None]:
+    """Resuelve la cuenta de un registro por tarjeta (PAN completo) o número de cuenta."""
+    def resolve(record: dict) -> AccountManager | None:
+        card_number = record.get("card")
+        if card_number:
+            card = cards.get(str(card_number))
+            return card.get_account() if card is not None else None
+        account_number = record.get("account")
+        return accounts.get(str(account_number)) if account_number else None
+    return resolve
+
+
+def run(path: str, cards, accounts, rejects_path: str | None = None, out=sys.stdout) -> dict:
+    """Procesa el fichero completo y devuelve las estadísticas."""
+    stats = {"processed": 0, "accepted": 0, "rejected": 0}
+    rejects = open(rejects_path, "w", encoding="utf-8") if rejects_path else None
+    start = time.perf_counter()
+    try:
+        for line_no, record, reason in apply_records(read_records(path), make_resolver(cards, accounts)):
+            stats["processed"] += 1
+            if reason is None:
+                stats["accepted"] += 1
+                continue
+            stats["rejected"] += 1
+            if rejects is not None:
+                rejects.write(json.dumps({"line": line_no, "reason": reason, "record": record}) + "\n")
+    finally:
+        if rejects is not None:
+            rejects.close()
+    stats["seconds"] = time.perf_counter() - start
+    stats["per_second"] = stats["processed"] / stats["seconds"] if stats["seconds"] else 0.0
+    print(f"Procesadas {stats['processed']} transacciones en {stats['seconds']:.2f} s "
+          f"({stats['per_second']:,.0f}/s): {stats['accepted']} aceptadas, {stats['rejected']} rechazadas.", file=out)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aplica un fichero de transacciones en modo batch")
+    parser.add_argument("transactions", help="fichero .jsonl o .csv (card|account, op, amount)")
+    parser.add_argument("--rejects", help="fichero JSONL donde escribir las transacciones rechazadas")
+    parser.add_argument("--snapshot", help="instantánea de cuentas y tarjetas (por defecto, datos demo)")
+    parser.add_argument("--journal", help="diario donde persistir los cambios de saldo")
+    parser.add_argument("--snapshot-interval", type=float, default=300.0,
+                        help="segundos entre instantáneas de --snapshot; cada una vacía el diario")
+    args = parser.parse_args(argv)
+
+    if args.snapshot:
+        cards = open_snapshot(args.snapshot, seed_demo_registry)
+        accounts = cards.accounts
+    else:
+        cards = seed_demo_registry()
+        accounts = {c.get_account().account_number: c.get_account() for c in cards}
+
+    journal = None
+    if args.journal:
+        TransactionJournal.replay(args.journal, accounts)
+        journal = TransactionJournal(args.journal, commit_interval=0.05, max_batch=8192)
+        journal.attach()
+    snapshotter = None
+    if args.snapshot:
+        snapshotter = PeriodicSnapshotter(args.snapshot, cards, args.snapshot_interval, journal)
+        snapshotter.start()
+    try:
+        run(args.transactions, cards, accounts, args.rejects)
+    finally:
+        if journal is not None:
+            journal.detach()
+        if snapshotter is not None:
+            snapshotter.stop()
+        if journal is not None:
+            journal.close()
+
+
+if __name__ == "__main__":
+    main()
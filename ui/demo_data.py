@@ -0,0 +1,68 @@
+"""Datos de ejemplo compartidos por la GUI y el servidor de sesiones."""
+
+from accounts.factory import AccountFactory
+from cards.pin import PinHasher
+from cards.registry import CardRegistry
+
+
+def seed_demo_registry() -> CardRegistry:
+    """Crea las cuentas y tarjetas demo y devuelve el registro de tarjetas."""
+    factory = AccountFactory()
+    # Checking/Savings: (account_holder: str, account_number: str, balance: Money | float = 0)
+    checking = factory.create_account(
+        "checking",
+        account_holder="Alice",
+        account_number="CHK-001",
+        balance=1000.0,
+    )
+    savings = factory.create_account(
+        "savings",
+        account_holder="Bob",
+        account_number="SAV-001",
+        balance=2500.0,
+    )
+    # Credit: (account_holder: str, account_number: str, credit_limit: Money | float, interest_rate: float, balance: Money | float = 0)
+    credit = factory.create_account(
+        "credit",
+        account_holder="Carlos",
+        account_number="CRD-001",
+        credit_limit=1500.0,
+        interest_rate=20.0,
+        balance=0.0,
+    )
+
+    # Tarjetas asociadas, indexadas por número completo y últimos 4 dígitos
+    registry = CardRegistry()
+    registry.load([
+        {"card_type": "debit", "card_number": "1111222233334444", "pin": "1234", "linked_account": checking},
+        {"card_type": "debit", "card_number": "5555666677778888", "pin": "4321", "linked_account": savings},
+        {"card_type": "credit", "card_number": "9999000011112222", "pin": "2468", "linked_account": credit},
+    ])
+    return registry
+
+
+def synthetic_card_number(index: int) -> str:
+    return f"4{index:015d}"
+
+
+def build_synthetic_registry(num_cards: int, pin: str = "1234", balance=1000,
+                             kdf_iterations: int = 1_000) -> CardRegistry:
+    """Crea num_cards cuentas de ahorro con una tarjeta de débito cada una (para pruebas de carga).
+
+    Todas las tarjetas comparten un único hash de PIN de bajo coste para que
+    la carga no dependa del KDF.
+    """
+    pin_hash = PinHasher(kdf_iterations).hash(pin)
+    registry = CardRegistry()
+    registry.load(
+        {
+            "card_type": "debit",
+            "card_number": synthetic_card_number(i),
+            "pin_hash": pin_hash,
+            "linked_account": AccountFactory.create_account(
+                "savings", account_holder=f"Cliente {i}", account_number=f"SAV-{i:09d}", balance=balance,
+            ),
+        }
+        for i in range(num_cards)
+    )
+    return registry
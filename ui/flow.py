@@ -0,0 +1,212 @@
+"""
+Flujo de una sesión ATM sin pantalla: tarjeta -> PIN -> menú -> monto -> comprobante.
+
+La consola (main.py), la GUI (ui/app.py) y el servidor de sesiones
+(ui/server.py) recorren el mismo SessionFlow: cada uno traduce su entrada
+(input(), botones de Tk o líneas del protocolo) a eventos y el Step que
+devuelve cada evento a mensajes. Al no depender de Tk ni de la red, el
+flujo completo se puede reproducir a toda velocidad (ver ui/replay.py).
+
+Eventos y transiciones:
+
+    insert_card   cualquiera          -> PIN      (CARD si no se acepta la tarjeta)
+    enter_pin     PIN                 -> MENU     (PIN si es incorrecto, CARD si se bloquea)
+    select        MENU/AMOUNT/RECEIPT -> AMOUNT   ('withdraw', 'deposit') o RECEIPT ('balance')
+    enter_amount  AMOUNT              -> RECEIPT  (AMOUNT si se rechaza la operación)
+    back          AMOUNT/RECEIPT      -> MENU
+    end           cualquiera          -> CARD
+"""
+
+from functools import partial
+from typing import Callable, NamedTuple
+
+from accounts.money import Money
+from accounts.result import TransactionResult
+from cards.limits import WithdrawalLimits
+from cards.lockout import PinLockoutService
+from cards.registry import CardRegistry
+from dispenser.dispenser import CashDispenser, Notes
+from fraud.detector import FraudDetector
+from ui.session import Session, State
+
+# operaciones del menú que piden un monto
+AMOUNT_OPERATIONS = ("withdraw", "deposit")
+
+
+class Step(NamedTuple):
+    """Resultado de un evento: estado en el que queda la sesión y, si se rechazó, el código de error."""
+    state: State
+    error: str | None = None
+    result: TransactionResult | None = None
+    notes: Notes = ()
+    balance: Money | None = None
+    remaining: int = 0  # PIN_INVALID: intentos restantes; CARD_BLOCKED: segundos de bloqueo
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+Recorder = Callable[[Session, str, object, Step], None]  # (sesión, evento, argumento, step)
+
+
+class SessionFlow:
+    """
+    Máquina de estados de la sesión ATM, sin E/S.
+
+    El estado vive en la Session (state, operation, card, account), así que
+    un mismo SessionFlow atiende a todas las sesiones de un terminal o de un
+    servidor. Un evento que no corresponde al estado de la sesión se
+    rechaza sin cambiarla.
+
+    Los códigos de error son los del protocolo del servidor: CARD_NOT_FOUND,
+    CARD_AMBIGUOUS, CARD_BLOCKED, NO_CARD, PIN_INVALID, NOT_AUTHENTICATED,
+    UNKNOWN_OPERATION, NO_OPERATION, INVALID_AMOUNT o el nombre del Reason
+    de la operación rechazada.
+
+    Las retiradas pasan por el cajero (si hay dispenser), el detector de
+    fraude y los límites, en ese orden: lo que no se puede entregar no
+    llega a puntuarse ni a cobrarse.
+
+    recorder, si se indica, recibe (session, evento, argumento, step) tras
+    cada evento (ver ui.replay.TraceRecorder).
+
+    No es thread-safe: los eventos de una sesión no deben solaparse, e
+    insert_card() y enter_pin() deben llegar siempre del mismo hilo, el
+    dueño del PinLockoutService. verify_pin() no cambia nada y puede
+    ejecutarse en cualquier hilo; su resultado se pasa después a
+    enter_pin().
+    """
+    def __init__(self, registry: CardRegistry, lockouts: PinLockoutService | None = None,
+                 limits: WithdrawalLimits | None = None, fraud: FraudDetector | None = None,
+                 dispenser: CashDispenser | None = None,
+                 recorder: Recorder | None = None):
+        self.registry = registry
+        self.lockouts = lockouts if lockouts is not None else PinLockoutService()
+        self.limits = limits if limits is not None else WithdrawalLimits()
+        self.fraud = fraud if fraud is not None else FraudDetector()
+        self.dispenser = dispenser
+        self.recorder = recorder
+
+    def _step(self, session: Session, event: str, arg, step: Step) -> Step:
+        if self.recorder is not None:
+            self.recorder(session, event, arg, step)
+        return step
+
+    def _lockout_seconds(self, card_number: str) -> int:
+        return int(self.lockouts.remaining_lockout(card_number)) + 1
+
+    def insert_card(self, session: Session, digits: str) -> Step:
+        """Resuelve la tarjeta por número completo o por sus 4 últimos dígitos; empieza una sesión nueva."""
+        session.reset()
+        digits = digits.strip()
+        try:
+            card = self.registry.get(digits) if len(digits) > 4 else self.registry.get_by_last4(digits)
+        except ValueError:
+            return self._step(session, "card", digits, Step(State.CARD, "CARD_AMBIGUOUS"))
+        if card is None:
+            return self._step(session, "card", digits, Step(State.CARD, "CARD_NOT_FOUND"))
+        card_number = card.get_card_number()
+        if self.lockouts.is_locked(card_number):
+            step = Step(State.CARD, "CARD_BLOCKED", remaining=self._lockout_seconds(card_number))
+            return self._step(session, "card", digits, step)
+        session.card = card
+        session.state = State.PIN
+        return self._step(session, "card", digits, Step(State.PIN))
+
+    def pin_needed(self, session: Session) -> bool:
+        """
+        Indica si enter_pin() llegará a comprobar el PIN: la sesión espera el
+        PIN y la tarjeta no está bloqueada. Si no, se puede llamar a
+        enter_pin() directamente, sin pasar por el KDF.
+        """
+        return session.state is State.PIN and not self.lockouts.is_locked(session.card.get_card_number())
+
+    def verify_pin(self, session: Session, pin: str) -> bool:
+        """Comprueba el PIN con la tarjeta de la sesión (el KDF es deliberadamente lento) sin cambiar nada."""
+        card = session.card
+        return card is not None and card.validate_pin(pin, session_id=session.session_id)
+
+    def enter_pin(self, session: Session, pin: str, verified: bool | None = None) -> Step:
+        """
+        Valida el PIN y actualiza bloqueos y detector de fraude.
+
+        verified es el resultado de verify_pin() si ya se calculó en otro
+        hilo (la GUI no bloquea la pantalla con el KDF).
+        """
+        if session.state is not State.PIN:
+            return self._step(session, "pin", pin, Step(session.state, "NO_CARD"))
+        card = session.card
+        card_number = card.get_card_number()
+        if self.lockouts.is_locked(card_number):
+            seconds = self._lockout_seconds(card_number)
+            session.reset()
+            return self._step(session, "pin", pin, Step(State.CARD, "CARD_BLOCKED", remaining=seconds))
+        valid = self.verify_pin(session, pin) if verified is None else verified
+        self.fraud.record_pin(card_number, valid, session.terminal)
+        if valid:
+            self.lockouts.record_success(card_number)
+            session.authenticated = True
+            session.account = card.get_account()
+            session.state = State.MENU
+            return self._step(session, "pin", pin, Step(State.MENU))
+        remaining = self.lockouts.record_failure(card_number)
+        if remaining == 0:
+            seconds = self._lockout_seconds(card_number)
+            session.reset()
+            return self._step(session, "pin", pin, Step(State.CARD, "CARD_BLOCKED", remaining=seconds))
+        return self._step(session, "pin", pin, Step(State.PIN, "PIN_INVALID", remaining=remaining))
+
+    def select(self, session: Session, operation: str) -> Step:
+        """Elige una opción del menú: 'balance' muestra el saldo, 'withdraw' y 'deposit' piden el monto."""
+        if not session.authenticated:
+            return self._step(session, "select", operation, Step(session.state, "NOT_AUTHENTICATED"))
+        if operation == "balance":
+            session.state, session.operation = State.RECEIPT, None
+            step = Step(State.RECEIPT, balance=session.account.get_balance())
+        elif operation in AMOUNT_OPERATIONS:
+            session.state, session.operation = State.AMOUNT, operation
+            step = Step(State.AMOUNT)
+        else:
+            step = Step(session.state, "UNKNOWN_OPERATION")
+        return self._step(session, "select", operation, step)
+
+    def enter_amount(self, session: Session, amount: Money | str) -> Step:
+        """Ejecuta la operación elegida con el monto; si se rechaza, la sesión sigue pidiendo monto."""
+        if session.state is not State.AMOUNT:
+            error = "NO_OPERATION" if session.authenticated else "NOT_AUTHENTICATED"
+            return self._step(session, "amount", amount, Step(session.state, error))
+        try:
+            amount = Money(amount)
+        except (TypeError, ValueError):
+            return self._step(session, "amount", amount, Step(State.AMOUNT, "INVALID_AMOUNT"))
+        if amount <= 0:
+            return self._step(session, "amount", amount, Step(State.AMOUNT, "INVALID_AMOUNT"))
+
+        notes = ()
+        if session.operation == "withdraw":
+            debit = partial(self.fraud.withdraw, session.card, debit=partial(self.limits.withdraw, session.card),
+                            terminal=session.terminal)
+            if self.dispenser is not None:
+                result, notes = self.dispenser.withdraw(session.account, amount, debit)
+            else:
+                result = debit(amount)
+        else:
+            result = session.account.deposit(amount)
+        if not result.ok:
+            return self._step(session, "amount", amount, Step(State.AMOUNT, result.reason.name, result))
+        session.state = State.RECEIPT
+        step = Step(State.RECEIPT, result=result, notes=notes, balance=result.balance)
+        return self._step(session, "amount", amount, step)
+
+    def back(self, session: Session) -> Step:
+        """Vuelve al menú desde el monto o el comprobante."""
+        if not session.authenticated:
+            return self._step(session, "back", None, Step(session.state, "NOT_AUTHENTICATED"))
+        session.state, session.operation = State.MENU, None
+        return self._step(session, "back", None, Step(State.MENU))
+
+    def end(self, session: Session) -> Step:
+        """Termina la sesión (expulsa la tarjeta)."""
+        session.reset()
+        return self._step(session, "end", None, Step(State.CARD))
@@ -0,0 +1,273 @@
+"""
+Reproducción de sesiones ATM a toda velocidad sobre SessionFlow, sin Tk ni red.
+
+Una traza es un fichero JSONL con una sesión por línea:
+
+    {"t": 3600.5, "terminal": "T0042", "events": [["card", "4000000000000042"], ["pin", true],
+     ["select", "withdraw"], ["amount", "60"], ["back"], ["select", "balance"], ["end"]]}
+
+t son los segundos desde el inicio de la traza. Bloqueos de PIN, límites
+de retirada y detector de fraude usan un reloj simulado que avanza con t,
+así que un día de tráfico se reproduce en segundos con las mismas ventanas
+y bloqueos que en tiempo real. Cada terminal tiene su propio cajero de
+billetes (--cassettes). Los PIN no se guardan: ["pin", true] introduce el
+PIN de las tarjetas (--pin) y ["pin", false] uno erróneo.
+
+Las trazas se generan (--generate: sesiones de tarjetas sintéticas al azar,
+o con sesgo Zipf con --zipf, con consultas, retiradas, depósitos, PIN
+erróneos y montos que el cajero no puede entregar) o se graban en el
+servidor de sesiones (python -m ui.server --synthetic N --record
+sesiones.jsonl) y se reproducen contra el mismo registro sintético.
+
+Imprime sesiones/s y eventos/s, la latencia p50/p99 de cada tipo de evento
+y cuántos eventos se rechazaron con cada código de error. El PIN pasa por
+el KDF en cada sesión y domina el coste; --kdf-iterations 1 lo quita de en
+medio para medir el resto del flujo.
+
+Uso:
+    python -m ui.replay --generate 100000 --save sesiones.jsonl
+    python -m ui.replay sesiones.jsonl --synthetic 100000 --kdf-iterations 1
+"""
+
+import argparse
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from itertools import accumulate
+from typing import Iterable, Iterator, Sequence
+
+from cards.limits import WithdrawalLimits
+from cards.lockout import PinLockoutService
+from cards.registry import CardRegistry
+from dispenser.cassettes import DEFAULT_CASSETTES, CassetteInventory
+from dispenser.dispenser import CashDispenser
+from fraud.detector import FraudDetector
+from ui.demo_data import build_synthetic_registry, synthetic_card_number
+from ui.flow import SessionFlow, Step
+from ui.session import Session
+
+# evento de la traza -> método de SessionFlow
+EVENTS = {
+    "card": "insert_card",
+    "pin": "enter_pin",
+    "select": "select",
+    "amount": "enter_amount",
+    "back": "back",
+    "end": "end",
+}
+DAY = 86400.0
+COMMON_AMOUNTS = ("20", "40", "50", "60", "100", "150", "200")
+
+
+class TraceRecorder:
+    """
+    Recorder de SessionFlow que escribe cada sesión terminada como una línea de traza.
+
+    Una sesión se escribe al terminar (end) o al insertarse otra tarjeta en
+    la misma Session; close() escribe las que sigan abiertas. Del PIN solo
+    se guarda si fue válido.
+    """
+    def __init__(self, path: str, clock=time.time):
+        self._file = open(path, "a", encoding="utf-8")
+        self._clock = clock
+        self._started = clock()
+        self._open: dict[Session, dict] = {}
+
+    def __call__(self, session: Session, event: str, arg, step: Step) -> None:
+        if event == "card":
+            self._flush(session)
+            self._open[session] = {"t": round(self._clock() - self._started, 3), "terminal": session.terminal,
+                                   "events": []}
+        trace = self._open.get(session)
+        if trace is None:
+            return  # eventos sueltos antes de insertar una tarjeta
+        if event == "pin":
+            trace["events"].append([event, step.ok])
+        elif arg is None:
+            trace["events"].append([event])
+        else:
+            trace["events"].append([event, str(arg)])
+        if event == "end":
+            self._flush(session)
+
+    def _flush(self, session: Session) -> None:
+        trace = self._open.pop(session, None)
+        if trace is not None:
+            self._file.write(json.dumps(trace, separators=(",", ":")) + "\n")
+
+    def close(self) -> None:
+        for session in list(self._open):
+            self._flush(session)
+        self._file.close()
+
+
+def read_traces(path: str) -> Iterator[dict]:
+    """Genera las sesiones de un fichero de trazas, línea a línea."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def generate_traces(card_numbers: Sequence[str], sessions: int, terminals: int = 200,
+                    zipf_s: float = 0.0, seed: int = 42) -> list[dict]:
+    """
+    Genera sessions sesiones repartidas en un día, ordenadas por t.
+
+    Las tarjetas se eligen al azar, con una distribución Zipf de exponente
+    zipf_s si es mayor que 0 (unas pocas concentran el tráfico y acaban
+    bloqueadas por límites y fraude), y cada una usa casi siempre su
+    terminal habitual.
+    """
+    rng = random.Random(seed)
+    weights = list(accumulate(1.0 / (rank + 1) ** zipf_s for rank in range(len(card_numbers))))
+    names = [f"T{i:04d}" for i in range(terminals)]
+    traces = []
+    for index in rng.choices(range(len(card_numbers)), cum_weights=weights, k=sessions):
+        terminal = names[index % terminals] if rng.random() < 0.9 else rng.choice(names)
+        events = [["card", card_numbers[index]]]
+        roll = rng.random()
+        if roll < 0.005:
+            events += [["pin", False]] * 3  # bloquea la tarjeta
+        else:
+            if roll < 0.04:
+                events.append(["pin", False])
+            events.append(["pin", True])
+            roll = rng.random()
+            if roll < 0.30:
+                events.append(["select", "balance"])
+            elif roll < 0.80:
+                events += [["select", "withdraw"], ["amount", rng.choice(COMMON_AMOUNTS)]]
+            elif roll < 0.90:
+                events += [["select", "deposit"], ["amount", str(rng.randint(1, 50) * 10)], ["back"],
+                           ["select", "balance"]]
+            else:
+                # monto que el cajero no puede entregar, luego uno que sí
+                events += [["select", "withdraw"], ["amount", "35"], ["amount", "40"]]
+        events.append(["end"])
+        traces.append({"t": round(rng.uniform(0, DAY), 3), "terminal": terminal, "events": events})
+    traces.sort(key=lambda trace: trace["t"])
+    return traces
+
+
+class SessionReplayer:
+    """
+    Reproduce trazas sobre SessionFlow: un flujo y una Session por terminal,
+    con bloqueos, límites y detector de fraude compartidos y un reloj simulado.
+    """
+    def __init__(self, registry: CardRegistry, pin: str = "1234", cassettes: str = DEFAULT_CASSETTES,
+                 card_daily_limit=600):
+        self.registry = registry
+        self.pin = pin
+        self.wrong_pin = "0000" if pin != "0000" else "9999"
+        self.cassettes = cassettes
+        self.now = 0.0
+        self.lockouts = PinLockoutService(clock=self.clock)
+        self.limits = WithdrawalLimits(card_daily=card_daily_limit, clock=self.clock)
+        self.fraud = FraudDetector(clock=self.clock)
+        self._terminals: dict[str, tuple[Session, dict]] = {}
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: Counter[str] = Counter()
+        self.sessions = 0
+        self.seconds = 0.0
+
+    def clock(self) -> float:
+        return self.now
+
+    def _terminal(self, terminal: str) -> tuple[Session, dict]:
+        entry = self._terminals.get(terminal)
+        if entry is None:
+            flow = SessionFlow(self.registry, self.lockouts, self.limits, self.fraud,
+                               CashDispenser(CassetteInventory.from_spec(self.cassettes)))
+            entry = self._terminals[terminal] = (Session(terminal), {name: getattr(flow, method)
+                                                                     for name, method in EVENTS.items()})
+        return entry
+
+    def run(self, traces: Iterable[dict]) -> None:
+        """Reproduce las sesiones en orden, midiendo cada evento."""
+        timer = time.perf_counter
+        latencies, errors = self.latencies, self.errors
+        started = timer()
+        for trace in traces:
+            self.now = trace.get("t", self.now)
+            session, handlers = self._terminal(trace.get("terminal", ""))
+            for event in trace["events"]:
+                name = event[0]
+                if name == "pin":
+                    args = (self.pin if event[1] else self.wrong_pin,)
+                else:
+                    args = event[1:]
+                began = timer()
+                step = handlers[name](session, *args)
+                latencies[name].append(timer() - began)
+                if step.error is not None:
+                    errors[step.error] += 1
+            self.sessions += 1
+        self.seconds += timer() - started
+
+    @property
+    def events(self) -> int:
+        return sum(len(samples) for samples in self.latencies.values())
+
+    def report(self) -> dict:
+        """Sesiones/s, eventos/s, latencias por evento (µs) y errores por código."""
+        per_event = {}
+        for name, samples in self.latencies.items():
+            samples = sorted(samples)
+            per_event[name] = {"count": len(samples),
+                               "p50_us": round(samples[len(samples) // 2] * 1e6, 1),
+                               "p99_us": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e6, 1)}
+        return {
+            "sessions": self.sessions,
+            "events": self.events,
+            "seconds": round(self.seconds, 6),
+            "sessions_per_second": round(self.sessions / self.seconds, 1) if self.seconds else None,
+            "events_per_second": round(self.events / self.seconds, 1) if self.seconds else None,
+            "per_event": per_event,
+            "errors": dict(self.errors.most_common()),
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reproducción de sesiones ATM sin interfaz")
+    parser.add_argument("traces", nargs="?", help="fichero de trazas JSONL (o --generate)")
+    parser.add_argument("--generate", type=int, default=0, help="genera N sesiones en lugar de leer un fichero")
+    parser.add_argument("--save", help="guarda las sesiones generadas en este fichero")
+    parser.add_argument("--synthetic", type=int, default=10_000, help="tarjetas sintéticas del registro (PIN 1234)")
+    parser.add_argument("--terminals", type=int, default=200, help="terminales de las sesiones generadas")
+    parser.add_argument("--pin", default="1234", help="PIN de las tarjetas del registro")
+    parser.add_argument("--kdf-iterations", type=int, default=1_000, help="iteraciones del KDF del PIN")
+    parser.add_argument("--zipf", type=float, default=0.0, help="exponente Zipf de las tarjetas generadas (0: al azar)")
+    parser.add_argument("--cassettes", default=DEFAULT_CASSETTES, help="billetes de cada terminal")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    if not args.traces and not args.generate:
+        parser.error("indique un fichero de trazas o --generate N")
+
+    registry = build_synthetic_registry(args.synthetic, pin=args.pin, kdf_iterations=args.kdf_iterations)
+    if args.generate:
+        numbers = [synthetic_card_number(i) for i in range(args.synthetic)]
+        traces = generate_traces(numbers, args.generate, args.terminals, args.zipf, args.seed)
+        if args.save:
+            with open(args.save, "w", encoding="utf-8") as f:
+                for trace in traces:
+                    f.write(json.dumps(trace, separators=(",", ":")) + "\n")
+            print(f"{len(traces)} sesiones guardadas en {args.save}")
+    else:
+        traces = read_traces(args.traces)
+
+    replayer = SessionReplayer(registry, pin=args.pin, cassettes=args.cassettes)
+    replayer.run(traces)
+    report = replayer.report()
+    print(f"Sesiones: {report['sessions']:,}  eventos: {report['events']:,}  en {report['seconds']:.2f} s")
+    print(f"{report['sessions_per_second'] or 0:12,.0f} sesiones/s  {report['events_per_second'] or 0:12,.0f} eventos/s")
+    print(f"{'evento':<8} {'n':>9} {'p50':>9} {'p99':>9}")
+    for name, stats in report["per_event"].items():
+        print(f"{name:<8} {stats['count']:>9,} {stats['p50_us']:>7.1f}µs {stats['p99_us']:>7.1f}µs")
+    for error, count in report["errors"].items():
+        print(f"  {error:<20} {count:>9,}")
+
+
+if __name__ == "__main__":
+    main()
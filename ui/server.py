@@ -0,0 +1,182 @@
+"""
+Servidor de sesiones ATM basado en asyncio.
+
+Un único proceso mantiene miles de terminales conectados a la vez: cada
+conexión TCP o Unix tiene su propio Session y recorre, mediante un protocolo
+de líneas, el mismo SessionFlow que la consola y la GUI (tarjeta -> PIN ->
+menú -> monto, ver ui/flow.py).
+
+Protocolo (una petición por línea, una respuesta por línea):
+
+    CARD <dígitos>       -> OK PIN | ERR CARD_NOT_FOUND | ERR CARD_AMBIGUOUS | ERR CARD_BLOCKED
+    PIN <pin>            -> OK MENU | ERR PIN_INVALID <restantes> | ERR CARD_BLOCKED
+    BALANCE              -> OK BALANCE <saldo>
+    WITHDRAW <monto>     -> OK BALANCE <saldo> | ERR <MOTIVO>   (LIMIT_EXCEEDED, SUSPECTED_FRAUD...)
+    DEPOSIT <monto>      -> OK BALANCE <saldo> | ERR <MOTIVO>
+    EXIT                 -> OK BYE            (termina la sesión, la conexión sigue)
+    QUIT                 -> OK BYE            (cierra la conexión)
+
+Una línea de más de 64 KiB recibe ERR LINE_TOO_LONG y se cierra la conexión.
+
+Uso:
+    python -m ui.server --port 8765
+    python -m ui.server --unix /tmp/atm.sock --synthetic 100000
+    python -m ui.server --synthetic 100000 --record sesiones.jsonl   # trazas para python -m ui.replay
+"""
+
+import argparse
+import asyncio
+import itertools
+
+from accounts.money import Money
+from cards.limits import WithdrawalLimits
+from cards.lockout import PinLockoutService
+from cards.registry import CardRegistry
+from fraud.detector import FraudDetector
+from ui.demo_data import build_synthetic_registry, seed_demo_registry
+from ui.flow import Recorder, SessionFlow
+from ui.replay import TraceRecorder
+from ui.session import Session
+
+
+class ATMSessionServer:
+    """Atiende muchas sesiones ATM concurrentes sobre un CardRegistry compartido."""
+
+    def __init__(self, registry: CardRegistry, lockouts: PinLockoutService | None = None,
+                 limits: WithdrawalLimits | None = None, fraud: FraudDetector | None = None,
+                 recorder: Recorder | None = None):
+        self.registry = registry
+        self.lockouts = lockouts or PinLockoutService()
+        self.limits = limits if limits is not None else WithdrawalLimits()
+        self.fraud = fraud if fraud is not None else FraudDetector()
+        self.flow = SessionFlow(registry, self.lockouts, self.limits, self.fraud, recorder=recorder)
+        self._terminal_ids = itertools.count(1)
+        self.active_sessions = 0
+        self._server = None
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0):
+        self._server = await asyncio.start_server(self.handle_client, host, port, backlog=4096)
+        return self._server
+
+    async def start_unix(self, path: str):
+        self._server = await asyncio.start_unix_server(self.handle_client, path, backlog=4096)
+        return self._server
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # Cada conexión es un terminal distinto para el detector de fraude
+        session = Session(terminal=f"T{next(self._terminal_ids)}")
+        loop = asyncio.get_running_loop()
+        self.active_sessions += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Línea por encima del límite del StreamReader: el resto no se puede resincronizar
+                    writer.write(b"ERR LINE_TOO_LONG\n")
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                text = line.decode("utf-8", "replace").strip()
+                command, _, arg = text.partition(" ")
+                verified = None
+                if command.upper() == "PIN":
+                    # El KDF del PIN es deliberadamente lento: en el bucle pararía a todos los terminales.
+                    # Sin tarjeta o con la tarjeta bloqueada, enter_pin rechaza el PIN sin mirarlo.
+                    if self.flow.pin_needed(session):
+                        verified = await loop.run_in_executor(None, self.flow.verify_pin, session, arg.strip())
+                    else:
+                        verified = False
+                response = self.dispatch(session, text, verified)
+                writer.write(response.encode() + b"\n")
+                await writer.drain()
+                if line.strip().upper() == b"QUIT":
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.active_sessions -= 1
+            self.flow.end(session)
+            writer.close()
+
+    def dispatch(self, session: Session, line: str, verified: bool | None = None) -> str:
+        """
+        Procesa un comando del protocolo y devuelve la línea de respuesta.
+
+        verified es, para PIN, el resultado de SessionFlow.verify_pin ya
+        calculado fuera del bucle; sin él, el KDF se ejecuta aquí mismo.
+        """
+        command, _, arg = line.partition(" ")
+        command = command.upper()
+        arg = arg.strip()
+        flow = self.flow
+        if command == "CARD":
+            step = flow.insert_card(session, arg)
+            return "OK PIN" if step.ok else f"ERR {step.error}"
+        if command == "PIN":
+            step = flow.enter_pin(session, arg, verified)
+            if step.ok:
+                return "OK MENU"
+            return f"ERR PIN_INVALID {step.remaining}" if step.error == "PIN_INVALID" else f"ERR {step.error}"
+        if command in ("EXIT", "QUIT"):
+            flow.end(session)
+            return "OK BYE"
+        if command == "BALANCE":
+            step = flow.select(session, "balance")
+        elif command in ("WITHDRAW", "DEPOSIT"):
+            # Un comando es una visita completa al menú: elegir la operación y dar el monto
+            step = flow.select(session, command.lower())
+            if step.ok:
+                step = flow.enter_amount(session, arg)
+        else:
+            return "ERR UNKNOWN_COMMAND"
+        return f"OK BALANCE {step.balance}" if step.ok else f"ERR {step.error}"
+
+
+async def serve(args) -> None:
+    registry = build_synthetic_registry(args.synthetic) if args.synthetic else seed_demo_registry()
+    limits = WithdrawalLimits(card_hourly=Money(args.hourly_limit) or None,
+                              card_daily=Money(args.daily_limit) or None,
+                              account_daily=Money(args.account_daily_limit) or None)
+    recorder = TraceRecorder(args.record) if args.record else None
+    # Sin reglas el detector deja pasar todo (pruebas de carga que no deben medir rechazos)
+    fraud = FraudDetector(rules={}) if args.no_fraud else None
+    server = ATMSessionServer(registry, limits=limits, fraud=fraud, recorder=recorder)
+    if args.unix:
+        srv = await server.start_unix(args.unix)
+        print(f"Escuchando en unix:{args.unix}", flush=True)
+    else:
+        srv = await server.start_tcp(args.host, args.port)
+        host, port = srv.sockets[0].getsockname()[:2]
+        print(f"Escuchando en {host}:{port}", flush=True)
+    try:
+        async with srv:
+            await srv.serve_forever()
+    finally:
+        if recorder is not None:
+            recorder.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor de sesiones ATM (asyncio)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="0 elige un puerto libre")
+    parser.add_argument("--unix", help="ruta de socket Unix en lugar de TCP")
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="carga N tarjetas sintéticas (PAN 4000..., PIN 1234) en lugar de las demo")
+    parser.add_argument("--daily-limit", default="600", help="máximo retirable por tarjeta en 24 h ('0' sin límite)")
+    parser.add_argument("--hourly-limit", default="0", help="máximo retirable por tarjeta en 1 h ('0' sin límite)")
+    parser.add_argument("--account-daily-limit", default="0",
+                        help="máximo retirable por cuenta en 24 h entre todas sus tarjetas ('0' sin límite)")
+    parser.add_argument("--no-fraud", action="store_true", help="desactiva el bloqueo por sospecha de fraude")
+    parser.add_argument("--record", help="graba cada sesión en este fichero de trazas (sin los PIN)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
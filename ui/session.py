@@ -0,0 +1,38 @@
+import itertools
+from enum import Enum
+
+from cards.card import Card
+
+_session_ids = itertools.count(1)
+
+
+class State(str, Enum):
+    """Pantalla en la que está la sesión: tarjeta -> PIN -> menú -> monto -> comprobante."""
+    CARD = "card"
+    PIN = "pin"
+    MENU = "menu"
+    AMOUNT = "amount"
+    RECEIPT = "receipt"
+
+
+class Session:
+    """Mantiene el estado de la sesión actual de ATM."""
+    def __init__(self, terminal: str = ""):
+        self.terminal = terminal  # cajero en el que transcurre la sesión; se mantiene entre sesiones
+        self.session_id = next(_session_ids)
+        self.state = State.CARD
+        self.operation = None  # 'withdraw' o 'deposit' mientras se pide el monto
+        self.card = None
+        self.account = None
+        self.authenticated = False
+
+    def reset(self):
+        # Al terminar la sesión se descarta la verificación de PIN cacheada
+        if self.card is not None and Card.verification_cache is not None:
+            Card.verification_cache.invalidate_session(self.card.get_card_number(), self.session_id)
+        self.session_id = next(_session_ids)
+        self.state = State.CARD
+        self.operation = None
+        self.card = None
+        self.account = None
+        self.authenticated = False
@@ -0,0 +1,137 @@
+"""
+Ejecución de operaciones de dominio fuera del hilo de la interfaz.
+
+UIWorker corre las llamadas (PIN, saldo, retiros, depósitos) en un hilo de
+fondo y entrega los resultados en el hilo de Tk sondeando una cola con
+after(), así que un backend lento (diario, bloqueos, servicio remoto) no
+congela la pantalla. FrameLatencyMonitor mide cuánto se retrasa el bucle de
+eventos respecto a su intervalo, que es la cota de latencia de la UI.
+
+Ninguna de las dos clases importa tkinter: reciben la función after de un
+widget (o cualquier planificador con la misma firma).
+"""
+
+import queue
+import sys
+import time
+from typing import Any, Callable
+
+from telemetry.metrics import OperationMetrics
+
+Schedule = Callable[[int, Callable[[], None]], Any]
+# (tipo, excepción, traceback), como Tk.report_callback_exception o sys.excepthook
+Report = Callable[[type, BaseException, Any], Any]
+
+
+class UIWorker:
+    """
+    Ejecutor de un solo hilo con cola de resultados sondeada desde la UI.
+
+    Un único hilo mantiene el orden de las operaciones de una sesión. Los
+    callbacks on_done/on_error se ejecutan siempre en el hilo que llama a
+    poll() (el de Tk), nunca en el hilo de fondo.
+
+    Una excepción sin on_error, o lanzada por on_done/on_error, se entrega a
+    report (la ATMApp pasa su report_callback_exception; por defecto,
+    sys.excepthook) y poll() sigue entregando el resto de resultados.
+    """
+    def __init__(self, schedule: Schedule, poll_ms: int = 10, report: Report | None = None):
+        self._schedule = schedule
+        self.poll_ms = poll_ms
+        self._report = report if report is not None else sys.excepthook
+        self._executor = None
+        self._results: queue.SimpleQueue = queue.SimpleQueue()
+        self.pending = 0
+        self._polling = False
+
+    @property
+    def busy(self) -> bool:
+        return self.pending > 0
+
+    def submit(self, fn: Callable, *args, on_done: Callable[[Any], None] | None = None,
+               on_error: Callable[[BaseException], None] | None = None):
+        """Encola fn(*args) en el hilo de fondo y devuelve su Future; el resultado llega a on_done (o la excepción a on_error)."""
+        if self._executor is None:
+            # El hilo se crea con la primera operación, no al arrancar la aplicación
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ui-worker")
+        future = self._executor.submit(fn, *args)
+        self.pending += 1
+        future.add_done_callback(lambda f: self._results.put((f, on_done, on_error)))
+        if not self._polling:
+            self._polling = True
+            self._schedule(self.poll_ms, self.poll)
+        return future
+
+    def poll(self) -> None:
+        """Entrega los resultados terminados; se reprograma mientras quede trabajo pendiente."""
+        while True:
+            try:
+                future, on_done, on_error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending -= 1
+            try:
+                error = future.exception()
+                if error is not None:
+                    if on_error is None:
+                        raise error
+                    on_error(error)
+                elif on_done is not None:
+                    on_done(future.result())
+            except Exception as exc:
+                self._report(type(exc), exc, exc.__traceback__)
+        if self.pending:
+            self._schedule(self.poll_ms, self.poll)
+        else:
+            self._polling = False
+
+    def shutdown(self, wait: bool = False) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+class FrameLatencyMonitor:
+    """
+    Mide el retraso del bucle de eventos: programa un tick cada interval_ms y
+    registra cuánto tarda de más en ejecutarse.
+
+    Los retrasos van a un histograma de telemetría (ui_frame_lag); los que
+    superan budget_ms cuentan como fallo. max_lag_ms es la peor latencia
+    observada desde el último reset.
+    """
+    def __init__(self, schedule: Schedule, interval_ms: int = 16, budget_ms: float = 50.0,
+                 metrics: OperationMetrics | None = None, clock: Callable[[], float] = time.perf_counter):
+        self._schedule = schedule
+        self.interval_ms = interval_ms
+        self.budget_ms = budget_ms
+        self.metrics = metrics or OperationMetrics("ui_frame_lag")
+        self._clock = clock
+        self.max_lag_ms = 0.0
+        self._expected = None
+        self._running = False
+
+    def start(self) -> None:
+        if not self._running:
+            self._running = True
+            self._arm()
+
+    def stop(self) -> None:
+        self._running = False
+
+    def reset(self) -> None:
+        self.max_lag_ms = 0.0
+        self.metrics.reset()
+
+    def _arm(self) -> None:
+        self._expected = self._clock() + self.interval_ms / 1000
+        self._schedule(self.interval_ms, self._tick)
+
+    def _tick(self) -> None:
+        if not self._running:
+            return
+        lag = max(0.0, self._clock() - self._expected)
+        lag_ms = lag * 1000
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+        self.metrics.observe(lag, lag_ms <= self.budget_ms)
+        self._arm()